@@ -1,8 +1,16 @@
 from ._auth import *
+from ._breaker import *
+from ._cache import *
+from ._checkpoint import *
 from ._client import *
+from ._codec import *
 from ._config import *
 from ._constants import *
 from ._errors import *
+from ._http import *
+from ._limiter import *
 from ._logger import *
+from ._retry import *
+from ._sinks import *
 from ._version import *
 from .resources import *
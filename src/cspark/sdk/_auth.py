@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
+import threading
+import time
+from dataclasses import asdict
 from typing import Mapping, Optional, Union
+from weakref import WeakKeyDictionary
 
 from httpx import AsyncClient as AsyncHttpClient
 from httpx import Client as HttpClient
 
+from ._cache import TokenCache
 from ._config import Config
 from ._constants import ENV_VARS
 from ._errors import SparkError
@@ -91,13 +97,26 @@ class Authorization:
 
 
 class OAuth:
+    """
+    Manages the OAuth2 client credentials and the access token they are exchanged for.
+
+    The access token is refreshed ahead of its expiry (within `refresh_margin` seconds, or
+    the last half of its lifetime if shorter) rather than after a 401 response. Concurrent
+    refreshes from multiple threads or coroutines are coalesced into a single request to
+    the OAuth2 server, whose token is then used by all the waiting requests.
+    """
+
     _access_token: Optional[AccessToken]
+    refresh_margin: float = 60.0  # in seconds
 
     def __init__(self, value: Mapping[str, str]) -> None:
         self._client_id = value.get('client_id', '')
         self._client_secret = value.get('client_secret', '')
         self._file_path: Optional[str] = value.get('oauth_path')
         self._access_token = None
+        self._issued_at = 0.0
+        self._lock = threading.RLock()
+        self._async_locks: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = WeakKeyDictionary()
 
         if 'client_id' not in value or 'client_secret' not in value:
             raise SparkError.sdk(
@@ -135,6 +154,16 @@ class OAuth:
     def access_token(self) -> Optional[str]:
         return self._access_token.access_token if self._access_token else None
 
+    @property
+    def expires_soon(self) -> bool:
+        """Whether the access token is missing or about to expire."""
+        if not self._access_token:
+            return True
+        lifetime = self._access_token.expires_in
+        if lifetime <= 0:
+            return False  # unknown lifetime; refreshed upon 401 only
+        return time.monotonic() - self._issued_at >= lifetime - min(self.refresh_margin, lifetime / 2)
+
     @property
     def client_id(self) -> str:
         return self._client_id
@@ -160,7 +189,7 @@ class OAuth:
         try:
             manager = OAuthManager(config, http_client)
             logger.info('retrieving OAuth2 access token...')
-            self._access_token = manager.get_access_token()
+            self._access_token, self._issued_at = manager.get_access_token(), time.monotonic()
             if not self._access_token:
                 raise SparkError('no access token found')
             return self._access_token
@@ -175,7 +204,7 @@ class OAuth:
         try:
             manager = AsyncOAuthManager(config, http_client)
             logger.info('retrieving OAuth2 access token...')
-            self._access_token = await manager.get_access_token()
+            self._access_token, self._issued_at = await manager.get_access_token(), time.monotonic()
             if not self._access_token:
                 raise SparkError('no access token found')
             return self._access_token
@@ -183,3 +212,64 @@ class OAuth:
             error = SparkError('failed to retrieve OAuth2 access token', cause)
             logger.warning(error.message)
             raise error from cause
+
+    def refresh_token(self, config: Config, http_client: HttpClient, *, stale: Optional[str] = None) -> AccessToken:
+        """
+        Retrieves a new access token unless another caller just did (single flight).
+
+        `stale` is the access token that got rejected (if any); it is only replaced if still
+        in use. Otherwise, a new token is retrieved only if the current one expires soon. With
+        a `token_cache` configured, a fresh token cached by another process is reused first.
+        """
+        with self._lock:
+            if not self.__is_stale(stale):
+                return self._access_token  # type: ignore
+            cache = config.token_cache
+            if cache is None:
+                return self.retrieve_token(config, http_client)
+
+            with cache.lock():
+                if self.__restore(cache, config, stale):
+                    return self._access_token  # type: ignore
+                return self.__store(cache, config, self.retrieve_token(config, http_client))
+
+    async def arefresh_token(
+        self, config: Config, http_client: AsyncHttpClient, *, stale: Optional[str] = None
+    ) -> AccessToken:
+        """Asynchronously retrieves a new access token unless another caller just did (see `refresh_token`)."""
+        async with self.__async_lock():
+            if not self.__is_stale(stale):
+                return self._access_token  # type: ignore
+            cache = config.token_cache
+            if cache is None:
+                return await self.aretrieve_token(config, http_client)
+
+            async with cache.alock():
+                if self.__restore(cache, config, stale):
+                    return self._access_token  # type: ignore
+                return self.__store(cache, config, await self.aretrieve_token(config, http_client))
+
+    def __restore(self, cache: TokenCache, config: Config, stale: Optional[str]) -> bool:
+        """Adopts the token cached by another client or process, if any and still fresh."""
+        entry = cache.get(TokenCache.key_of(self._client_id, config.base_url.tenant))
+        if entry is None or entry[0].get('access_token') == stale:
+            return False
+        token, remaining = AccessToken(**entry[0]), entry[1]
+        self._access_token, self._issued_at = token, time.monotonic() - max(0.0, token.expires_in - remaining)
+        return not self.expires_soon
+
+    def __store(self, cache: TokenCache, config: Config, token: AccessToken) -> AccessToken:
+        if token.expires_in > 0:
+            cache.set(TokenCache.key_of(self._client_id, config.base_url.tenant), asdict(token), token.expires_in)
+        return token
+
+    def __is_stale(self, token: Optional[str]) -> bool:
+        if token is not None and self._access_token and self._access_token.access_token != token:
+            return False  # already refreshed by another caller
+        return token is not None or self.expires_soon
+
+    def __async_lock(self) -> asyncio.Lock:
+        lock = self._async_locks.get(asyncio.get_running_loop())
+        if lock is None:  # one lock per event loop as asyncio locks are bound to a loop
+            lock = self._async_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+        return lock
@@ -0,0 +1,115 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Collection, Dict, Optional
+
+from ._errors import CircuitOpenError
+
+__all__ = ['CircuitBreaker']
+
+
+@dataclass
+class _Circuit:
+    state: str = 'closed'  # 'closed' | 'open' | 'half_open'
+    failures: int = 0
+    opened_at: float = 0.0
+    probes: int = 0
+
+
+class CircuitBreaker:
+    """
+    Fails fast while Spark is unavailable instead of waiting for requests to time out.
+
+    Outcomes are tracked per circuit, i.e., per host and endpoint class ('execute', 'batch',
+    'metadata', ...). A circuit opens after `failure_threshold` consecutive failures: server
+    errors (`failure_status_codes`), transport errors (e.g., connection refused or timed out)
+    and calls slower than `slow_call_threshold` seconds (if set). While open, requests fail
+    right away with `CircuitOpenError`. After `reset_timeout` seconds, the circuit half-opens
+    and lets up to `half_open_probes` requests through: it closes as soon as one succeeds
+    and reopens otherwise. When `health_check` is enabled, the health of the Spark
+    environment is checked before probing it with actual requests.
+
+    A breaker may be shared across threads, coroutines and clients.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        slow_call_threshold: Optional[float] = None,
+        half_open_probes: int = 1,
+        failure_status_codes: Collection[int] = (500, 502, 503, 504),
+        health_check: bool = False,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.slow_call_threshold = slow_call_threshold
+        self.half_open_probes = max(1, half_open_probes)
+        self.failure_status_codes = failure_status_codes
+        self.health_check = health_check
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return f'{type(self).__name__}(failure_threshold={self.failure_threshold}, reset_timeout={self.reset_timeout})'
+
+    def state(self, key: str) -> str:
+        """Returns the state of a circuit: 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                return 'closed'
+            if circuit.state == 'open' and time.monotonic() - circuit.opened_at >= self.reset_timeout:
+                return 'half_open'
+            return circuit.state
+
+    def acquire(self, key: str) -> bool:
+        """
+        Lets a request through the circuit or raises `CircuitOpenError` if it is open.
+
+        Returns True when the request is a probe of a half-open circuit.
+        """
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            if circuit.state == 'closed':
+                return False
+
+            now = time.monotonic()
+            if circuit.state == 'open':
+                if now - circuit.opened_at < self.reset_timeout:
+                    raise self.__error(key, circuit, now)
+                circuit.state, circuit.probes = 'half_open', 0
+            if circuit.probes >= self.half_open_probes:
+                raise self.__error(key, circuit, now)
+            circuit.probes += 1
+            return True
+
+    def record(self, key: str, success: bool, elapsed: Optional[float] = None) -> None:
+        """Records the outcome of a request (a slow call counts as a failure)."""
+        if success and self.slow_call_threshold is not None and elapsed is not None:
+            success = elapsed < self.slow_call_threshold
+
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            if success:
+                circuit.state, circuit.failures, circuit.probes = 'closed', 0, 0
+                return
+
+            circuit.failures += 1
+            if circuit.state == 'half_open' or circuit.failures >= self.failure_threshold:
+                circuit.state, circuit.opened_at, circuit.probes = 'open', time.monotonic(), 0
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """Closes a circuit (or all of them)."""
+        with self._lock:
+            if key is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(key, None)
+
+    def __error(self, key: str, circuit: _Circuit, now: float) -> CircuitOpenError:
+        retry_in = max(0.0, self.reset_timeout - (now - circuit.opened_at))
+        return CircuitOpenError(
+            f'circuit <{key}> is open after {circuit.failures} consecutive failures', key=key, retry_in=retry_in
+        )
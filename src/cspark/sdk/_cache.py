@@ -0,0 +1,472 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import IO, Any, AsyncIterator, Dict, Iterator, Mapping, Optional, Tuple, Union
+
+from httpx import AsyncClient as AsyncHttpClient
+from httpx import Client as HttpClient
+from httpx import Response
+
+from ._errors import SparkError
+from ._utils import import_optional_module
+
+if os.name == 'nt':
+    import msvcrt
+
+    def _lock_file(file: IO[bytes]) -> None:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(file: IO[bytes]) -> None:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(file: IO[bytes]) -> None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(file: IO[bytes]) -> None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+__all__ = ['CacheStats', 'ResultCache', 'MemoryCache', 'SqliteCache', 'MetadataCache', 'TokenCache', 'JwksCache']
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+
+class ResultCache(ABC):
+    """
+    Caches the results of service executions on the client side.
+
+    Given a version of a service, Spark computes the same outputs from the same inputs;
+    identical executions can therefore be answered without reaching Spark at all. Only
+    executions of a pinned version (i.e., by version id or semantic version) are cached.
+
+    Entries expire `ttl` seconds after being stored (never if None), and the least recently
+    used ones are evicted once the cache holds more than `max_size` entries. Subclasses
+    implement the storage (`_get`, `_set`, `_clear`, `_len`); hits, misses and evictions
+    are counted in `stats`.
+    """
+
+    def __init__(self, *, max_size: int = 1024, ttl: Optional[float] = None):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return f'{type(self).__name__}(max_size={self.max_size}, ttl={self.ttl})'
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._len()
+
+    @staticmethod
+    def key_of(*parts: Any) -> str:
+        """Builds a cache key out of JSON-like parts, regardless of the order of their keys."""
+        canonical = json.dumps(parts, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self.stats.evictions += self._set(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def _is_expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at >= self.ttl
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[bytes]:
+        """Returns the value of an entry unless missing or expired."""
+
+    @abstractmethod
+    def _set(self, key: str, value: bytes) -> int:
+        """Stores an entry and returns the number of entries evicted to make room for it."""
+
+    @abstractmethod
+    def _clear(self) -> None:
+        """Removes all the entries."""
+
+    @abstractmethod
+    def _len(self) -> int:
+        """Counts the entries currently stored."""
+
+
+class MemoryCache(ResultCache):
+    """Keeps the results in memory (LRU) for the lifetime of the process."""
+
+    def __init__(self, *, max_size: int = 1024, ttl: Optional[float] = None):
+        super().__init__(max_size=max_size, ttl=ttl)
+        self._entries: 'OrderedDict[str, Tuple[bytes, float]]' = OrderedDict()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._is_expired(entry[1], time.monotonic()):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _set(self, key: str, value: bytes) -> int:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        evicted = max(0, len(self._entries) - self.max_size)
+        for _ in range(evicted):
+            self._entries.popitem(last=False)
+        return evicted
+
+    def _clear(self) -> None:
+        self._entries.clear()
+
+    def _len(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCache(ResultCache):
+    """Keeps the results in a SQLite database so that they outlive the process and can be shared."""
+
+    def __init__(self, path: Union[str, os.PathLike], *, max_size: int = 10_000, ttl: Optional[float] = None):
+        super().__init__(max_size=max_size, ttl=ttl)
+        self.path = os.fspath(path)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS results '
+            '(key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL, used_at REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS results_used_at ON results (used_at)')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        row = self._db.execute('SELECT value, stored_at FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if self._is_expired(row[1], now):
+            self._db.execute('DELETE FROM results WHERE key = ?', (key,))
+            return None
+        self._db.execute('UPDATE results SET used_at = ? WHERE key = ?', (now, key))
+        return bytes(row[0])
+
+    def _set(self, key: str, value: bytes) -> int:
+        now = time.time()
+        self._db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)', (key, value, now, now))
+
+        evicted = max(0, self._len() - self.max_size)
+        if evicted:
+            self._db.execute(
+                'DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY used_at LIMIT ?)', (evicted,)
+            )
+        return evicted
+
+    def _clear(self) -> None:
+        self._db.execute('DELETE FROM results')
+
+    def _len(self) -> int:
+        return self._db.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+
+class MetadataCache:
+    """
+    Caches the responses of the read-mostly endpoints of the Services API on the client side.
+
+    Metadata, schemas, versions, Swagger documents and existence checks of a service are
+    kept for `ttl` seconds (and up to `max_size` entries, least recently used first out).
+    Entries of a service are invalidated whenever it gets published, recompiled or deleted
+    through the SDK; call `invalidate()` if a service is changed by other means. The cache
+    may be shared across clients, threads and event loops. Cached responses are shared as
+    well and should be treated as read-only.
+    """
+
+    def __init__(self, *, ttl: float = 300.0, max_size: int = 512):
+        self.ttl = ttl
+        self.max_size = max(1, max_size)
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[Any, float]]' = OrderedDict()  # (scope, key) -> entry
+
+    def __str__(self) -> str:
+        return f'{type(self).__name__}(max_size={self.max_size}, ttl={self.ttl})'
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, scope: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is not None and time.monotonic() - entry[1] >= self.ttl:
+                del self._entries[(scope, key)]
+                entry = None
+
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self._entries.move_to_end((scope, key))
+            return entry[0]
+
+    def set(self, scope: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[(scope, key)] = (value, time.monotonic())
+            self._entries.move_to_end((scope, key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, scope: Optional[str] = None) -> int:
+        """
+        Drops the entries of a service (as 'folder/service') and returns how many were dropped.
+
+        Entries looked up by service or version id only cannot be tied to a service and are
+        dropped as well. Without a scope, the whole cache is cleared.
+        """
+        with self._lock:
+            scope = scope.lower() if scope else None
+            keys = [k for k in self._entries if scope is None or k[0] == scope or '/' not in k[0]]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+
+class TokenCache:
+    """
+    Keeps OAuth2 access tokens in a JSON file shared across processes and their restarts.
+
+    Tokens are stored by client id and tenant along with their expiry. A client in need of
+    a token takes an exclusive lock on the cache (`<path>.lock`) and reuses the cached token
+    if still fresh; otherwise, it retrieves a new one and stores it before releasing the
+    lock. Workers (e.g., gunicorn or celery) starting at once thus share a single token
+    instead of each requesting their own. The file holds credentials and is therefore
+    created with owner-only permissions.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return f'{type(self).__name__}(path={self.path})'
+
+    @staticmethod
+    def key_of(client_id: str, tenant: str) -> str:
+        return f'{tenant}:{client_id}'
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Locks the cache across threads and processes."""
+        file = self.__acquire()
+        try:
+            yield
+        finally:
+            self.__release(file)
+
+    @asynccontextmanager
+    async def alock(self) -> AsyncIterator[None]:
+        """Locks the cache across threads and processes without blocking the event loop."""
+        future = asyncio.get_running_loop().run_in_executor(None, self.__acquire)
+        try:
+            file = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(lambda f: self.__release(f.result()))
+            raise
+        try:
+            yield
+        finally:
+            self.__release(file)
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Returns a cached token and its remaining lifetime in seconds (None if missing or expired)."""
+        entry = self.__read().get(key)
+        if not isinstance(entry, dict):
+            return None
+        remaining = entry.get('expires_at', 0) - time.time()
+        return (entry['token'], remaining) if remaining > 0 else None
+
+    def set(self, key: str, token: Mapping[str, Any], expires_in: float) -> None:
+        now = time.time()
+        tokens = {k: v for k, v in self.__read().items() if isinstance(v, dict) and v.get('expires_at', 0) > now}
+        tokens[key] = {'token': dict(token), 'expires_at': now + expires_in}
+        self.__write(tokens)
+
+    def clear(self) -> None:
+        with self.lock():
+            self.__write({})
+
+    def __acquire(self) -> IO[bytes]:
+        self._lock.acquire()
+        try:
+            file = open(f'{self.path}.lock', 'a+b')
+            try:
+                _lock_file(file)
+            except BaseException:
+                file.close()
+                raise
+            return file
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def __release(self, file: IO[bytes]) -> None:
+        try:
+            _unlock_file(file)
+            file.close()
+        finally:
+            self._lock.release()
+
+    def __read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'rb') as file:
+                tokens = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return tokens if isinstance(tokens, dict) else {}
+
+    def __write(self, tokens: Dict[str, Any]) -> None:
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as file:
+            json.dump(tokens, file)
+        os.replace(temp_path, self.path)  # atomic: readers never see a partial file
+
+
+class JwksCache:
+    """
+    Caches the JSON Web Key Sets (JWKS) used to verify the signature of access tokens.
+
+    The key set of an issuer is fetched from its `openid-connect/certs` endpoint and kept
+    for `ttl` seconds, so that validating a token only takes a signature check. A token
+    signed with an unknown key id (e.g., after a key rotation) triggers a refresh, though
+    no more than once every `refresh_interval` seconds per issuer so that tokens with
+    made-up key ids cannot flood the issuer with requests. The cache may be shared
+    across threads and event loops.
+    """
+
+    def __init__(self, *, ttl: float = 3600.0, refresh_interval: float = 30.0, timeout: float = 10.0):
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout  # in seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Any, float]] = {}  # issuer -> (key set, fetched at)
+
+    def __str__(self) -> str:
+        return f'{type(self).__name__}(ttl={self.ttl}, refresh_interval={self.refresh_interval})'
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @staticmethod
+    def url_of(issuer: str) -> str:
+        return f'{issuer}/protocol/openid-connect/certs'
+
+    def get_signing_key(self, token: str, issuer: str, http_client: Optional[HttpClient] = None) -> Any:
+        """Returns the key (`jwt.PyJWK`) a token was signed with, fetching the issuer's key set if needed."""
+        kid = self.__kid_of(token)
+        key, refresh = self.__lookup(issuer, kid)
+        if refresh:
+            client = http_client or HttpClient(timeout=self.timeout)
+            try:
+                key = self.__update(issuer, kid, client.get(self.url_of(issuer)))
+            finally:
+                if http_client is None:
+                    client.close()
+        return self.__required(key, kid, issuer)
+
+    async def aget_signing_key(self, token: str, issuer: str, http_client: Optional[AsyncHttpClient] = None) -> Any:
+        """Asynchronously returns the key a token was signed with (see `get_signing_key`)."""
+        kid = self.__kid_of(token)
+        key, refresh = self.__lookup(issuer, kid)
+        if refresh:
+            client = http_client or AsyncHttpClient(timeout=self.timeout)
+            try:
+                key = self.__update(issuer, kid, await client.get(self.url_of(issuer)))
+            finally:
+                if http_client is None:
+                    await client.aclose()
+        return self.__required(key, kid, issuer)
+
+    def invalidate(self, issuer: Optional[str] = None) -> None:
+        """Drops the key set of an issuer (or all of them)."""
+        with self._lock:
+            if issuer is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(issuer, None)
+
+    def __lookup(self, issuer: str, kid: Optional[str]) -> Tuple[Any, bool]:
+        """Finds a cached key and tells whether the key set should be (re)fetched."""
+        with self._lock:
+            entry = self._entries.get(issuer)
+            now = time.monotonic()
+            if entry is None or now - entry[1] >= self.ttl:
+                return None, True
+            key = self.__find(entry[0], kid)
+            return key, key is None and now - entry[1] >= self.refresh_interval
+
+    def __update(self, issuer: str, kid: Optional[str], response: Response) -> Any:
+        jwt = import_optional_module('jwt', 'pyjwt[crypto]')
+        response.raise_for_status()
+        jwks = jwt.PyJWKSet.from_dict(response.json())
+        with self._lock:
+            self._entries[issuer] = (jwks, time.monotonic())
+        return self.__find(jwks, kid)
+
+    @staticmethod
+    def __kid_of(token: str) -> Optional[str]:
+        jwt = import_optional_module('jwt', 'pyjwt[crypto]')
+        return jwt.get_unverified_header(token).get('kid')
+
+    @staticmethod
+    def __find(jwks: Any, kid: Optional[str]) -> Any:
+        return next((key for key in jwks.keys if key.key_id == kid), None)
+
+    @staticmethod
+    def __required(key: Any, kid: Optional[str], issuer: str) -> Any:
+        if key is None:
+            raise SparkError.sdk(f'no signing key found for key id <{kid}>', cause=JwksCache.url_of(issuer))
+        return key
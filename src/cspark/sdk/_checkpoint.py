@@ -0,0 +1,122 @@
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from ._codec import JsonCodec, get_json_codec
+from ._errors import SparkError
+
+__all__ = ['BatchCheckpoint']
+
+
+class BatchCheckpoint:
+    """
+    Keeps track of the chunks pushed to and pulled from a batch pipeline on disk.
+
+    Events are appended to a JSON Lines file as they happen (the batch id first, then one
+    line per pushed or pulled chunk) so that a pipeline interrupted mid-run can be resumed
+    later on with only the missing chunks pushed or pulled. A truncated last line (e.g., the
+    process got killed while writing it) is ignored when the file is loaded.
+
+    Set `keep_results` to False to only record the ids of the pulled chunks, e.g., when
+    their results are written into a result sink anyway.
+    """
+
+    def __init__(
+        self, path: Union[str, os.PathLike], *, keep_results: bool = True, json_codec: Optional[JsonCodec] = None
+    ):
+        self.path = os.fspath(path)
+        self.keep_results = keep_results
+        self._codec = json_codec or get_json_codec()
+        self._lock = threading.Lock()
+        self._batch_id: Optional[str] = None
+        self._pushed: Dict[str, int] = {}  # chunk id -> size
+        self._pulled: Dict[str, Optional[Dict[str, Any]]] = {}  # chunk id -> chunk result (if kept)
+        truncated = self.__load()
+        self._file = open(self.path, 'ab')
+        if truncated:
+            self._file.write(b'\n')  # starts the next event on a new line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def batch_id(self) -> Optional[str]:
+        return self._batch_id
+
+    @property
+    def pushed(self) -> Dict[str, int]:
+        """The sizes of the chunks pushed so far by chunk id."""
+        return dict(self._pushed)
+
+    @property
+    def pulled(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """The results of the chunks pulled so far by chunk id (None if not kept)."""
+        return dict(self._pulled)
+
+    @property
+    def pending(self) -> List[str]:
+        """The ids of the chunks pushed but not pulled yet."""
+        with self._lock:
+            return [chunk_id for chunk_id in self._pushed if chunk_id not in self._pulled]
+
+    def attach(self, batch_id: str) -> None:
+        """Binds the checkpoint to a batch pipeline; a checkpoint follows a single pipeline."""
+        with self._lock:
+            if self._batch_id is None:
+                self._batch_id = batch_id
+                self.__append([{'event': 'batch', 'id': batch_id}])
+            elif self._batch_id != batch_id:
+                raise SparkError.sdk(
+                    f'checkpoint <{self.path}> belongs to batch pipeline <{self._batch_id}>, not <{batch_id}>', batch_id
+                )
+
+    def record_pushes(self, sizes: Mapping[str, int]) -> None:
+        """Records the sizes of the chunks acknowledged by the pipeline by chunk id."""
+        events = [{'event': 'push', 'id': chunk_id, 'size': size} for chunk_id, size in sizes.items()]
+        with self._lock:
+            self.__append(events)
+            self._pushed.update((e['id'], e['size']) for e in events)
+
+    def record_pulls(self, results: Iterable[Mapping[str, Any]]) -> None:
+        """Records chunk results retrieved from the pipeline."""
+        events = [
+            {'event': 'pull', 'id': r.get('id'), 'result': dict(r) if self.keep_results else None}
+            for r in results
+            if r.get('id')
+        ]
+        with self._lock:
+            self.__append(events)
+            self._pulled.update((e['id'], e['result']) for e in events)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __append(self, events: List[Dict[str, Any]]) -> None:
+        if events:
+            self._file.write(b''.join(self._codec.dumps(event) + b'\n' for event in events))
+            self._file.flush()
+
+    def __load(self) -> bool:
+        """Loads the recorded events and tells whether the last line is truncated."""
+        if not os.path.exists(self.path):
+            return False
+
+        line = b''
+        with open(self.path, 'rb') as file:
+            for line in file:
+                try:
+                    event = self._codec.loads(line)
+                except ValueError:
+                    continue  # partially written line
+
+                kind = event.get('event')
+                if kind == 'batch':
+                    self._batch_id = event['id']
+                elif kind == 'push':
+                    self._pushed[event['id']] = event['size']
+                elif kind == 'pull':
+                    self._pulled[event['id']] = event.get('result')
+        return bool(line) and not line.endswith(b'\n')
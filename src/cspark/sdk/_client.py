@@ -1,19 +1,29 @@
 from __future__ import annotations
 
+import os
 from types import TracebackType
-from typing import Any, Mapping, Optional, Union
+from typing import IO, Any, Callable, Dict, Mapping, Optional, TypeVar, Union
 
 import cspark.sdk.resources as API
 from httpx import AsyncClient as AsyncHttpClient
 from httpx import Client as HttpClient
 
 from ._auth import Authorization
+from ._breaker import CircuitBreaker
+from ._cache import MetadataCache, ResultCache, TokenCache
+from ._codec import JsonCodec
 from ._config import BaseUrl, Config, HealthUrl
+from ._constants import DOWNLOAD_CHUNK_SIZE
 from ._errors import SparkApiError, SparkError
+from ._http import HttpOptions
+from ._limiter import RateLimits
 from ._logger import LoggerOptions
+from ._retry import RetryPolicy
 
 __all__ = ['Client', 'AsyncClient']
 
+T = TypeVar('T')
+
 
 class Client:
     """
@@ -44,6 +54,14 @@ class Client:
         max_retries: Optional[int] = None,
         retry_interval: Optional[float] = None,
         logger: Union[bool, Mapping[str, Any], LoggerOptions] = True,
+        json_codec: Union[None, str, JsonCodec] = None,
+        result_cache: Optional[ResultCache] = None,
+        metadata_cache: Optional[MetadataCache] = None,
+        http: Union[None, Mapping[str, Any], HttpOptions] = None,
+        retry: Union[None, Mapping[str, Any], RetryPolicy] = None,
+        rate_limit: RateLimits = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        token_cache: Optional[TokenCache] = None,
         http_client: Optional[HttpClient] = None,
     ) -> None:
         self._config = Config(
@@ -57,8 +75,17 @@ class Client:
             max_retries=max_retries,
             retry_interval=retry_interval,
             logger=logger,
+            json_codec=json_codec,
+            result_cache=result_cache,
+            metadata_cache=metadata_cache,
+            http=http,
+            retry=retry,
+            rate_limit=rate_limit,
+            circuit_breaker=circuit_breaker,
+            token_cache=token_cache,
         )
-        self.http_client = http_client or HttpClient(timeout=self._config.timeout_in_sec)
+        self.http_client = http_client or self._config.http.client(self._config.timeout)
+        self._resources: Dict[Any, Any] = {}  # created once and reused
 
     def __enter__(self) -> Client:
         return self
@@ -79,50 +106,57 @@ class Client:
     def config(self) -> Config:
         return self._config
 
+    def __resource(self, factory: Callable[[Config, HttpClient], T]) -> T:
+        """Returns the resource built by `factory`, created once per HTTP client."""
+        resource = self._resources.get(factory)
+        if resource is None or resource._client is not self.http_client:
+            resource = self._resources[factory] = factory(self.config, self.http_client)
+        return resource
+
     @property
     def health(self) -> API.Health:
         """The resource to manage health checks."""
-        return API.Health(self.config, self.http_client)
+        return self.__resource(API.Health)
 
     @property
     def folders(self) -> API.Folders:
         """The resource to manage Folders API."""
-        return API.Folders(self.config, self.http_client)
+        return self.__resource(API.Folders)
 
     @property
     def services(self) -> API.Services:
         """The resource to manage Services API."""
-        return API.Services(self.config, self.http_client)
+        return self.__resource(API.Services)
 
     @property
     def transforms(self) -> API.Transforms:
         """The resource to manage Transforms API."""
-        return API.Transforms(self.config, self.http_client)
+        return self.__resource(API.Transforms)
 
     @property
     def batches(self) -> API.Batches:
         """The resource to manage asynchronous batch processing."""
-        return API.Batches(self.config, self.http_client)
+        return self.__resource(API.Batches)
 
     @property
     def logs(self) -> API.History:
         """The resource to manage service execution logs."""
-        return API.History(self.config, self.http_client)
+        return self.__resource(API.History)
 
     @property
     def files(self) -> API.Files:
         """The resource to manage files."""
-        return API.Files(self.config, self.http_client)
+        return self.__resource(API.Files)
 
     @property
     def wasm(self) -> API.Wasm:
         """The resource to manage a service's WebAssembly module."""
-        return API.Wasm(self.config, self.http_client)
+        return self.__resource(API.Wasm)
 
     @property
     def impex(self) -> API.ImpEx:
         """The resource to import and export Spark services."""
-        return API.ImpEx.only(self.config, self.http_client)
+        return self.__resource(API.ImpEx.only)
 
     @staticmethod
     def use(config: Config, http_client: Optional[HttpClient] = None) -> 'Client':
@@ -136,6 +170,14 @@ class Client:
             max_retries=config.max_retries,
             retry_interval=config.retry_interval,
             logger=config.logger,
+            json_codec=config.json_codec,
+            result_cache=config.result_cache,
+            metadata_cache=config.metadata_cache,
+            http=config.http,
+            retry=config.retry,
+            rate_limit=config.rate_limit,
+            circuit_breaker=config.circuit_breaker,
+            token_cache=config.token_cache,
             http_client=http_client,
         )
 
@@ -145,7 +187,7 @@ class Client:
     ):
         """Checks the health status of the Coherent Spark environment."""
         config = Config(base_url=HealthUrl.when(base_url), token=token, **options)
-        with http_client or HttpClient(timeout=config.timeout_in_sec) as client:
+        with http_client or config.http.client(config.timeout) as client:
             return API.Health(config, client).check()
 
     @staticmethod
@@ -161,6 +203,28 @@ class Client:
         except Exception as exc:
             raise SparkError.sdk(f'failed to download file from {url}', cause=exc) from exc
 
+    @staticmethod
+    def download_to(
+        url: str,
+        dest: Union[str, os.PathLike, IO[bytes]],
+        auth: Optional[Authorization] = None,
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+    ) -> API.Download:
+        """Streams a file from the given URL to a file path or a binary file-like object."""
+        try:
+            with HttpClient() as client:
+                request = client.build_request('GET', url, headers=auth.as_header if auth else {})
+                response = client.send(request, stream=True)
+                if response.status_code >= 400:
+                    response.read()
+                    raise SparkError.api(response.status_code, SparkApiError.to_cause(request, response))
+                downloaded = API.HttpResponse(response.status_code, None, None, response.headers, request, response)
+                return downloaded.save(dest, chunk_size=chunk_size, checksum=checksum)
+        except Exception as exc:
+            raise SparkError.sdk(f'failed to download file from {url}', cause=exc) from exc
+
 
 class AsyncClient:
     """
@@ -184,6 +248,14 @@ class AsyncClient:
         max_retries: Optional[int] = None,
         retry_interval: Optional[float] = None,
         logger: Union[bool, Mapping[str, Any], LoggerOptions] = True,
+        json_codec: Union[None, str, JsonCodec] = None,
+        result_cache: Optional[ResultCache] = None,
+        metadata_cache: Optional[MetadataCache] = None,
+        http: Union[None, Mapping[str, Any], HttpOptions] = None,
+        retry: Union[None, Mapping[str, Any], RetryPolicy] = None,
+        rate_limit: RateLimits = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        token_cache: Optional[TokenCache] = None,
         http_client: Optional[AsyncHttpClient] = None,
     ) -> None:
         self._config = Config(
@@ -197,8 +269,17 @@ class AsyncClient:
             max_retries=max_retries,
             retry_interval=retry_interval,
             logger=logger,
+            json_codec=json_codec,
+            result_cache=result_cache,
+            metadata_cache=metadata_cache,
+            http=http,
+            retry=retry,
+            rate_limit=rate_limit,
+            circuit_breaker=circuit_breaker,
+            token_cache=token_cache,
         )
-        self.http_client = http_client or AsyncHttpClient(timeout=self._config.timeout_in_sec)
+        self.http_client = http_client or self._config.http.async_client(self._config.timeout)
+        self._resources: Dict[Any, Any] = {}  # created once and reused
 
     async def __aenter__(self) -> AsyncClient:
         return self
@@ -219,50 +300,57 @@ class AsyncClient:
     def config(self) -> Config:
         return self._config
 
+    def __resource(self, factory: Callable[[Config, AsyncHttpClient], T]) -> T:
+        """Returns the resource built by `factory`, created once per HTTP client."""
+        resource = self._resources.get(factory)
+        if resource is None or resource._client is not self.http_client:
+            resource = self._resources[factory] = factory(self.config, self.http_client)
+        return resource
+
     @property
     def health(self) -> API.AsyncHealth:
         """The resource to manage health checks."""
-        return API.AsyncHealth(self.config, self.http_client)
+        return self.__resource(API.AsyncHealth)
 
     @property
     def folders(self) -> API.AsyncFolders:
         """The resource to manage Folders API."""
-        return API.AsyncFolders(self.config, self.http_client)
+        return self.__resource(API.AsyncFolders)
 
     @property
     def services(self) -> API.AsyncServices:
         """The resource to manage Services API."""
-        return API.AsyncServices(self.config, self.http_client)
+        return self.__resource(API.AsyncServices)
 
     @property
     def transforms(self) -> API.AsyncTransforms:
         """The resource to manage Transforms API."""
-        return API.AsyncTransforms(self.config, self.http_client)
+        return self.__resource(API.AsyncTransforms)
 
     @property
     def batches(self) -> API.AsyncBatches:
         """The resource to manage asynchronous batch processing."""
-        return API.AsyncBatches(self.config, self.http_client)
+        return self.__resource(API.AsyncBatches)
 
     @property
     def logs(self) -> API.AsyncHistory:
         """The resource to manage service execution logs."""
-        return API.AsyncHistory(self.config, self.http_client)
+        return self.__resource(API.AsyncHistory)
 
     @property
     def files(self) -> API.AsyncFiles:
         """The resource to manage files."""
-        return API.AsyncFiles(self.config, self.http_client)
+        return self.__resource(API.AsyncFiles)
 
     @property
     def wasm(self) -> API.AsyncWasm:
         """The resource to manage a service's WebAssembly module."""
-        return API.AsyncWasm(self.config, self.http_client)
+        return self.__resource(API.AsyncWasm)
 
     @property
     def impex(self) -> API.AsyncImpEx:
         """The resource to import and export Spark services."""
-        return API.AsyncImpEx.only(self.config, self.http_client)
+        return self.__resource(API.AsyncImpEx.only)
 
     @staticmethod
     async def use(config: Config, http_client: Optional[AsyncHttpClient] = None) -> 'AsyncClient':
@@ -276,6 +364,14 @@ class AsyncClient:
             max_retries=config.max_retries,
             retry_interval=config.retry_interval,
             logger=config.logger,
+            json_codec=config.json_codec,
+            result_cache=config.result_cache,
+            metadata_cache=config.metadata_cache,
+            http=config.http,
+            retry=config.retry,
+            rate_limit=config.rate_limit,
+            circuit_breaker=config.circuit_breaker,
+            token_cache=config.token_cache,
             http_client=http_client,
         )
 
@@ -288,7 +384,7 @@ class AsyncClient:
     ):
         """Checks the health status of the Coherent Spark environment."""
         config = Config(base_url=HealthUrl.when(base_url), token=token, **options)
-        async with http_client or AsyncHttpClient(timeout=config.timeout_in_sec) as client:
+        async with http_client or config.http.async_client(config.timeout) as client:
             return await API.AsyncHealth(config, client).check()
 
     @staticmethod
@@ -303,3 +399,25 @@ class AsyncClient:
             return await response.aread()
         except Exception as exc:
             raise SparkError.sdk(f'failed to download file from {url}', cause=exc) from exc
+
+    @staticmethod
+    async def download_to(
+        url: str,
+        dest: Union[str, os.PathLike, IO[bytes]],
+        auth: Optional[Authorization] = None,
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+    ) -> API.Download:
+        """Streams a file from the given URL to a file path or a binary file-like object."""
+        try:
+            async with AsyncHttpClient() as client:
+                request = client.build_request('GET', url, headers=auth.as_header if auth else {})
+                response = await client.send(request, stream=True)
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise SparkError.api(response.status_code, SparkApiError.to_cause(request, response))
+                downloaded = API.HttpResponse(response.status_code, None, None, response.headers, request, response)
+                return await downloaded.asave(dest, chunk_size=chunk_size, checksum=checksum)
+        except Exception as exc:
+            raise SparkError.sdk(f'failed to download file from {url}', cause=exc) from exc
@@ -0,0 +1,92 @@
+import json
+from typing import Any, Optional, Union
+
+from ._errors import SparkError
+from ._utils import import_optional_module
+
+__all__ = ['JsonCodec', 'get_json_codec']
+
+
+class JsonCodec:
+    """
+    Serializes and deserializes JSON payloads exchanged with Spark.
+
+    This default codec relies on Python's built-in `json` module. Faster codecs backed
+    by `orjson` or `ujson` are used instead whenever those packages are installed.
+    Subclass it to plug in a custom implementation.
+    """
+
+    name = 'json'
+
+    def __str__(self) -> str:
+        return self.name
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        self._orjson = import_optional_module('orjson')
+        self._options = self._orjson.OPT_NON_STR_KEYS | self._orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, data: Any) -> bytes:
+        try:
+            return self._orjson.dumps(data, option=self._options)
+        except TypeError:
+            return super().dumps(data)  # e.g., integers exceeding 64 bits or custom types
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    name = 'ujson'
+
+    def __init__(self) -> None:
+        self._ujson = import_optional_module('ujson')
+
+    def dumps(self, data: Any) -> bytes:
+        return self._ujson.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._ujson.loads(data)
+
+
+_CODECS = {'orjson': OrjsonCodec, 'ujson': UjsonCodec, 'json': JsonCodec}
+_default_codec: Optional[JsonCodec] = None
+
+
+def get_json_codec(codec: Union[None, str, JsonCodec] = None) -> JsonCodec:
+    """
+    Returns a JSON codec by name ('orjson', 'ujson' or 'json').
+
+    When no name (or 'auto') is given, the fastest codec available is picked once and
+    shared across clients.
+    """
+    global _default_codec
+
+    if isinstance(codec, JsonCodec):
+        return codec
+
+    if codec is None or codec == 'auto':
+        if _default_codec is None:
+            for factory in _CODECS.values():
+                try:
+                    _default_codec = factory()
+                    break
+                except ImportError:
+                    continue
+        return _default_codec  # type: ignore
+
+    if codec not in _CODECS:
+        raise SparkError.sdk(f'unsupported JSON codec <{codec}>; use one of: {", ".join(_CODECS)}', codec)
+    try:
+        return _CODECS[codec]()
+    except ImportError as err:
+        raise SparkError.sdk(f'install {codec} to use it as JSON codec', cause=str(err)) from err
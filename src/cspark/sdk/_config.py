@@ -3,20 +3,73 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import Any, Mapping, Optional, Tuple, Union, cast
+from dataclasses import replace
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union, cast
 from urllib.parse import urlparse
 
 from httpx import AsyncClient as AsyncHttpClient
 from httpx import Client as HttpClient
 
+from ._breaker import CircuitBreaker
+from ._cache import JwksCache, MetadataCache, ResultCache, TokenCache
+from ._codec import JsonCodec, get_json_codec
 from ._constants import *
 from ._errors import SparkError
+from ._http import HttpOptions
+from ._limiter import RateLimiter, RateLimits
 from ._logger import LoggerOptions
+from ._retry import RetryPolicy
 from ._utils import StringUtils, import_optional_module
 from ._validators import Validators
+from ._version import sdk_ua_header
 
 __all__ = ['Config', 'JwtConfig', 'BaseUrl', 'HealthUrl']
 
+_jwks_cache = JwksCache()  # shared by all token validations unless told otherwise
+
+
+class _ExtraHeaders(dict):
+    """Custom headers notifying their config of changes (see `Config.static_headers`)."""
+
+    def __init__(self, headers: Mapping[str, str], on_change: Callable[[], None]):
+        super().__init__(headers)
+        self._on_change = on_change
+
+    def __setitem__(self, key: str, value: str) -> None:
+        super().__setitem__(key, value)
+        self._on_change()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._on_change()
+
+    def __ior__(self, other: Any) -> '_ExtraHeaders':
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._on_change()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        value = super().setdefault(key, default)
+        self._on_change()
+        return value
+
+    def pop(self, *args: Any) -> Any:
+        value = super().pop(*args)
+        self._on_change()
+        return value
+
+    def popitem(self) -> Tuple[str, str]:
+        item = super().popitem()
+        self._on_change()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._on_change()
+
 
 class Config:
     _options: str
@@ -35,6 +88,14 @@ class Config:
         max_retries: Optional[int] = DEFAULT_MAX_RETRIES,
         retry_interval: Optional[float] = DEFAULT_RETRY_INTERVAL,
         logger: Union[bool, Mapping[str, Any], LoggerOptions] = True,
+        json_codec: Union[None, str, JsonCodec] = None,
+        result_cache: Optional[ResultCache] = None,
+        metadata_cache: Optional[MetadataCache] = None,
+        http: Union[None, Mapping[str, Any], HttpOptions] = None,
+        retry: Union[None, Mapping[str, Any], RetryPolicy] = None,
+        rate_limit: RateLimits = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        token_cache: Optional[TokenCache] = None,
     ) -> None:
         from ._auth import Authorization  # NOTE: help avoid circular import
 
@@ -50,7 +111,17 @@ class Config:
         self._max_retries = max_retries if num_validator.is_valid(max_retries) else DEFAULT_MAX_RETRIES
         self._retry_interval = retry_interval if num_validator.is_valid(retry_interval) else DEFAULT_RETRY_INTERVAL
         self._logger = LoggerOptions.when(logger)
-
+        self._json_codec = get_json_codec(json_codec)
+        self._result_cache = result_cache
+        self._metadata_cache = metadata_cache
+        self._http = HttpOptions.when(http)
+        self._retry_options = retry
+        self._retry = RetryPolicy.when(retry, max_retries=self._max_retries, interval=self._retry_interval)
+        self._rate_limit = RateLimiter.when(rate_limit)
+        self._circuit_breaker = circuit_breaker
+        self._token_cache = token_cache
+
+        self._static_headers: Dict[str, Dict[str, str]] = {}  # user agent -> headers
         self.extra_headers = {}
         self._options = str(
             {
@@ -62,16 +133,50 @@ class Config:
                 'max_retries': self._max_retries,
                 'retry_interval': self._retry_interval,
                 'logger': self._logger,
+                'json_codec': str(self._json_codec),
+                'result_cache': str(self._result_cache) if self._result_cache is not None else None,
+                'metadata_cache': str(self._metadata_cache) if self._metadata_cache is not None else None,
+                'http': self._http,
+                'retry': self._retry,
+                'rate_limit': {k: str(v) for k, v in self._rate_limit.items()} or None,
+                'circuit_breaker': str(self._circuit_breaker) if self._circuit_breaker else None,
+                'token_cache': str(self._token_cache) if self._token_cache is not None else None,
             }
         )
 
     def __str__(self) -> str:
         return self._options
 
+    @property
+    def extra_headers(self) -> Dict[str, str]:
+        """The custom headers to send along with every request."""
+        return self._extra_headers
+
+    @extra_headers.setter
+    def extra_headers(self, headers: Mapping[str, str]) -> None:
+        self._extra_headers = _ExtraHeaders(headers, self._static_headers.clear)
+        self._static_headers.clear()
+
     @property
     def has_headers(self) -> bool:
         return len(self.extra_headers) > 0
 
+    def static_headers(self, user_agent: str) -> Mapping[str, str]:
+        """
+        The headers common to all requests (i.e., all but the request id and credentials).
+
+        They are computed once per user agent and recomputed if `extra_headers` change.
+        """
+        headers = self._static_headers.get(user_agent)
+        if headers is None:
+            headers = self._static_headers[user_agent] = {
+                **self._extra_headers,
+                'User-Agent': user_agent,
+                'x-spark-ua': sdk_ua_header,
+                'x-tenant-name': self._base_url.tenant,
+            }
+        return headers
+
     @property
     def base_url(self) -> 'BaseUrl':
         return self._base_url
@@ -100,6 +205,43 @@ class Config:
     def logger(self) -> LoggerOptions:
         return self._logger
 
+    @property
+    def json_codec(self) -> JsonCodec:
+        return self._json_codec
+
+    @property
+    def result_cache(self) -> Optional[ResultCache]:
+        return self._result_cache
+
+    @property
+    def metadata_cache(self) -> Optional[MetadataCache]:
+        return self._metadata_cache
+
+    @property
+    def http(self) -> HttpOptions:
+        return self._http
+
+    @property
+    def retry(self) -> RetryPolicy:
+        """The policy for retrying failed HTTP requests (derived from `max_retries` if not set)."""
+        return self._retry
+
+    @property
+    def rate_limit(self) -> Mapping[str, RateLimiter]:
+        return self._rate_limit
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        return self._circuit_breaker
+
+    @property
+    def token_cache(self) -> Optional[TokenCache]:
+        return self._token_cache
+
+    def rate_limiter(self, rate_class: str) -> Optional[RateLimiter]:
+        """Returns the rate limiter applying to an endpoint class (if any)."""
+        return self._rate_limit.get(rate_class) or self._rate_limit.get('*')
+
     def copy_with(
         self,
         *,
@@ -126,19 +268,34 @@ class Config:
             timeout=timeout or self._timeout,
             max_retries=max_retries or self._max_retries,
             retry_interval=retry_interval or self._retry_interval,
+            json_codec=self._json_codec,
+            result_cache=self._result_cache,
+            metadata_cache=self._metadata_cache,
+            http=self._http,
+            retry=self._retry_with(max_retries, retry_interval),
+            rate_limit=self._rate_limit,
+            circuit_breaker=self._circuit_breaker,
+            token_cache=self._token_cache,
         )
 
+    def _retry_with(
+        self, max_retries: Optional[int], retry_interval: Optional[float]
+    ) -> Union[None, Mapping[str, Any], RetryPolicy]:
+        """Derives the retry options of a copy, applying explicit overrides to the current policy."""
+        overrides = {k: v for k, v in (('max_retries', max_retries), ('interval', retry_interval)) if v is not None}
+        return replace(self._retry, **overrides) if overrides else self._retry_options
+
     def get(self, client: Optional[HttpClient] = None):
         """Fetches the SaaS configuration for the current user (via API)."""
         from .resources import Platform
 
-        return Platform(self, client or HttpClient(timeout=self.timeout_in_sec)).get_config()
+        return Platform(self, client or self._http.client(self.timeout)).get_config()
 
     async def aget(self, client: Optional[AsyncHttpClient] = None):
         """Fetches asynchronously the SaaS configuration for the current user (via API)."""
         from .resources._async import AsyncPlatform
 
-        return await AsyncPlatform(self, client or AsyncHttpClient(timeout=self.timeout_in_sec)).get_config()
+        return await AsyncPlatform(self, client or self._http.async_client(self.timeout)).get_config()
 
 
 class JwtConfig(Config):
@@ -151,6 +308,13 @@ class JwtConfig(Config):
         max_retries: Optional[int] = None,
         retry_interval: Optional[float] = None,
         logger: Union[bool, Mapping[str, Any], LoggerOptions] = True,
+        json_codec: Union[None, str, JsonCodec] = None,
+        result_cache: Optional[ResultCache] = None,
+        metadata_cache: Optional[MetadataCache] = None,
+        http: Union[None, Mapping[str, Any], HttpOptions] = None,
+        retry: Union[None, Mapping[str, Any], RetryPolicy] = None,
+        rate_limit: RateLimits = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
     ):
         options = JwtConfig.decode(token, verify=verify)
         if verify and not options['verified']:
@@ -164,6 +328,13 @@ class JwtConfig(Config):
             max_retries=max_retries,
             retry_interval=retry_interval,
             logger=logger,
+            json_codec=json_codec,
+            result_cache=result_cache,
+            metadata_cache=metadata_cache,
+            http=http,
+            retry=retry,
+            rate_limit=rate_limit,
+            circuit_breaker=circuit_breaker,
         )
 
     @staticmethod
@@ -192,11 +363,42 @@ class JwtConfig(Config):
         return {'token': token, 'base_url': base_url, 'tenant': tenant, 'verified': valid, 'decoded': decoded}
 
     @staticmethod
-    def validate(token: str, issuer: str, *, audience: str = 'product-factory', algorithms: Tuple[str] = ('RS256',)):
+    def validate(
+        token: str,
+        issuer: str,
+        *,
+        audience: str = 'product-factory',
+        algorithms: Tuple[str] = ('RS256',),
+        jwks_cache: Optional[JwksCache] = None,
+        http_client: Optional[HttpClient] = None,
+    ):
+        """Verifies a token against the signing keys of its issuer (cached in `jwks_cache`)."""
+        jwks_cache = _jwks_cache if jwks_cache is None else jwks_cache
+        try:
+            jwt = import_optional_module('jwt', 'pyjwt[crypto]')
+            signing_key = jwks_cache.get_signing_key(token, issuer, http_client)
+            decoded = jwt.decode(token, key=signing_key, algorithms=algorithms, audience=audience, issuer=issuer)
+            return True, decoded
+        except ImportError as err:
+            raise SparkError.sdk('install cspark[jwt] to validate json web tokens (JWT)', cause=str(err)) from err
+        except Exception as exc:
+            return False, str(exc)
+
+    @staticmethod
+    async def avalidate(
+        token: str,
+        issuer: str,
+        *,
+        audience: str = 'product-factory',
+        algorithms: Tuple[str] = ('RS256',),
+        jwks_cache: Optional[JwksCache] = None,
+        http_client: Optional[AsyncHttpClient] = None,
+    ):
+        """Asynchronously verifies a token against the signing keys of its issuer (see `validate`)."""
+        jwks_cache = _jwks_cache if jwks_cache is None else jwks_cache
         try:
             jwt = import_optional_module('jwt', 'pyjwt[crypto]')
-            jwks_client = jwt.PyJWKClient(f'{issuer}/protocol/openid-connect/certs')
-            signing_key = jwks_client.get_signing_key_from_jwt(token)
+            signing_key = await jwks_cache.aget_signing_key(token, issuer, http_client)
             decoded = jwt.decode(token, key=signing_key, algorithms=algorithms, audience=audience, issuer=issuer)
             return True, decoded
         except ImportError as err:
@@ -3,6 +3,7 @@ __all__ = [
     'DEFAULT_MAX_RETRIES',
     'DEFAULT_RETRY_INTERVAL',
     'DEFAULT_TIMEOUT_IN_MS',
+    'DOWNLOAD_CHUNK_SIZE',
     'RETRY_RANDOMIZATION_FACTOR',
     'DEFAULT_LOGGER_FORMAT',
     'DEFAULT_LOGGER_DATEFMT',
@@ -12,6 +13,7 @@ __all__ = [
 DEFAULT_MAX_RETRIES = 2
 DEFAULT_RETRY_INTERVAL = 1  # 1 second
 DEFAULT_TIMEOUT_IN_MS = 60000  # 60 seconds
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
 RETRY_RANDOMIZATION_FACTOR = 1.5
 DEFAULT_LOGGER_FORMAT = '[%(name)s] %(asctime)s %(levelname)s - %(message)s'
 DEFAULT_LOGGER_DATEFMT = '%m/%d/%Y, %I:%M:%S %p'
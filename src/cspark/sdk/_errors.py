@@ -5,7 +5,15 @@ from typing import Any, Dict, Generic, Optional, TypeVar, cast
 
 from httpx import Headers, Request, Response
 
-__all__ = ['SparkError', 'SparkSdkError', 'RetryTimeoutError', 'SparkApiError', 'ErrorMessage', 'ApiErrorCause']
+__all__ = [
+    'SparkError',
+    'SparkSdkError',
+    'RetryTimeoutError',
+    'CircuitOpenError',
+    'SparkApiError',
+    'ErrorMessage',
+    'ApiErrorCause',
+]
 
 
 class SparkError(Exception):
@@ -16,6 +24,7 @@ class SparkError(Exception):
     * SparkError
         - SparkSdkError
             + RetryTimeoutError
+            + CircuitOpenError
         - SparkApiError
             + BadRequestError
             + UnauthorizedError
@@ -105,6 +114,18 @@ class RetryTimeoutError(SparkSdkError):
         return {**super().to_dict(), 'retries': self.retries, 'interval': self.interval}
 
 
+class CircuitOpenError(SparkSdkError):
+    """Raised when a request is rejected without being sent because its circuit is open."""
+
+    def __init__(self, message: str, *, key: str = '', retry_in: float = 0.0):
+        super().__init__(ErrorMessage(message, key))
+        self.key = key
+        self.retry_in = retry_in
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**super().to_dict(), 'key': self.key, 'retry_in': self.retry_in}
+
+
 class SparkApiError(SparkError):
     """
     Base class for errors related to the API.
@@ -153,7 +174,7 @@ class SparkApiError(SparkError):
         elif status == 504:
             return GatewayTimeoutError(error, status)
         else:
-            return UnknownApiError(error)
+            return UnknownApiError(error, status)
 
     @staticmethod
     def to_cause(request: Request, response: Response) -> dict[str, Any]:
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Union
+
+from httpx import AsyncClient as AsyncHttpClient
+from httpx import Client as HttpClient
+from httpx import Limits, Timeout
+
+from ._errors import SparkError
+from ._utils import import_optional_module
+
+__all__ = ['HttpOptions']
+
+
+@dataclass
+class HttpOptions:
+    """
+    Tunes the connection pool and transport of the HTTP clients created by the SDK.
+
+    Pool limits default to httpx's (100 connections, 20 of them kept alive for 5 seconds),
+    which throttles highly concurrent workloads (e.g., hundreds of parallel executions);
+    raise them to match the expected concurrency. Timeouts are in milliseconds and fall
+    back to the client's `timeout` when not set. HTTP/2 requires `cspark[http2]`.
+
+    These options only apply when the SDK creates the HTTP client itself, i.e., when no
+    custom `http_client` is provided.
+    """
+
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 5.0  # in seconds
+    http2: bool = False
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+    write_timeout: Optional[float] = None
+    pool_timeout: Optional[float] = None
+
+    @staticmethod
+    def when(options: Union[None, Mapping[str, Any], 'HttpOptions']) -> 'HttpOptions':
+        if options is None:
+            return HttpOptions()
+        if isinstance(options, Mapping):
+            return HttpOptions(**options)
+        return options
+
+    @property
+    def limits(self) -> Limits:
+        return Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self, default: float) -> Timeout:
+        """Builds the timeouts (in seconds) given the default one (in milliseconds)."""
+        connect, read, write, pool = (
+            (t if t is not None else default) / 1000
+            for t in (self.connect_timeout, self.read_timeout, self.write_timeout, self.pool_timeout)
+        )
+        return Timeout(default / 1000, connect=connect, read=read, write=write, pool=pool)
+
+    def client(self, timeout: float, **kwargs: Any) -> HttpClient:
+        """Creates a synchronous HTTP client given the default timeout (in milliseconds)."""
+        return HttpClient(timeout=self.timeout(timeout), limits=self.limits, http2=self.__http2(), **kwargs)
+
+    def async_client(self, timeout: float, **kwargs: Any) -> AsyncHttpClient:
+        """Creates an asynchronous HTTP client given the default timeout (in milliseconds)."""
+        return AsyncHttpClient(timeout=self.timeout(timeout), limits=self.limits, http2=self.__http2(), **kwargs)
+
+    def __http2(self) -> bool:
+        if self.http2:
+            try:
+                import_optional_module('h2', 'httpx[http2]')
+            except ImportError as err:
+                raise SparkError.sdk('install cspark[http2] to enable HTTP/2', cause=str(err)) from err
+        return self.http2
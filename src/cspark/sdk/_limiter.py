@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Mapping, Optional, Union
+
+from ._errors import SparkError
+
+__all__ = ['RateLimiter']
+
+RateLimits = Union[None, float, 'RateLimiter', Mapping[str, Union[float, 'RateLimiter']]]
+
+
+class RateLimiter:
+    """
+    Paces outbound requests to Spark using a token bucket.
+
+    Up to `rate` requests per second are let through on average, with bursts of up to
+    `burst` requests (defaults to `rate`). A limiter may be shared across threads and
+    event loops: a token is reserved under a lock and the caller then waits (sleeps or
+    awaits) outside of it, so that concurrent callers are spread out evenly over time.
+
+    When `adaptive`, the rate is halved (down to `min_rate`) every time Spark responds
+    with 429 (Too Many Requests), and the bucket stays empty for the `Retry-After` delay
+    if any; the rate then grows back gradually towards `rate` as requests succeed.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        burst: Optional[float] = None,
+        adaptive: bool = False,
+        min_rate: Optional[float] = None,
+    ):
+        if not rate or rate <= 0:
+            raise SparkError.sdk('rate limit must be a positive number of requests per second', rate)
+
+        self.max_rate = float(rate)
+        self.rate = self.max_rate
+        self.burst = max(1.0, float(burst) if burst is not None else self.max_rate)
+        self.adaptive = adaptive
+        self.min_rate = min(self.max_rate, min_rate if min_rate is not None else self.max_rate / 10)
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return f'{type(self).__name__}(rate={self.max_rate}, burst={self.burst}, adaptive={self.adaptive})'
+
+    @staticmethod
+    def when(limits: RateLimits) -> Dict[str, 'RateLimiter']:
+        """
+        Builds the rate limiters by endpoint class ('execute', 'batch', 'metadata').
+
+        A single limit (requests per second or limiter) applies to all endpoints alike
+        while a mapping sets a limit per endpoint class, with '*' as the fallback.
+        """
+        if limits is None:
+            return {}
+        if not isinstance(limits, Mapping):
+            limits = {'*': limits}
+        return {k: v if isinstance(v, RateLimiter) else RateLimiter(v) for k, v in limits.items()}
+
+    def reserve(self) -> float:
+        """Takes a token and returns how long (in seconds) to wait before using it."""
+        with self._lock:
+            self.__refill()
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """Slows down after a 429 response (adaptive limiters only)."""
+        if not self.adaptive:
+            return
+        with self._lock:
+            self.__refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self._tokens = min(self._tokens, -retry_after * self.rate)
+
+    def recover(self) -> None:
+        """Speeds up again after a successful response (adaptive limiters only)."""
+        if not self.adaptive or self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.__refill()
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
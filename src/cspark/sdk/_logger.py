@@ -1,6 +1,9 @@
+import functools
+import json
 import logging
 from dataclasses import dataclass
-from typing import Any, Mapping, Union
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Union
 
 from ._constants import DEFAULT_LOGGER_DATEFMT
 from ._version import sdk_logger
@@ -16,6 +19,7 @@ class LoggerOptions:
     datefmt: str = DEFAULT_LOGGER_DATEFMT
     colorful: bool = True
     timestamp: bool = True
+    json: bool = False  # structured logs (one JSON object per line) rather than colorful text
 
     @staticmethod
     def when(options: Union[bool, Mapping[str, Any], 'LoggerOptions']) -> 'LoggerOptions':
@@ -31,20 +35,24 @@ class ColorfulFormatter(logging.Formatter):
         super().__init__(datefmt=datefmt)
         self.colorful = colorful
         self.timestamp = timestamp
+        self._formatters: Dict[int, logging.Formatter] = {}  # by level, built once
 
     def format(self, record: logging.LogRecord) -> str:
+        record.levelname = record.levelname.rjust(8, ' ')  # right align levelname
+        formatter = self._formatters.get(record.levelno)
+        if formatter is None:
+            fmt = self.format_of(record.levelno)
+            formatter = self._formatters[record.levelno] = logging.Formatter(fmt, datefmt=self.datefmt)
+        return formatter.format(record)
+
+    def format_of(self, level: int) -> str:
         timestamp = '%(asctime)s' if self.timestamp else ''
         if self.colorful:
             colored_heading = '\x1b[38;5;3m[%(name)s]\x1b[39m'  # orange
             colored_timestamp = f'\x1b[34m{timestamp}\x1b[39m'  # blue
-            colored_level_and_msg = f'{self.color_by_level(record.levelno, "%(levelname)s - %(message)s")}'
-            formatted_msg = f'{colored_heading} {colored_timestamp} {colored_level_and_msg}'
-        else:
-            formatted_msg = f'[%(name)s] {timestamp} %(levelname)s - %(message)s'
-
-        record.levelname = record.levelname.rjust(8, ' ')  # right align levelname
-        formatter = logging.Formatter(formatted_msg, datefmt=self.datefmt)
-        return formatter.format(record)
+            colored_level_and_msg = f'{self.color_by_level(level, "%(levelname)s - %(message)s")}'
+            return f'{colored_heading} {colored_timestamp} {colored_level_and_msg}'
+        return f'[%(name)s] {timestamp} %(levelname)s - %(message)s'
 
     def color_by_level(self, level: int, msg: str) -> str:
         if level == logging.DEBUG:
@@ -61,6 +69,25 @@ class ColorfulFormatter(logging.Formatter):
             return f'\x1b[32m{msg}\x1b[39m'  # green
 
 
+class JsonFormatter(logging.Formatter):
+    """Formats records as JSON objects (one per line) for log collectors; timestamps are ISO 8601 (UTC)."""
+
+    def __init__(self, *, timestamp: bool = True) -> None:
+        super().__init__()
+        self.timestamp = timestamp
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {}
+        if self.timestamp:
+            entry['timestamp'] = datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds')
+        entry['level'] = record.levelname.strip()
+        entry['logger'] = record.name
+        entry['message'] = record.getMessage()
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
 def get_logger(
     context: str = sdk_logger,
     disabled: bool = False,
@@ -68,16 +95,43 @@ def get_logger(
     datefmt: str = DEFAULT_LOGGER_DATEFMT,
     colorful: bool = True,
     timestamp: bool = True,
+    json: bool = False,
 ) -> logging.Logger:
+    logger = _setup_logger(context, datefmt, colorful, timestamp, json)
+    level = disabled and logging.CRITICAL or level
+    if logger.level != level:
+        logger.setLevel(level)
+    return logger
+
+
+def _setup_logger(context: str, datefmt: str, colorful: bool, timestamp: bool, json: bool) -> logging.Logger:
+    """
+    Sets up a logger with a single SDK handler whose formatter follows the latest options,
+    leaving alone loggers whose handlers were configured elsewhere.
+    """
     logging.getLogger('httpx').disabled = True  # disable existing loggers
 
     logger = logging.getLogger(context)
-    logger.setLevel(disabled and logging.CRITICAL or level)
-
-    if not logger.handlers:
-        formatter = ColorfulFormatter(datefmt=datefmt, colorful=colorful, timestamp=timestamp)
-        handler = logging.StreamHandler()
-        handler.setFormatter(formatter)
+    handler = next((h for h in logger.handlers if isinstance(h, _SdkHandler)), None)
+    if handler is None:
+        if logger.handlers:
+            return logger
+        handler = _SdkHandler()
         logger.addHandler(handler)
 
+    formatter = _formatter_of(datefmt, colorful, timestamp, json)
+    if handler.formatter is not formatter:
+        handler.setFormatter(formatter)
     return logger
+
+
+@functools.lru_cache(maxsize=None)
+def _formatter_of(datefmt: str, colorful: bool, timestamp: bool, json: bool) -> logging.Formatter:
+    """Builds a formatter only once per set of options."""
+    if json:
+        return JsonFormatter(timestamp=timestamp)
+    return ColorfulFormatter(datefmt=datefmt, colorful=colorful, timestamp=timestamp)
+
+
+class _SdkHandler(logging.StreamHandler):
+    """Tells the handler added by the SDK apart from those added by users."""
@@ -0,0 +1,125 @@
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Collection, Mapping, Optional, Tuple, Type, Union
+
+from httpx import ConnectError, ConnectTimeout, PoolTimeout, Request, Response, TransportError
+
+from ._constants import DEFAULT_MAX_RETRIES, DEFAULT_RETRY_INTERVAL
+
+__all__ = ['RetryPolicy']
+
+# failures telling that the request never reached (or was not processed by) Spark;
+# these are safe to retry regardless of the HTTP method.
+_UNPROCESSED_STATUS_CODES = (408, 429)
+_UNSENT_ERRORS = (ConnectError, ConnectTimeout, PoolTimeout)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Decides whether and when a failed HTTP request is retried.
+
+    Requests failing with one of the `status_codes` or `exceptions` (connection errors and
+    timeouts by default) are retried up to `max_retries` times with an exponential backoff
+    and full jitter, i.e., a random delay between 0 and `interval * 2^retries` seconds
+    capped at `max_interval`, so that concurrent clients do not retry in lockstep. A
+    `Retry-After` header sent by Spark takes precedence over the backoff when `retry_after`
+    is enabled, unless it asks to wait longer than `max_retry_after` seconds, in which case
+    the request is not retried. No retry is attempted once `deadline` seconds (if any)
+    would be exceeded.
+
+    Failures that may have reached Spark (e.g., 502, 503, 504 or a connection reset) are
+    only retried for idempotent requests: those using one of the `idempotent_methods` or
+    explicitly flagged as such. Timeouts (408), rate limits (429) and failures to connect
+    are retried regardless.
+    """
+
+    max_retries: int = DEFAULT_MAX_RETRIES
+    interval: float = DEFAULT_RETRY_INTERVAL  # in seconds
+    max_interval: float = 30.0  # in seconds
+    status_codes: Collection[int] = (408, 429, 502, 503, 504)
+    exceptions: Tuple[Type[Exception], ...] = (TransportError,)
+    idempotent_methods: Collection[str] = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+    retry_after: bool = True
+    max_retry_after: float = 120.0  # in seconds
+    deadline: Optional[float] = None  # in seconds
+
+    @staticmethod
+    def when(
+        options: Union[None, Mapping[str, Any], 'RetryPolicy'],
+        *,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        interval: float = DEFAULT_RETRY_INTERVAL,
+    ) -> 'RetryPolicy':
+        if options is None:
+            return RetryPolicy(max_retries=max_retries, interval=interval)
+        if isinstance(options, Mapping):
+            return RetryPolicy(**{'max_retries': max_retries, 'interval': interval, **options})
+        return options
+
+    def backoff(self, retries: int, response: Optional[Response] = None) -> float:
+        """Computes the delay (in seconds) before the next attempt."""
+        if self.retry_after and response is not None:
+            delay = parse_retry_after(response.headers.get('retry-after'))
+            if delay is not None:
+                return min(delay, self.max_retry_after)
+        return random.uniform(0, min(self.max_interval, self.interval * 2**retries))
+
+    def next_delay(
+        self,
+        request: Request,
+        retries: int,
+        started_at: float,
+        *,
+        response: Optional[Response] = None,
+        error: Optional[Exception] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Optional[float]:
+        """
+        Tells how long to wait before retrying a failed request (None if it should not be retried).
+
+        `started_at` is the `time.monotonic()` of the first attempt; `idempotent` overrides
+        the idempotency inferred from the HTTP method.
+        """
+        if retries >= self.max_retries:
+            return None
+
+        if idempotent is None:
+            idempotent = request.method.upper() in self.idempotent_methods
+        if response is not None:
+            status = response.status_code
+            if status not in self.status_codes or not (idempotent or status in _UNPROCESSED_STATUS_CODES):
+                return None
+        elif error is not None:
+            if not isinstance(error, self.exceptions) or not (idempotent or isinstance(error, _UNSENT_ERRORS)):
+                return None
+
+        if self.retry_after and response is not None:
+            retry_after = parse_retry_after(response.headers.get('retry-after'))
+            if retry_after is not None and retry_after > self.max_retry_after:
+                return None  # not worth holding the caller back for that long
+
+        delay = self.backoff(retries, response)
+        if self.deadline is not None and time.monotonic() - started_at + delay > self.deadline:
+            return None
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,214 @@
+import csv
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional, Union
+
+from ._codec import JsonCodec, get_json_codec
+from ._errors import SparkError
+from ._utils import import_optional_module
+
+__all__ = ['ResultSink', 'JsonlSink', 'CsvSink', 'ParquetSink']
+
+
+class ResultSink(ABC):
+    """
+    Receives the results of a batch pipeline as they are pulled, one chunk at a time.
+
+    Each record of a chunk result is joined back to its inputs (when known) and handed
+    over to the sink as a dictionary with the following keys: `chunk_id`, `index` (the
+    position of the record within its chunk), `inputs`, `outputs`, `warnings`, `errors`
+    and `process_time`. Subclasses only need to implement `_write()`; writes are
+    serialized so that a sink can be shared across threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def write(self, result: Mapping[str, Any], inputs: Optional[List[Any]] = None) -> int:
+        """Writes the records of a chunk result and returns how many were written."""
+        records = list(_iter_records(result, inputs))
+        with self._lock:
+            self._write(records)
+            self.records += len(records)
+        return len(records)
+
+    def close(self) -> None:  # noqa: B027 (nothing to release by default)
+        pass
+
+    @abstractmethod
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        """Writes the records of a chunk result (called with the lock held)."""
+
+
+class JsonlSink(ResultSink):
+    """Writes one JSON object per record to a file path or a binary file-like object."""
+
+    def __init__(self, dest: Union[str, os.PathLike, IO[bytes]], *, json_codec: Optional[JsonCodec] = None):
+        super().__init__()
+        self._codec = json_codec or get_json_codec()
+        self._file, self._owned = _open(dest, 'wb')
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        self._file.write(b''.join(self._codec.dumps(record) + b'\n' for record in records))
+
+    def close(self) -> None:
+        if self._owned:
+            self._file.close()
+
+
+class CsvSink(ResultSink):
+    """
+    Writes one row per record to a file path or a text file-like object.
+
+    Columns are the chunk id followed by the inputs and the outputs of the records; outputs
+    named after an input are prefixed with 'output.'. Then come the `warnings` and `errors`
+    (as JSON) and the `process_time` of the records, prefixed with 'meta.' if already taken.
+
+    The header row is given by `fieldnames` or inferred from the first record written. A
+    record with columns missing from the header raises an error rather than being written
+    partially.
+    """
+
+    def __init__(
+        self,
+        dest: Union[str, os.PathLike, IO[str]],
+        *,
+        fieldnames: Optional[List[str]] = None,
+        json_codec: Optional[JsonCodec] = None,
+        **fmtparams: Any,
+    ):
+        super().__init__()
+        self._file, self._owned = _open(dest, 'w', newline='')
+        self._fieldnames = fieldnames
+        self._codec = json_codec or get_json_codec()
+        self._fmtparams = fmtparams
+        self._writer: Optional[csv.DictWriter] = None
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        rows = [_flatten(record, self._codec) for record in records]
+        if not rows:
+            return
+        if self._writer is None:
+            fieldnames = self._fieldnames or list(rows[0])
+            self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, **self._fmtparams)
+            self._writer.writeheader()
+        _assert_columns(rows, self._writer.fieldnames)
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        if self._owned:
+            self._file.close()
+
+
+class ParquetSink(ResultSink):
+    """
+    Writes records as flat rows (see `CsvSink`) to a Parquet file using `pyarrow`.
+
+    Rows are buffered and written in row groups of `row_group_size` records; the schema
+    is inferred from the first row group, and rows with columns missing from it raise an
+    error.
+    """
+
+    def __init__(
+        self,
+        dest: Union[str, os.PathLike, IO[bytes]],
+        *,
+        row_group_size: int = 10_000,
+        json_codec: Optional[JsonCodec] = None,
+    ):
+        super().__init__()
+        self._pa = import_optional_module('pyarrow')
+        self._pq = import_optional_module('pyarrow.parquet', 'pyarrow')
+        self._dest = os.fspath(dest) if isinstance(dest, (str, os.PathLike)) else dest
+        self._row_group_size = max(1, row_group_size)
+        self._codec = json_codec or get_json_codec()
+        self._rows: List[Dict[str, Any]] = []
+        self._writer = None
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        self._rows.extend(_flatten(record, self._codec) for record in records)
+        if len(self._rows) >= self._row_group_size:
+            self.__flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self.__flush()
+            if self._writer is not None:
+                self._writer.close()
+
+    def __flush(self) -> None:
+        if not self._rows:
+            return
+        table = self._pa.Table.from_pylist(self._rows)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._dest, table.schema)
+        else:
+            _assert_columns(self._rows, self._writer.schema.names)
+            table = table.select(self._writer.schema.names).cast(self._writer.schema)
+        self._writer.write_table(table)
+        self._rows = []
+
+
+def _open(dest: Any, mode: str, **kwargs: Any):
+    if isinstance(dest, (str, os.PathLike)):
+        return open(dest, mode, **kwargs), True
+    return dest, False
+
+
+def _as_records(rows: Optional[List[Any]]) -> List[Any]:
+    """Converts rows in columnar format (headers first) into dictionaries."""
+    if not rows:
+        return []
+    if isinstance(rows[0], list):
+        headers = rows[0]
+        return [dict(zip(headers, row)) for row in rows[1:]]
+    return rows
+
+
+def _iter_records(result: Mapping[str, Any], inputs: Optional[List[Any]] = None) -> Iterator[Dict[str, Any]]:
+    outputs = _as_records(result.get('outputs'))
+    records = _as_records(inputs)
+    warnings, errors = result.get('warnings') or [], result.get('errors') or []
+    process_time = result.get('process_time') or []
+
+    for i, output in enumerate(outputs):
+        yield {
+            'chunk_id': result.get('id'),
+            'index': i,
+            'inputs': records[i] if i < len(records) else None,
+            'outputs': output,
+            'warnings': warnings[i] if i < len(warnings) else None,
+            'errors': errors[i] if i < len(errors) else None,
+            'process_time': process_time[i] if i < len(process_time) else None,
+        }
+
+
+def _flatten(record: Dict[str, Any], codec: JsonCodec) -> Dict[str, Any]:
+    inputs = record['inputs'] if isinstance(record['inputs'], dict) else {}
+    outputs = record['outputs'] if isinstance(record['outputs'], dict) else {'outputs': record['outputs']}
+    row = {'chunk_id': record['chunk_id'], **inputs}
+    row.update({f'output.{k}' if k in row else k: v for k, v in outputs.items()})
+
+    meta = {
+        'warnings': codec.dumps(record['warnings']).decode('utf-8') if record['warnings'] else None,
+        'errors': codec.dumps(record['errors']).decode('utf-8') if record['errors'] else None,
+        'process_time': record['process_time'],
+    }
+    row.update({f'meta.{k}' if k in row else k: v for k, v in meta.items()})
+    return row
+
+
+def _assert_columns(rows: List[Dict[str, Any]], fieldnames: Any) -> None:
+    """Fails if any row has columns that are not part of the header row (`fieldnames`)."""
+    known = set(fieldnames)
+    unknown = list(dict.fromkeys(key for row in rows for key in row if key not in known))
+    if unknown:
+        raise SparkError.sdk(f'unexpected columns in result records: {", ".join(map(str, unknown))}', unknown)
@@ -1,19 +1,26 @@
 import asyncio
+import logging
+import time
 from typing import Any, Mapping, Optional, Union
 
 from httpx import URL, AsyncClient, HTTPError, HTTPStatusError, Request, RequestError
 
+from ..._breaker import CircuitBreaker
 from ..._config import Config
 from ..._errors import SparkApiError, SparkError
 from ..._logger import get_logger
-from ..._utils import get_retry_timeout, get_uuid
-from ..._version import about, sdk_ua_header
+from ..._retry import RetryPolicy, parse_retry_after
+from ..._utils import get_uuid
+from ..._version import about
 from .._base import HttpResponse, Uri
 
 __all__ = ['AsyncApiResource']
 
 
 class AsyncApiResource:
+    rate_class = 'metadata'  # which rate limit applies to the requests (see `Config.rate_limit`)
+    user_agent = about
+
     def __init__(self, config: Config, http_client: AsyncClient):
         self.config = config
         self.logger = get_logger(**config.logger.__dict__)
@@ -21,13 +28,7 @@ class AsyncApiResource:
 
     @property
     def default_headers(self):
-        return {
-            **self.config.extra_headers,
-            'User-Agent': about,
-            'x-spark-ua': sdk_ua_header,
-            'x-request-id': get_uuid(),
-            'x-tenant-name': self.config.base_url.tenant,
-        }
+        return {**self.config.static_headers(self.user_agent), 'x-request-id': get_uuid()}
 
     async def request(
         self,
@@ -40,75 +41,154 @@ class AsyncApiResource:
         content: Optional[bytes] = None,
         form: Optional[Any] = None,
         files: Optional[Any] = None,
+        stream: bool = False,
+        idempotent: Optional[bool] = None,
+        rate_class: Optional[str] = None,
+        retry: Optional[RetryPolicy] = None,  # overrides the retry policy of the client for this request
     ) -> 'HttpResponse':
         url = str(url)
+        if body is not None and content is None:
+            content = self.config.json_codec.dumps(body)
+            headers = {'Content-Type': 'application/json', **headers}
+
         request = self._client.build_request(
             method,
             url,
             params=params,
             headers={**headers, **self.default_headers},
             data=form,
-            json=body,
             content=content,
             files=files,
         )
 
-        self.logger.debug(f'{method} {url}')
-        return await self.__fetch(request)
-
-    async def __fetch(self, request: Request, retries: int = 0) -> HttpResponse:
-        request.headers.update(self.config.auth.as_header)
-
-        response, status_code = None, 0
-        err_msg = f'an error occurred while fetching <{request.url}>'
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('%s %s', method, url)
+        rate_class = rate_class or self.rate_class
+        return await self.__fetch(request, stream=stream, idempotent=idempotent, rate_class=rate_class, policy=retry)
 
+    async def __fetch(
+        self,
+        request: Request,
+        retries: int = 0,
+        stream: bool = False,
+        idempotent: Optional[bool] = None,
+        started_at: Optional[float] = None,
+        rate_class: str = 'metadata',
+        policy: Optional[RetryPolicy] = None,
+    ) -> HttpResponse:
+        await self._authorize(request)
+        policy, started_at = policy or self.config.retry, started_at or time.monotonic()
+        limiter, breaker = self.config.rate_limiter(rate_class), self.config.circuit_breaker
+        circuit = f'{request.url.host}/{rate_class}'
+        if breaker is not None:
+            await self.__enter_circuit(breaker, circuit)
+
+        pending = breaker is not None  # a request let through the circuit must report its outcome
         try:
-            response = await self._client.send(request)
-            response.raise_for_status()
-        except RequestError as err:
-            err_msg += f'; {err}'  # occurs while issuing a request; hence no response
-            raise SparkError.sdk(err_msg, SparkApiError.no_response(request)) from err
-        except HTTPStatusError as err:
-            err_msg = str(err)
-        except HTTPError as err:
-            err_msg += f'; {err}'
-        except Exception:
-            pass  # possibly runtime error but should not interrupt this flow
-
-        if not response:
-            raise SparkError.sdk(err_msg, SparkApiError.no_response(request))
-
-        status_code = response.status_code
-        if status_code >= 400:
-            if status_code == 401 and self.config.auth.type == 'oauth' and retries < self.config.max_retries:
-                await self.config.auth.oauth.aretrieve_token(self.config, self._client)  # type: ignore
-                return await self.__fetch(request, retries + 1)
-
-            if (status_code == 408 or status_code == 429) and retries < self.config.max_retries:
-                self.logger.debug(f'retrying request due to status code {status_code}...')
-                delay = get_retry_timeout(retries, self.config.retry_interval)
-                await asyncio.sleep(delay)
-                return await self.__fetch(request, retries + 1)
-
-            raise SparkError.api(
-                status_code,
-                {'message': f'failed to fetch <{request.url}>', 'cause': SparkApiError.to_cause(request, response)},
-            )
+            response, status_code = None, 0
+            err_msg = f'an error occurred while fetching <{request.url}>'
 
-        # otherwise, ok response
-        ok_response = {
-            'status': status_code,
-            'data': None,
-            'buffer': response.content,
-            'headers': response.headers,
-            'raw_request': request,
-            'raw_response': response,
-        }
-
-        content_type = response.headers.get('content-type', '')
-        if 'application/json' in content_type:
+            if limiter is not None:
+                await limiter.aacquire()
+            sent_at = time.monotonic()
             try:
-                ok_response['data'] = response.json()
+                response = await self._client.send(request, stream=stream)
+                response.raise_for_status()
+            except RequestError as err:
+                if breaker is not None:
+                    breaker.record(circuit, False)
+                    pending = False
+                delay = policy.next_delay(request, retries, started_at, error=err, idempotent=idempotent)
+                if delay is not None:
+                    self.logger.debug('retrying request due to %s...', type(err).__name__)
+                    await asyncio.sleep(delay)
+                    return await self.__fetch(request, retries + 1, stream, idempotent, started_at, rate_class, policy)
+
+                err_msg += f'; {err}'  # occurs while issuing a request; hence no response
+                raise SparkError.sdk(err_msg, SparkApiError.no_response(request)) from err
+            except HTTPStatusError as err:
+                err_msg = str(err)
+            except HTTPError as err:
+                err_msg += f'; {err}'
             except Exception:
-                ok_response['data'] = response.text
-        return HttpResponse(**ok_response)
+                pass  # possibly runtime error but should not interrupt this flow
+
+            if not response:
+                raise SparkError.sdk(err_msg, SparkApiError.no_response(request))
+
+            status_code = response.status_code
+            if breaker is not None:
+                breaker.record(circuit, status_code not in breaker.failure_status_codes, time.monotonic() - sent_at)
+                pending = False
+            if status_code >= 400:
+                if stream:
+                    await response.aread()  # error details are needed either way
+                    await response.aclose()
+
+                if status_code == 429 and limiter is not None:
+                    limiter.throttle(parse_retry_after(response.headers.get('retry-after')))
+
+                if status_code == 401 and retries < policy.max_retries and await self._authorize(request, renew=True):
+                    return await self.__fetch(request, retries + 1, stream, idempotent, started_at, rate_class, policy)
+
+                delay = policy.next_delay(request, retries, started_at, response=response, idempotent=idempotent)
+                if delay is not None:
+                    self.logger.debug('retrying request due to status code %s...', status_code)
+                    await asyncio.sleep(delay)
+                    return await self.__fetch(request, retries + 1, stream, idempotent, started_at, rate_class, policy)
+
+                raise SparkError.api(
+                    status_code,
+                    {'message': f'failed to fetch <{request.url}>', 'cause': SparkApiError.to_cause(request, response)},
+                )
+
+            # otherwise, ok response (its JSON payload is decoded on demand)
+            if limiter is not None:
+                limiter.recover()
+            content_type = response.headers.get('content-type', '')
+            return HttpResponse(
+                status=status_code,
+                data=None,
+                buffer=None,
+                headers=response.headers,
+                raw_request=request,
+                raw_response=response,
+                decoder=self.config.json_codec.loads if 'application/json' in content_type else None,
+            )
+        finally:
+            if pending:
+                breaker.record(circuit, False)  # type: ignore
+
+    async def _authorize(self, request: Request, *, renew: bool = False) -> bool:
+        """
+        Sets the credentials of a request, refreshing the OAuth2 access token if needed.
+
+        When `renew` is set (i.e., the credentials got rejected), the access token is refreshed
+        unless another request already did. Returns whether the credentials are renewable.
+        """
+        oauth = self.config.auth.oauth
+        if oauth is not None and (renew or oauth.expires_soon):
+            rejected = request.headers.get('Authorization', '').replace('Bearer ', '', 1) if renew else None
+            await oauth.arefresh_token(self.config, self._client, stale=rejected)
+        request.headers.update(self.config.auth.as_header)
+        return oauth is not None
+
+    async def __enter_circuit(self, breaker: CircuitBreaker, circuit: str) -> None:
+        if not breaker.acquire(circuit) or not breaker.health_check:
+            return
+        try:
+            healthy = await self.__is_healthy()
+        except BaseException:
+            breaker.record(circuit, False)  # releases the probe slot
+            raise
+        if not healthy:
+            breaker.record(circuit, False)
+            breaker.acquire(circuit)  # raises CircuitOpenError as the circuit has just been reopened
+
+    async def __is_healthy(self) -> bool:
+        from ._health import AsyncHealth  # NOTE: help avoid circular import
+
+        try:
+            return await AsyncHealth(self.config, self._client).ok()
+        except SparkError:
+            return False
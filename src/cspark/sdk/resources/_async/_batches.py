@@ -1,23 +1,29 @@
 from __future__ import annotations
 
-from json import dumps
+import asyncio
+import os
+import time
 from math import ceil
-from typing import Any, Dict, List, Optional, Union, cast
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Union, cast
 
 from httpx import AsyncClient
 
+from ..._checkpoint import BatchCheckpoint
 from ..._config import Config
 from ..._constants import SPARK_SDK
 from ..._errors import SparkError
+from ..._sinks import ResultSink
 from ..._utils import StringUtils, get_uuid, is_not_empty_list
 from .._base import Uri, UriParams
-from .._batches import BatchChunk, ChunkData
+from .._batches import _TERMINAL_STATUSES, BatchChunk, BatchRun, ChunkData, _buffer_usage, _iter_batch_chunks
 from ._base import AsyncApiResource
 
 __all__ = ['AsyncBatches', 'AsyncPipeline']
 
 
 class AsyncBatches(AsyncApiResource):
+    rate_class = 'batch'
+
     @property
     def base_uri(self) -> dict[str, str]:
         return {'base_url': self.config.base_url.full, 'version': 'api/v4'}
@@ -75,23 +81,152 @@ class AsyncBatches(AsyncApiResource):
 
         return await self.request(url, method='POST', body={k: v for k, v in body.items() if v is not None})
 
-    def of(self, batch_id: str) -> 'AsyncPipeline':
-        return AsyncPipeline(batch_id, self.config, self._client)
+    def of(self, batch_id: str, *, checkpoint: Optional[BatchCheckpoint] = None) -> 'AsyncPipeline':
+        return AsyncPipeline(batch_id, self.config, self._client, checkpoint=checkpoint)
+
+    async def run(
+        self,
+        uri: Union[str, UriParams],
+        dataset: Union[str, os.PathLike, Iterable[Any]],
+        *,
+        chunk_size: int = 200,
+        parameters: Optional[Dict[str, Any]] = None,
+        workers: int = 2,
+        pull_workers: int = 1,
+        max_chunks: int = 100,
+        buffer_threshold: float = 0.5,
+        poll_interval: float = 2.0,
+        sink: Optional[ResultSink] = None,
+        checkpoint: Optional[BatchCheckpoint] = None,
+        **options: Any,
+    ) -> BatchRun:
+        """
+        Runs a batch pipeline from start to finish.
+
+        The pipeline is created (using `options`), the dataset is pushed chunk by chunk
+        by `workers` tasks while `pull_workers` tasks retrieve the results as they become
+        available, and the pipeline is closed once every chunk is processed (or cancelled
+        if anything goes wrong). Pushes are held back whenever the input buffer of the
+        pipeline is more than `buffer_threshold` full.
+
+        The dataset is either rows of inputs (headers first), as a JSON array or any other
+        iterable, to split into chunks of `chunk_size` records; the path to a CSV, JSON Lines
+        or JSON array file to read lazily (see `read_chunks`); or an iterable of `BatchChunk`s.
+
+        When a result `sink` is given, chunk results are written into it (joined with their
+        inputs) as soon as they are pulled instead of being kept in memory; the sink is
+        left open for the caller to close.
+
+        When a `checkpoint` is given, pushed and pulled chunks are recorded along the way
+        and the pipeline is left open if anything goes wrong so that the run can be picked
+        up later on with `resume()`.
+        """
+        if checkpoint is not None and checkpoint.batch_id is not None:
+            raise SparkError.sdk(f'checkpoint is already bound to batch pipeline <{checkpoint.batch_id}>; resume it')
+
+        chunks = _iter_batch_chunks(dataset, chunk_size, parameters, self.config.json_codec)
+        batch = await self.create(uri, **options)
+        pipeline = self.of(batch.data['id'], checkpoint=checkpoint)  # type: ignore
+        return await self.__drive(
+            pipeline,
+            chunks,
+            workers=workers,
+            pull_workers=pull_workers,
+            max_chunks=max_chunks,
+            buffer_threshold=buffer_threshold,
+            poll_interval=poll_interval,
+            sink=sink,
+        )
+
+    async def resume(
+        self,
+        batch_id: Optional[str],
+        checkpoint: BatchCheckpoint,
+        dataset: Union[None, str, os.PathLike, Iterable[Any]] = None,
+        *,
+        chunk_size: int = 200,
+        parameters: Optional[Dict[str, Any]] = None,
+        workers: int = 2,
+        pull_workers: int = 1,
+        max_chunks: int = 100,
+        buffer_threshold: float = 0.5,
+        poll_interval: float = 2.0,
+        sink: Optional[ResultSink] = None,
+    ) -> BatchRun:
+        """
+        Resumes an interrupted run of a batch pipeline from its checkpoint.
+
+        The existing pipeline (`batch_id` defaults to the one of the checkpoint) is driven
+        to completion like `run()` does, except that the chunks already pushed according
+        to the checkpoint are skipped and the results already pulled are not pulled again.
+        Pass the same `dataset` (and `chunk_size`) as the interrupted run to push the
+        remaining chunks, or none to only pull the pending results.
+        """
+        batch_id = batch_id or checkpoint.batch_id
+        if not batch_id:
+            raise SparkError.sdk('batch pipeline id is required to resume a run', checkpoint.path)
+
+        chunks = (
+            iter(()) if dataset is None else _iter_batch_chunks(dataset, chunk_size, parameters, self.config.json_codec)
+        )
+        return await self.__drive(
+            self.of(batch_id, checkpoint=checkpoint),
+            chunks,
+            workers=workers,
+            pull_workers=pull_workers,
+            max_chunks=max_chunks,
+            buffer_threshold=buffer_threshold,
+            poll_interval=poll_interval,
+            sink=sink,
+        )
+
+    async def __drive(self, pipeline: AsyncPipeline, chunks: Iterator[BatchChunk], **options: Any) -> BatchRun:
+        runner = _AsyncPipelineRunner(pipeline, chunks, **options)
+        try:
+            result = await runner.run()
+        except BaseException:
+            if not pipeline.is_disposed and pipeline.checkpoint is None:  # otherwise, left open to resume
+                try:
+                    await pipeline.cancel()
+                except Exception as cause:  # must not hide the original error
+                    self.logger.error('failed to cancel batch pipeline <%s>: %s', pipeline.batch_id, cause)
+            raise
+
+        await pipeline.dispose()
+        return result
 
 
 class AsyncPipeline(AsyncApiResource):
+    rate_class = 'batch'
+
     _state: str = 'open'
-    _chunks: Dict[str, int] = dict()
 
-    def __init__(self, batch_id: str, config: Config, http_client: AsyncClient):
+    def __init__(
+        self,
+        batch_id: str,
+        config: Config,
+        http_client: AsyncClient,
+        status_ttl: float = 2.0,
+        checkpoint: Optional[BatchCheckpoint] = None,
+    ):
         super().__init__(config, http_client)
         self._id = batch_id
+        self._chunks: Dict[str, int] = {}
+        self._status: Optional[Dict[str, Any]] = None
+        self._status_at = 0.0
+        self._status_lock: Optional[asyncio.Lock] = None  # created lazily within the running event loop
+        self.status_ttl = status_ttl  # min delay (in seconds) between two status checks
 
         if StringUtils.is_empty(batch_id):
             error = SparkError.sdk('batch pipeline id is required to proceed', batch_id)
             self.logger.error(error.message)
             raise error
 
+        self.checkpoint = checkpoint  # records pushed and pulled chunks if any
+        if checkpoint is not None:
+            checkpoint.attach(batch_id)
+            self._chunks.update(checkpoint.pushed)
+
     @property
     def base_uri(self) -> dict[str, str]:
         return {'base_url': self.config.base_url.full, 'version': 'api/v4'}
@@ -124,10 +259,40 @@ class AsyncPipeline(AsyncApiResource):
         url = Uri.of(None, endpoint=f'batch/{self._id}', **self.base_uri)
         return await self.request(url, method='GET')
 
+    @property
+    def last_status(self) -> Optional[Dict[str, Any]]:
+        """
+        The last known status of the batch pipeline.
+
+        It is kept up to date by every status check as well as every push and pull, which
+        respond with the status of the pipeline, and is never fetched by this property.
+        """
+        return self._status
+
+    @property
+    def buffer_usage(self) -> float:
+        """The ratio of the input buffer in use according to the last known status."""
+        return _buffer_usage(self._status)
+
     async def get_status(self):
         """Retrieves the batch pipeline status."""
         url = Uri.of(None, endpoint=f'batch/{self._id}/status', **self.base_uri)
-        return await self.request(url, method='GET')
+        response = await self.request(url, method='GET')
+        self.__keep_status(response.data)
+        return response
+
+    async def refresh_status(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Returns the status of the batch pipeline, fetching it only if the last known one
+        is older than `max_age` seconds (defaults to `status_ttl`). Concurrent callers
+        share the same status check.
+        """
+        max_age = self.status_ttl if max_age is None else max_age
+        self._status_lock = self._status_lock or asyncio.Lock()
+        async with self._status_lock:
+            if self._status is None or time.monotonic() - self._status_at >= max_age:
+                await self.get_status()
+            return cast(Dict[str, Any], self._status)
 
     async def push(
         self,
@@ -137,15 +302,31 @@ class AsyncPipeline(AsyncApiResource):
         inputs: Optional[List[Any]] = None,
         raw: Union[None, str, bytes] = None,
         if_chunk_id_duplicated: str = 'replace',  # 'ignore' | 'replace' | 'throw'
+        buffer_threshold: Optional[float] = None,
+        stop: Optional[asyncio.Event] = None,
     ):
+        """
+        Submits input data to the batch pipeline.
+
+        When a `buffer_threshold` (e.g., 0.5) is given, the push is held back until the
+        ratio of the input buffer in use falls under it. The status of the pipeline is
+        then checked at most once every `status_ttl` seconds, and the wait is abandoned with
+        an error as soon as the `stop` event is set (e.g., when a run fails).
+        """
         self.__assert_state(['closed', 'cancelled'])
 
         url = Uri.of(None, endpoint=f'batch/{self._id}/chunks', **self.base_uri)
         body = self.__build_chunk_data(chunks, data, inputs, raw, if_chunk_id_duplicated)
 
+        if buffer_threshold is not None:
+            await self.__wait_for_buffer(buffer_threshold, stop)
+
         response = await self.request(url, method='POST', body=body)
         total = response.data['record_submitted'] if isinstance(response.data, dict) else 0
-        self.logger.info(f'pushed {total} records to batch pipeline <{self._id}>')
+        self.logger.info('pushed %s records to batch pipeline <%s>', total, self._id)
+        self.__keep_status(response.data)
+        if self.checkpoint is not None:
+            self.checkpoint.record_pushes({chunk['id']: self._chunks.get(chunk['id'], 0) for chunk in body['chunks']})
 
         return response
 
@@ -156,7 +337,26 @@ class AsyncPipeline(AsyncApiResource):
 
         response = await self.request(Uri.of(None, endpoint=endpoint, **self.base_uri))
         total = response.data['status']['records_available'] if isinstance(response.data, dict) else 0
-        self.logger.info(f'{total} available records from batch pipeline <{self._id}>')
+        self.logger.info('%s available records from batch pipeline <%s>', total, self._id)
+        self.__keep_status(response.data.get('status') if isinstance(response.data, dict) else None)
+        if self.checkpoint is not None and isinstance(response.data, dict):
+            self.checkpoint.record_pulls(response.data.get('data') or [])
+
+        return response
+
+    async def pull_into(
+        self, sink: ResultSink, max_chunks: int = 100, inputs: Optional[Mapping[str, List[Any]]] = None
+    ):
+        """
+        Pulls the available chunk results and writes them into a result sink.
+
+        When given, `inputs` maps chunk ids to the inputs pushed with them so that each
+        output record gets written next to its inputs.
+        """
+        response = await self.pull(max_chunks)
+        chunks = response.data.get('data') if isinstance(response.data, dict) else None
+        for chunk in chunks or []:
+            sink.write(chunk, inputs.get(chunk.get('id')) if inputs else None)
 
         return response
 
@@ -167,7 +367,7 @@ class AsyncPipeline(AsyncApiResource):
         url = Uri.of(None, endpoint=f'batch/{self._id}', **self.base_uri)
 
         response = await self.request(url, method='PATCH', body={'batch_status': state})
-        self.logger.info(f'batch pipeline <{self._id}> has been {state}')
+        self.logger.info('batch pipeline <%s> has been %s', self._id, state)
         self._state = state
 
         return response
@@ -175,6 +375,29 @@ class AsyncPipeline(AsyncApiResource):
     async def cancel(self):
         return await self.dispose(state='cancelled')
 
+    def __keep_status(self, status: Any) -> None:
+        if isinstance(status, dict) and 'batch_status' in status:
+            self._status, self._status_at = status, time.monotonic()
+
+    async def __wait_for_buffer(self, threshold: float, stop: Optional[asyncio.Event] = None) -> None:
+        while True:
+            if stop is not None and stop.is_set():
+                raise SparkError.sdk(f'stopped waiting for the input buffer of batch pipeline <{self._id}>')
+            status = await self.refresh_status()
+            if status.get('batch_status') in _TERMINAL_STATUSES:
+                raise SparkError.sdk(f'batch pipeline <{self._id}> is {status["batch_status"]}', status)
+            if _buffer_usage(status) <= threshold:
+                return
+            self.logger.debug('input buffer of batch pipeline <%s> is full; waiting...', self._id)
+            delay = max(self.status_ttl - (time.monotonic() - self._status_at), 0.01)
+            if stop is None:
+                await asyncio.sleep(delay)
+            else:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
     def __assert_state(self, states: List[str], throwable: bool = True) -> bool:
         if self._state in states:
             error = SparkError.sdk(f'batch pipeline <{self._id}> is already {self._state}')
@@ -194,7 +417,7 @@ class AsyncPipeline(AsyncApiResource):
     ):
         try:
             if raw is not None and StringUtils.is_not_empty(raw):
-                chunks = BatchChunk.from_str(raw)  # takes precedence over other entries
+                chunks = BatchChunk.from_str(raw, self.config.json_codec)  # takes precedence over other entries
 
             if is_not_empty_list(chunks):
                 return {'chunks': self.__assess_chunks(cast(List[BatchChunk], chunks), if_duplicated)}
@@ -208,7 +431,7 @@ class AsyncPipeline(AsyncApiResource):
             raise SparkError.sdk(
                 message=f'wrong data params were provided for this pipeline <{self._id}>.\n'
                 'Expecting either "raw=str/bytes", "chunks=List[BatchChunk]", "data=ChunkData" or "inputs=List[Any]"',
-                cause=dumps(cause),
+                cause=self.config.json_codec.dumps(cause).decode('utf-8'),
             )
         except SparkError as error:
             self.logger.error(error.message)
@@ -223,8 +446,10 @@ class AsyncPipeline(AsyncApiResource):
             if chunk.id in self._chunks:
                 if is_duplicated == 'ignore':
                     self.logger.warning(
-                        f'chunk id <{id}> appears to be duplicated for this pipeline <{self._id}> '
-                        f'and may cause unexpected behavior. You should consider using a different id.'
+                        'chunk id <%s> appears to be duplicated for this pipeline <%s> '
+                        'and may cause unexpected behavior. You should consider using a different id.',
+                        id,
+                        self._id,
                     )
                     continue
                 if is_duplicated == 'throw':
@@ -236,9 +461,130 @@ class AsyncPipeline(AsyncApiResource):
                     self._chunks.pop(chunk.id)  # remove the old chunk id
                     chunk.id = get_uuid()  # add new id for the chunk
                     self.logger.info(
-                        f'chunk id <{id}> is duplicated for this pipeline <{self._id}> '
-                        f'and has been replaced with <{chunk.id}>'
+                        'chunk id <%s> is duplicated for this pipeline <%s> and has been replaced with <%s>',
+                        id,
+                        self._id,
+                        chunk.id,
                     )
             self._chunks[chunk.id] = chunk.size or len(chunk.data.inputs) - 1
             assessed.append(chunk.to_dict())
         return assessed
+
+
+class _AsyncPipelineRunner:
+    """Overlaps pushes and pulls of a batch pipeline using asyncio tasks."""
+
+    def __init__(
+        self,
+        pipeline: AsyncPipeline,
+        chunks: Iterator[BatchChunk],
+        *,
+        workers: int,
+        pull_workers: int,
+        max_chunks: int,
+        buffer_threshold: float,
+        poll_interval: float,
+        sink: Optional[ResultSink] = None,
+    ):
+        self.pipeline = pipeline
+        self.workers = max(1, workers)
+        self.pull_workers = max(1, pull_workers)
+        self.max_chunks = max_chunks
+        self.buffer_threshold = buffer_threshold
+        self.poll_interval = poll_interval
+        self.sink = sink
+        self._chunks = chunks
+        self._stopped = asyncio.Event()
+        self._pushers = self.workers
+        self._pushed: Dict[str, int] = {}  # chunk id -> position in the dataset
+        self._pulled: Dict[str, Dict[str, Any]] = {}  # chunk id -> chunk result ({} if written to a sink)
+        self._inputs: Dict[str, List[Any]] = {}  # chunk id -> inputs awaiting their results (sink only)
+        self._index = 0
+        self._skipped: Set[str] = set()  # chunks pushed before resuming a run
+        pipeline.status_ttl = poll_interval
+
+        if pipeline.checkpoint is not None:
+            self._skipped = set(pipeline.checkpoint.pushed)
+            self._pushed = {chunk_id: i for i, chunk_id in enumerate(pipeline.checkpoint.pushed)}
+            for chunk_id, result in pipeline.checkpoint.pulled.items():
+                self._pulled[chunk_id] = (result or {}) if sink is None else {}
+
+    async def run(self) -> BatchRun:
+        start = time.time()
+        tasks = [asyncio.ensure_future(self.__push_all()) for _ in range(self.workers)]
+        tasks += [asyncio.ensure_future(self.__pull_all()) for _ in range(self.pull_workers)]
+
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            self._stopped.set()  # no-op if all went well; otherwise, stops the other workers
+            for task in done:
+                task.result()  # re-raises the first error if any
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = sorted(self._pulled.items(), key=lambda item: self._pushed.get(item[0], len(self._pushed)))
+        return BatchRun(
+            batch_id=self.pipeline.batch_id,
+            chunks=self.pipeline.stats['chunks'],
+            records=self.pipeline.stats['records'],
+            results=[result for _, result in results if result],
+            status=self.pipeline.last_status or {},
+            elapsed=time.time() - start,
+        )
+
+    @property
+    def is_done(self) -> bool:
+        return self._pushers == 0 and len(self._pulled) >= len(self._pushed)
+
+    async def __push_all(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                chunk, index = next(self._chunks, None), self._index
+                self._index += 1
+                if chunk is None:
+                    return
+
+                chunk_id = chunk.id
+                if chunk_id in self._skipped:
+                    self._pushed[chunk_id] = index
+                    if self.sink is not None and chunk_id not in self._pulled:
+                        self._inputs[chunk_id] = chunk.data.inputs
+                    continue
+
+                if self.sink is not None:
+                    self._inputs[chunk_id] = chunk.data.inputs
+                await self.pipeline.push(chunks=[chunk], buffer_threshold=self.buffer_threshold, stop=self._stopped)
+                self._pushed[chunk.id] = index  # the pipeline may have renamed a duplicated id
+                if self.sink is not None and chunk.id != chunk_id:
+                    self._inputs[chunk.id] = self._inputs.pop(chunk_id)
+        finally:
+            self._pushers -= 1
+
+    async def __pull_all(self) -> None:
+        while not self._stopped.is_set() and not self.is_done:
+            if self.sink is None:
+                response = await self.pipeline.pull(self.max_chunks)
+            else:
+                response = await self.pipeline.pull_into(self.sink, self.max_chunks, inputs=self._inputs)
+            data = response.data if isinstance(response.data, dict) else {}
+            self.__assert_status(data.get('status'))
+
+            chunks = data.get('data') or []
+            for chunk in chunks:
+                chunk_id = chunk.get('id') or get_uuid()
+                self._inputs.pop(chunk_id, None)
+                self._pulled[chunk_id] = chunk if self.sink is None else {}
+            if not chunks:
+                await self.__sleep()
+
+    async def __sleep(self) -> None:
+        try:
+            await asyncio.wait_for(self._stopped.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    def __assert_status(self, status: Any) -> None:
+        if isinstance(status, dict) and status.get('batch_status') in _TERMINAL_STATUSES:
+            raise SparkError.sdk(f'batch pipeline <{self.pipeline.batch_id}> is {status["batch_status"]}', status)
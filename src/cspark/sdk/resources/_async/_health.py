@@ -4,6 +4,8 @@ __all__ = ['AsyncHealth', 'AsyncPlatform']
 
 
 class AsyncHealth(AsyncApiResource):
+    rate_class = 'health'
+
     async def check(self):
         """Checks the health status or connectivity of a Spark environment."""
         return await self.request(f'{self.config.base_url.value}/health', method='GET')
@@ -1,11 +1,12 @@
 import asyncio
-import json
+import os
 from datetime import datetime
-from typing import List, Optional, Union, cast
+from typing import IO, List, Optional, Union, cast
 
+from ..._constants import DOWNLOAD_CHUNK_SIZE
 from ..._errors import RetryTimeoutError, SparkError
 from ..._utils import DateUtils, StringUtils, get_retry_timeout, is_int
-from .._base import Uri, UriParams
+from .._base import Download, Uri, UriParams
 from ._base import AsyncApiResource
 
 __all__ = ['AsyncHistory']
@@ -21,7 +22,7 @@ class AsyncHistory(AsyncApiResource):
 
         response = await self.request(url, method='GET')
         if isinstance(response.data, dict):
-            formatted = json.loads(response.data.get('response_data', '{}'))
+            formatted = self.config.json_codec.loads(response.data.get('response_data', '{}'))
             response = response.copy_with(data=formatted)
         return response
 
@@ -34,6 +35,36 @@ class AsyncHistory(AsyncApiResource):
         service: Optional[str] = None,
         index: Optional[int] = None,
         legacy: bool = False,
+    ):
+        download_url, data = await self.__rehydrate(uri, call_id, folder, service, index, legacy)
+        return (await self.request(download_url)).copy_with(data=data)
+
+    async def rehydrate_to(
+        self,
+        uri: Union[None, str, UriParams],
+        *,
+        call_id: str,
+        dest: Union[str, os.PathLike, IO[bytes]],
+        folder: Optional[str] = None,
+        service: Optional[str] = None,
+        index: Optional[int] = None,
+        legacy: bool = False,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+    ) -> Download:
+        """Asynchronously streams the rehydrated Excel file to a file path or a binary file-like object."""
+        download_url, _ = await self.__rehydrate(uri, call_id, folder, service, index, legacy)
+        file = await self.request(download_url, stream=True)
+        return await file.asave(dest, chunk_size=chunk_size, checksum=checksum)
+
+    async def __rehydrate(
+        self,
+        uri: Union[None, str, UriParams],
+        call_id: str,
+        folder: Optional[str],
+        service: Optional[str],
+        index: Optional[int],
+        legacy: bool,
     ):
         if StringUtils.is_empty(call_id):
             raise SparkError.sdk('call_id is required when rehydrating', {'call_id': call_id})
@@ -50,7 +81,7 @@ class AsyncHistory(AsyncApiResource):
         else:
             raise SparkError('failed to produce a download URL', response)
 
-        return (await self.request(download_url)).copy_with(data=response.data)
+        return download_url, response.data
 
     async def download(
         self,
@@ -149,7 +180,7 @@ class AsyncLogDownload(AsyncApiResource):
 
         response = await self.request(url, method='POST', body=body)
         if isinstance(response.data, dict):
-            self.logger.info(f'{type} download job created <{response.data.get("response_data",{}).get("job_id")}>')
+            self.logger.info('%s download job created <%s>', type, response.data.get('response_data', {}).get('job_id'))
         return response
 
     async def get_status(
@@ -177,11 +208,11 @@ class AsyncLogDownload(AsyncApiResource):
             progress = response_data.get('progress', 0)
 
             if progress == 100:
-                self.logger.info(f'log download job completed <{job_id}>')
+                self.logger.info('log download job completed <%s>', job_id)
                 return response
 
             if progress < 100 and retries < max_retries:
-                self.logger.info(f'waiting for log download status job to complete - {progress}%')
+                self.logger.info('waiting for log download status job to complete - %s%%', progress)
 
                 retries += 1
                 await asyncio.sleep(get_retry_timeout(retries, retry_interval))
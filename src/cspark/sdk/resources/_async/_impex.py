@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 import asyncio
-from json import dumps
-from typing import BinaryIO, List, Mapping, Optional, Union
+import os
+from typing import IO, Any, Awaitable, BinaryIO, Callable, List, Mapping, Optional, Union
 
 from httpx import AsyncClient
 
 from ..._config import Config
-from ..._constants import SPARK_SDK
+from ..._constants import DOWNLOAD_CHUNK_SIZE, SPARK_SDK
 from ..._errors import RetryTimeoutError, SparkError
 from ..._utils import get_retry_timeout
-from .._base import Uri, UriParams
-from .._impex import _build_service_mappings
+from .._base import Download, HttpResponse, Uri, UriParams
+from .._impex import (
+    _SINGLE_ATTEMPT,
+    DownloadReport,
+    _assert_within,
+    _build_service_mappings,
+    _file_paths_of,
+    _is_transient,
+)
 from ._base import AsyncApiResource
 
 __all__ = ['AsyncImpEx', 'AsyncExport', 'AsyncImport', 'AsyncMigration', 'AsyncWasm', 'AsyncFiles']
@@ -114,7 +121,7 @@ class AsyncImpEx(AsyncApiResource):
         elif len(services) == 0:
             importer.logger.warning('import job completed without any services')
         else:
-            importer.logger.info(f'{len(services)} service(s) imported')
+            importer.logger.info('%s service(s) imported', len(services))
 
         return status
 
@@ -168,7 +175,7 @@ class AsyncExport(AsyncApiResource):
         url = Uri.of(None, endpoint='export', **self.base_uri)
         response = await self.request(url, method='POST', body={'inputs': inputs, **metadata})
         if isinstance(response.data, dict):
-            self.logger.info(f'export job created <{response.data["id"]}>')
+            self.logger.info('export job created <%s>', response.data['id'])
         return response
 
     async def get_status(
@@ -192,11 +199,11 @@ class AsyncExport(AsyncApiResource):
         while retries < max_retries:
             response = await self.request(status_url)  # type: ignore
             if isinstance(response.data, dict) and response.data.get('status') in ['completed', 'closed']:
-                self.logger.info(f'export job <{job_id}> completed')
+                self.logger.info('export job <%s> completed', job_id)
                 return response
 
             retries += 1
-            self.logger.info(f'waiting for export job to complete (attempt {retries} of {max_retries})')
+            self.logger.info('waiting for export job to complete (attempt %s of %s)', retries, max_retries)
             delay = get_retry_timeout(retries, retry_interval)
             await asyncio.sleep(delay)
 
@@ -208,23 +215,106 @@ class AsyncExport(AsyncApiResource):
         url = Uri.of(None, endpoint=f'export/{job_id}', **self.base_uri)
         response = await self.request(url, method='PATCH', body={'export_status': 'cancelled'})
         if isinstance(response.data, dict):
-            self.logger.info(f'export job <${response.data["id"]}> has been cancelled')
+            self.logger.info('export job <%s> has been cancelled', response.data['id'])
         return response
 
-    async def download(self, urls: Union[str, List[str]]):
-        downloads = []
+    async def download(
+        self,
+        urls: Union[str, List[str]],
+        *,
+        workers: int = 4,
+        max_retries: Optional[int] = None,
+        retry_interval: Optional[float] = None,
+    ) -> DownloadReport:
+        """
+        Downloads the exported files concurrently with up to `workers` requests in flight.
+
+        Each file failing transiently (network errors, rate limits or server errors) is retried
+        up to `max_retries` times with an exponential backoff, in place of the retry policy of
+        the client. The
+        successful downloads are returned in the order of their URLs, alongside the
+        failures (see `DownloadReport`).
+        """
+
+        async def fetch(url: str) -> HttpResponse:
+            return await self.request(url, retry=_SINGLE_ATTEMPT)
+
+        return await self.__download_all(urls, fetch, workers, max_retries, retry_interval)
 
-        urls = urls if isinstance(urls, list) else [urls]
-        for url in urls:
+    async def download_to(
+        self,
+        urls: Union[str, List[str]],
+        directory: Union[str, os.PathLike],
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksums: Optional[Mapping[str, str]] = None,
+        workers: int = 4,
+        max_retries: Optional[int] = None,
+        retry_interval: Optional[float] = None,
+    ) -> DownloadReport:
+        """
+        Streams the exported files to the given directory without holding them in memory.
+
+        Files are named after the last segment of their download URLs (suffixed with -1, -2,
+        etc. when names clash) and never written outside of the directory; `checksums`
+        optionally maps those URLs to the expected digests of their files. See `download`
+        for the remaining options.
+        """
+        checksums = checksums or {}
+        os.makedirs(directory, exist_ok=True)
+        urls = list(dict.fromkeys(urls if isinstance(urls, list) else [urls]))  # each file is saved once
+        paths = _file_paths_of(urls, directory)
+
+        async def save(url: str) -> Download:
+            dest = _assert_within(paths[url], directory)
+            response = await self.request(url, stream=True, retry=_SINGLE_ATTEMPT)
+            return await response.asave(dest, chunk_size=chunk_size, checksum=checksums.get(url))
+
+        return await self.__download_all(urls, save, workers, max_retries, retry_interval)
+
+    async def __download_all(
+        self,
+        urls: Union[str, List[str]],
+        fetch: Callable[[str], Awaitable[Any]],
+        workers: int,
+        max_retries: Optional[int],
+        retry_interval: Optional[float],
+    ) -> DownloadReport:
+        max_retries = self.config.max_retries if max_retries is None else max_retries
+        retry_interval = retry_interval or self.config.retry_interval
+        semaphore = asyncio.Semaphore(max(1, workers))
+
+        async def download(url: str):
+            async with semaphore:
+                retries = 0
+                while True:
+                    try:
+                        return await fetch(url)
+                    except Exception as cause:
+                        if retries >= max_retries or not _is_transient(cause):
+                            raise
+                        self.logger.debug('retrying download of <%s> due to: %s', url, cause)
+                        await asyncio.sleep(get_retry_timeout(retries, retry_interval))
+                        retries += 1
+
+        valid_urls = []
+        for url in urls if isinstance(urls, list) else [urls]:
             if not url:
                 self.logger.warning('skipping empty download url')
                 continue
-            try:
-                downloads.append(await self.request(url))
-            except Exception as cause:
-                self.logger.warning(f'failed to download file <{url}>', cause)
+            valid_urls.append(url)
 
-        return downloads
+        report = DownloadReport()
+        results = await asyncio.gather(*[download(url) for url in valid_urls], return_exceptions=True)
+        for url, result in zip(valid_urls, results):
+            if isinstance(result, Exception):
+                self.logger.warning('failed to download file <%s>: %s', url, result)
+                report.failures[url] = result
+            else:
+                report.append(result)
+
+        self.logger.info('%s', report)
+        return report
 
 
 class AsyncImport(AsyncApiResource):
@@ -255,9 +345,10 @@ class AsyncImport(AsyncApiResource):
         }
 
         url = Uri.of(None, endpoint='import', **self.base_uri)
-        response = await self.request(url, method='POST', form={'importRequestEntity': dumps(metadata)}, files=files)
+        form = {'importRequestEntity': self.config.json_codec.dumps(metadata).decode('utf-8')}
+        response = await self.request(url, method='POST', form=form, files=files)
         if isinstance(response.data, dict):
-            self.logger.info(f'import job created <{response.data["id"]}>')
+            self.logger.info('import job created <%s>', response.data['id'])
         return response
 
     async def get_status(
@@ -281,11 +372,11 @@ class AsyncImport(AsyncApiResource):
         while retries < max_retries:
             response = await self.request(status_url)  # type: ignore
             if isinstance(response.data, dict) and response.data.get('status') in ['completed', 'closed']:
-                self.logger.info(f'import job <{job_id}> completed')
+                self.logger.info('import job <%s> completed', job_id)
                 return response
 
             retries += 1
-            self.logger.info(f'waiting for import job to complete (attempt {retries} of {max_retries})')
+            self.logger.info('waiting for import job to complete (attempt %s of %s)', retries, max_retries)
             delay = get_retry_timeout(retries, retry_interval)
             await asyncio.sleep(delay)
 
@@ -323,13 +414,44 @@ class AsyncWasm(AsyncApiResource):
         public: Optional[bool] = False,
     ):
         uri_params = Uri.validate(uri or UriParams(folder, service, service_id, version_id=version_id, public=public))
+        return await self.request(self._build_url(uri_params))
+
+    async def download_to(
+        self,
+        uri: Union[None, str, UriParams] = None,
+        *,
+        dest: Union[str, os.PathLike, IO[bytes]],
+        folder: Optional[str] = None,
+        service: Optional[str] = None,
+        service_id: Optional[str] = None,
+        version_id: Optional[str] = None,
+        public: Optional[bool] = False,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+    ) -> Download:
+        """Streams the WebAssembly module of a service to a file path or a binary file-like object."""
+        uri_params = Uri.validate(uri or UriParams(folder, service, service_id, version_id=version_id, public=public))
+        response = await self.request(self._build_url(uri_params), stream=True)
+        return await response.asave(dest, chunk_size=chunk_size, checksum=checksum)
+
+    def _build_url(self, uri_params: UriParams) -> Uri:
         endpoint = f'getnodegenzipbyId/{uri_params.encode()}'
         resource = 'nodegen' + ('/public' if uri_params.public else '')
-        url = Uri.partial(resource, base_url=self.config.base_url.full, endpoint=endpoint)
-
-        return await self.request(url)
+        return Uri.partial(resource, base_url=self.config.base_url.full, endpoint=endpoint)
 
 
 class AsyncFiles(AsyncApiResource):
     async def download(self, url: str):
         return await self.request(url)
+
+    async def download_to(
+        self,
+        url: str,
+        dest: Union[str, os.PathLike, IO[bytes]],
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+    ) -> Download:
+        """Streams a Spark file to a file path or a binary file-like object."""
+        response = await self.request(url, stream=True)
+        return await response.asave(dest, chunk_size=chunk_size, checksum=checksum)
@@ -1,3 +1,5 @@
+from httpx import Request
+
 from .._base import Uri
 from .._oauth2 import AccessToken
 from ._base import AsyncApiResource
@@ -6,6 +8,9 @@ __all__ = ['AsyncOAuth2']
 
 
 class AsyncOAuth2(AsyncApiResource):
+    async def _authorize(self, request: Request, *, renew: bool = False) -> bool:  # noqa: ARG002
+        return False  # client credentials are sent as part of the form data
+
     async def gen_access_token(self):
         url = Uri.of(base_url=self.config.base_url.oauth2, version='protocol', endpoint='openid-connect/token')
         body = {**self.config.auth.oauth.to_dict(), 'grant_type': self.config.auth.oauth.flow}  # type: ignore
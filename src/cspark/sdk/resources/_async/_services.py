@@ -1,15 +1,42 @@
+import asyncio
 import gzip
-import json
 import time
 import zlib
+from collections import deque
 from datetime import datetime
-from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Tuple, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from ..._constants import SPARK_SDK
-from ..._errors import RetryTimeoutError, SparkError
+from ..._errors import RetryTimeoutError, SparkApiError, SparkError
 from ..._utils import DateUtils, StringUtils, get_retry_timeout
-from .._base import Uri, UriParams
-from .._services import ServiceExecuted, _ExecuteInputs, _ExecuteMeta
+from .._base import HttpResponse, Uri, UriParams
+from .._services import (
+    ChunkSizer,
+    ServiceExecuted,
+    _cached_response,
+    _count_records,
+    _ExecuteInputs,
+    _ExecuteMeta,
+    _iter_chunks,
+    _metadata_scope,
+    _result_cache_key,
+    _split_size_of,
+)
 from .._transforms import TransformParams
 from ._base import AsyncApiResource
 
@@ -151,7 +178,8 @@ class AsyncServices(AsyncApiResource):
         response = await self.request(url, method='POST', body={'request_data': params})
         version_id = isinstance(response.data, dict) and response.data.get('response_data', {}).get('version_id')
         if version_id:
-            self.logger.info(f'service published with version id <{version_id}>')
+            self.logger.info('service published with version id <%s>', version_id)
+        self.__invalidate(uri)
         return response
 
     async def execute(
@@ -161,7 +189,7 @@ class AsyncServices(AsyncApiResource):
         response_format: Optional[str] = None,
         encoding: Optional[str] = None,  # 'gzip' | 'deflate'
         # data for calculations
-        inputs: Union[None, str, Dict[str, Any], List[Any]] = None,  # TODO: support `pandas.DataFrame`
+        inputs: Union[None, str, Dict[str, Any], List[Any], Any] = None,  # also `pandas.DataFrame`, `pyarrow.Table`
         # Metadata for calculations
         active_since: Optional[str] = None,
         source_system: Optional[str] = None,
@@ -181,7 +209,7 @@ class AsyncServices(AsyncApiResource):
     ):
         uri = Uri.validate(uri)
 
-        executable = _ExecuteInputs(inputs)
+        executable = _ExecuteInputs(inputs, self.config.json_codec)
         metadata = _ExecuteMeta(
             uri,
             is_batch=executable.is_batch,
@@ -208,13 +236,118 @@ class AsyncServices(AsyncApiResource):
             url = Uri.of(uri, base_url=self.config.base_url.full, endpoint=endpoint)
             body = {'request_data': {'inputs': executable.inputs}, 'request_meta': metadata.values}
 
+        cache = self.config.result_cache
+        cache_key = _result_cache_key(uri, url, executable.inputs, metadata) if cache is not None else None
+        cached = cache.get(cache_key) if cache is not None and cache_key else None
+        if cached is not None:
+            self.logger.debug('using cached result for <%s>', url)
+            request = self._client.build_request('POST', str(url))  # never sent, so its body is left out
+            response = _cached_response(request, cached, self.config.json_codec.loads)
+            return ServiceExecuted(response, executable.is_batch, response_format or 'alike')
+
         if encoding:
             content, headers = self.__encode(data=body, encoding=encoding)
-            response = await self.request(url, method='POST', content=content, headers=headers)
+            response = await self.request(
+                url, method='POST', content=content, headers=headers, idempotent=True, rate_class='execute'
+            )
         else:
-            response = await self.request(url, method='POST', body=body)
+            response = await self.request(url, method='POST', body=body, idempotent=True, rate_class='execute')
+
+        if cache is not None and cache_key:
+            cache.set(cache_key, response.buffer)
         return ServiceExecuted(response, executable.is_batch, response_format or 'alike')
 
+    async def execute_many(
+        self,
+        uri: Union[str, UriParams],
+        records: Iterable[Any],
+        *,
+        chunk_size: Union[int, ChunkSizer] = 200,
+        concurrency: int = 4,
+        **options: Any,
+    ) -> List[ServiceExecuted]:
+        """
+        Executes a service against a large dataset using concurrent sync batch requests.
+
+        The records are split into chunks of `chunk_size` and each chunk is sent to the
+        v4 execute endpoint with at most `concurrency` requests in flight at a time.
+        The results are returned in the same order as the input chunks. Other `options`
+        (e.g., `encoding`, `call_purpose`, `selected_outputs`) are passed on to `execute`.
+
+        Use a `ChunkSizer` as `chunk_size` to let the SDK tune the chunk size on the fly. In
+        that case, a chunk rejected for being too large (HTTP 413) is split at a smaller size
+        and resubmitted; its results are returned in place of the original chunk.
+        """
+        stream = self.stream_many(uri, records, chunk_size=chunk_size, concurrency=concurrency, **options)
+        return [result async for result in stream]
+
+    async def stream_many(
+        self,
+        uri: Union[str, UriParams],
+        records: Iterable[Any],
+        *,
+        chunk_size: Union[int, ChunkSizer] = 200,
+        concurrency: int = 4,
+        ordered: bool = True,
+        **options: Any,
+    ) -> AsyncIterator[ServiceExecuted]:
+        """
+        Same as `execute_many` but yields the result of each chunk as soon as it is available.
+
+        The records are consumed lazily (any iterable will do) and no more than `concurrency`
+        chunks are held in memory at once. When `ordered` is false, results are yielded in
+        completion order instead of input order.
+        """
+        uri = Uri.validate(uri)
+        concurrency = max(1, concurrency)
+        self.logger.info('executing %s records per chunk with up to %s concurrent requests', chunk_size, concurrency)
+
+        async def run(inputs: List[Any]) -> List[ServiceExecuted]:
+            start = time.monotonic()
+            try:
+                result = await self.execute(uri, inputs=inputs, **options)
+            except SparkApiError as error:
+                size = _split_size_of(error, inputs, chunk_size)
+                if size <= 0:
+                    raise
+                self.logger.warning(
+                    'chunk of %s records is too large; resubmitting by %s', _count_records(inputs), size
+                )
+                return [result for part in _iter_chunks(inputs, size) for result in await run(part)]
+
+            if isinstance(chunk_size, ChunkSizer):
+                chunk_size.observe(result, records=_count_records(inputs), elapsed=time.monotonic() - start)
+            return [result]
+
+        queue: Deque['asyncio.Task[List[ServiceExecuted]]'] = deque()
+        pending: Set['asyncio.Task[List[ServiceExecuted]]'] = set()
+        try:
+            for inputs in _iter_chunks(records, chunk_size):
+                task = asyncio.ensure_future(run(inputs))
+                if ordered:
+                    queue.append(task)
+                    if len(queue) >= concurrency:
+                        for result in await queue.popleft():
+                            yield result
+                else:
+                    pending.add(task)
+                    if len(pending) >= concurrency:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for completed in done:
+                            for result in completed.result():
+                                yield result
+            while queue:
+                for result in await queue.popleft():
+                    yield result
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for completed in done:
+                    for result in completed.result():
+                        yield result
+        finally:
+            for task in (*queue, *pending):
+                task.cancel()
+
     async def transform(
         self,
         uri: Union[str, UriParams],
@@ -273,9 +406,13 @@ class AsyncServices(AsyncApiResource):
 
         if encoding:
             content, headers = self.__encode(data=inputs or {}, encoding=encoding, extras=metadata.as_header)
-            response = await self.request(url, method='POST', content=content, headers=headers)
+            response = await self.request(
+                url, method='POST', content=content, headers=headers, idempotent=True, rate_class='execute'
+            )
         else:
-            response = await self.request(url, method='POST', body=inputs or {}, headers=metadata.as_header)
+            response = await self.request(
+                url, method='POST', body=inputs or {}, headers=metadata.as_header, idempotent=True, rate_class='execute'
+            )
         return response
 
     async def validate(
@@ -305,7 +442,7 @@ class AsyncServices(AsyncApiResource):
         uri = Uri.validate(uri)
         validation_type = StringUtils.is_not_empty(validation_type) and str(validation_type).lower() or None
 
-        executable = _ExecuteInputs(inputs)
+        executable = _ExecuteInputs(inputs, self.config.json_codec)
         metadata = _ExecuteMeta(
             uri,
             is_batch=False,
@@ -332,7 +469,7 @@ class AsyncServices(AsyncApiResource):
             },
         }
 
-        return await self.request(url, method='POST', body=body)
+        return await self.request(url, method='POST', body=body, idempotent=True, rate_class='execute')
 
     async def get_schema(
         self,
@@ -346,10 +483,10 @@ class AsyncServices(AsyncApiResource):
         base, folder, service = self.config.base_url, uri.folder, uri.service
         if StringUtils.is_not_empty(uri.version_id):
             url = Uri.partial(f'GetEngineDetailByVersionId/versionid/{uri.version_id}', base_url=base.full)
-            return await self.request(url, method='POST')
+            return await self.__cached(uri, url, lambda: self.request(url, method='POST'))
         else:
             url = Uri.of(base_url=base.value, version='api/v1', endpoint=f'product/{folder}/engines/get/{service}')
-            return await self.request(url, method='GET')
+            return await self.__cached(uri, url, lambda: self.request(url, method='GET'))
 
     async def get_metadata(
         self,
@@ -365,8 +502,10 @@ class AsyncServices(AsyncApiResource):
         uri = Uri.validate(uri or UriParams(folder, service, service_id, None, version_id, proxy, public))
         url = Uri.of(uri, base_url=self.config.base_url.full, endpoint='metadata')
 
-        response = await self.request(url)
-        return ServiceExecuted(response, False, 'original')
+        async def fetch() -> ServiceExecuted:
+            return ServiceExecuted(await self.request(url), False, 'original')
+
+        return await self.__cached(uri, url, fetch)
 
     async def get_versions(
         self, uri: Union[None, str, UriParams] = None, *, folder: Optional[str] = None, service: Optional[str] = None
@@ -375,8 +514,11 @@ class AsyncServices(AsyncApiResource):
         endpoint = f'product/{uri.folder}/engines/getversions/{uri.service}'
         url = Uri.of(base_url=self.config.base_url.value, version='api/v1', endpoint=endpoint)
 
-        response = await self.request(url)
-        return response.copy_with(data=response.data.get('data', []) if isinstance(response.data, dict) else [])
+        async def fetch() -> HttpResponse:
+            response = await self.request(url)
+            return response.copy_with(data=response.data.get('data', []) if isinstance(response.data, dict) else [])
+
+        return await self.__cached(uri, url, fetch)
 
     async def get_swagger(
         self,
@@ -392,7 +534,7 @@ class AsyncServices(AsyncApiResource):
         endpoint = f'downloadswagger/{subservice}/{downloadable}/{version_id or ""}'
         url = Uri.of(uri, base_url=self.config.base_url.full, endpoint=endpoint)
 
-        return await self.request(url, method='GET')
+        return await self.__cached(uri, url, lambda: self.request(url, method='GET'))
 
     async def search(
         self,
@@ -462,7 +604,9 @@ class AsyncServices(AsyncApiResource):
             'tags': StringUtils.join(tags),
         }
 
-        return await self.request(url, method='POST', body={'request_data': data})
+        response = await self.request(url, method='POST', body={'request_data': data})
+        self.__invalidate(uri)
+        return response
 
     async def delete(
         self, uri: Union[None, str, UriParams] = None, *, folder: Optional[str] = None, service: Optional[str] = None
@@ -471,14 +615,33 @@ class AsyncServices(AsyncApiResource):
         endpoint = f'product/{uri.folder}/engines/delete/{uri.service}'
         url = Uri.of(base_url=self.config.base_url.value, version='api/v1', endpoint=endpoint)
 
-        return await self.request(url, method='DELETE')
+        response = await self.request(url, method='DELETE')
+        self.__invalidate(uri)
+        return response
 
     async def check_existence(
         self, uri: Union[None, str, UriParams] = None, *, folder: Optional[str] = None, service: Optional[str] = None
     ):
         uri = Uri.validate(uri or UriParams(folder, service))
         url = Uri.of(uri, base_url=self.config.base_url.full, endpoint='exists')
-        return await self.request(url)
+        return await self.__cached(uri, url, lambda: self.request(url))
+
+    async def __cached(self, uri: UriParams, url: Uri, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Returns the response of a read-mostly endpoint from the metadata cache (if any)."""
+        cache = self.config.metadata_cache
+        if cache is None:
+            return await fetch()
+
+        scope, key = _metadata_scope(uri), str(url)
+        response = cache.get(scope, key)
+        if response is None:
+            response = await fetch()
+            cache.set(scope, key, response)
+        return response
+
+    def __invalidate(self, uri: UriParams) -> None:
+        if self.config.metadata_cache is not None:
+            self.config.metadata_cache.invalidate(_metadata_scope(uri))
 
     def __encode(
         self,
@@ -490,9 +653,9 @@ class AsyncServices(AsyncApiResource):
     ) -> Tuple[bytes, Dict[str, str]]:
         headers = {'Content-Type': content_type, 'Content-Encoding': encoding, 'Accept-Encoding': encoding, **extras}
         if encoding == 'gzip':
-            return gzip.compress(json.dumps(data).encode('utf-8')), headers
+            return gzip.compress(self.config.json_codec.dumps(data)), headers
         if encoding == 'deflate':
-            return zlib.compress(json.dumps(data).encode('utf-8')), headers
+            return zlib.compress(self.config.json_codec.dumps(data)), headers
         else:
             raise SparkError.sdk(f'encoding "{encoding}" is not supported', {'encoding': encoding})
 
@@ -521,13 +684,13 @@ class AsyncCompilation(AsyncApiResource):
                 **(extras or {}),
             },
         }
-        form = {'engineUploadRequestEntity': json.dumps(metadata)}
+        form = {'engineUploadRequestEntity': self.config.json_codec.dumps(metadata).decode('utf-8')}
         files = {'serviceFile': (file_name or f'{uri.service}.xlsx', file)}
 
         response = await self.request(url, method='POST', form=form, files=files)
         if isinstance(response.data, dict) and response.data.get('response_data'):
             doc_id = response.data.get('response_data', {}).get('original_file_documentid')
-            self.logger.info(f'service file uploaded <{doc_id}>')
+            self.logger.info('service file uploaded <%s>', doc_id)
         return response
 
     async def get_status(
@@ -556,7 +719,7 @@ class AsyncCompilation(AsyncApiResource):
                 return response
 
             if progress < 100 and retries < max_retries:
-                self.logger.info(f'waiting for compilation job to complete - {progress}%')
+                self.logger.info('waiting for compilation job to complete - %s%%', progress)
 
                 retries += 1
                 time.sleep(get_retry_timeout(retries, retry_interval))
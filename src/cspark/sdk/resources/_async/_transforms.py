@@ -30,7 +30,7 @@ class AsyncTransforms(AsyncApiResource):
 
     async def validate(self, transform: Union[str, Transform]):
         url = Uri.of(None, endpoint=f'transform/validation', **self.base_uri)
-        body = {'transform_content': build_transform(transform)}
+        body = {'transform_content': build_transform(transform, self.config.json_codec)}
 
         return await self.request(url, method='POST', body=body)
 
@@ -42,7 +42,7 @@ class AsyncTransforms(AsyncApiResource):
 
     async def save(self, *, folder: str, name: str, transform: Union[str, Transform]):
         url = Uri.of(None, endpoint=f'transform/{folder}/{name}', **self.base_uri)
-        body = {'transform_content': build_transform(transform)}
+        body = {'transform_content': build_transform(transform, self.config.json_codec)}
 
         return await self.request(url, method='POST', body=body)
 
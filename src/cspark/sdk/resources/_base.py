@@ -1,22 +1,31 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import os
 import re
 import time
 from dataclasses import dataclass
-from typing import Any, Mapping, Optional, Union
+from typing import IO, Any, AsyncIterator, Callable, Iterator, Mapping, Optional, Union
 
-from httpx import URL, Client, Headers, HTTPError, HTTPStatusError, Request, RequestError, Response
+from httpx import URL, Client, Headers, HTTPError, HTTPStatusError, Request, RequestError, Response, ResponseNotRead
 
+from .._breaker import CircuitBreaker
 from .._config import Config
+from .._constants import DOWNLOAD_CHUNK_SIZE
 from .._errors import SparkApiError, SparkError
 from .._logger import get_logger
-from .._utils import StringUtils, get_retry_timeout, get_uuid, sanitize_uri
-from .._version import about, sdk_ua_header
+from .._retry import RetryPolicy, parse_retry_after
+from .._utils import StringUtils, get_uuid, sanitize_uri
+from .._version import about
 
-__all__ = ['ApiResource', 'UriParams', 'Uri', 'HttpResponse']
+__all__ = ['ApiResource', 'UriParams', 'Uri', 'HttpResponse', 'Download']
 
 
 class ApiResource:
+    rate_class = 'metadata'  # which rate limit applies to the requests (see `Config.rate_limit`)
+    user_agent = about
+
     def __init__(self, config: Config, http_client: Client):
         self.config = config
         self.logger = get_logger(**config.logger.__dict__)
@@ -24,13 +33,7 @@ class ApiResource:
 
     @property
     def default_headers(self):
-        return {
-            **self.config.extra_headers,
-            'User-Agent': about,
-            'x-spark-ua': sdk_ua_header,
-            'x-request-id': get_uuid(),
-            'x-tenant-name': self.config.base_url.tenant,
-        }
+        return {**self.config.static_headers(self.user_agent), 'x-request-id': get_uuid()}
 
     def request(
         self,
@@ -43,98 +46,362 @@ class ApiResource:
         content: Optional[bytes] = None,
         form=None,
         files=None,
+        stream: bool = False,
+        idempotent: Optional[bool] = None,
+        rate_class: Optional[str] = None,
+        retry: Optional[RetryPolicy] = None,  # overrides the retry policy of the client for this request
     ) -> 'HttpResponse':
         url = str(url)
+        if body is not None and content is None:
+            content = self.config.json_codec.dumps(body)
+            headers = {'Content-Type': 'application/json', **headers}
+
         request = self._client.build_request(
             method,
             url,
             params=params,
             headers={**headers, **self.default_headers},
             data=form,
-            json=body,
             content=content,
             files=files,
         )
 
-        self.logger.debug(f'{method} {url}')
-        return self.__fetch(request)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('%s %s', method, url)
+        rate_class = rate_class or self.rate_class
+        return self.__fetch(request, stream=stream, idempotent=idempotent, rate_class=rate_class, policy=retry)
+
+    def __fetch(
+        self,
+        request: Request,
+        retries: int = 0,
+        stream: bool = False,
+        idempotent: Optional[bool] = None,
+        started_at: Optional[float] = None,
+        rate_class: str = 'metadata',
+        policy: Optional[RetryPolicy] = None,
+    ) -> 'HttpResponse':
+        self._authorize(request)
+        policy, started_at = policy or self.config.retry, started_at or time.monotonic()
+        limiter, breaker = self.config.rate_limiter(rate_class), self.config.circuit_breaker
+        circuit = f'{request.url.host}/{rate_class}'
+        if breaker is not None:
+            self.__enter_circuit(breaker, circuit)
+
+        pending = breaker is not None  # a request let through the circuit must report its outcome
+        try:
+            response, status_code = None, 0
+            err_msg = f'an error occurred while fetching <{request.url}>'
 
-    def __fetch(self, request: Request, retries: int = 0) -> 'HttpResponse':
+            if limiter is not None:
+                limiter.acquire()
+            sent_at = time.monotonic()
+            try:
+                response = self._client.send(request, stream=stream)
+                response.raise_for_status()
+            except RequestError as err:
+                if breaker is not None:
+                    breaker.record(circuit, False)
+                    pending = False
+                delay = policy.next_delay(request, retries, started_at, error=err, idempotent=idempotent)
+                if delay is not None:
+                    self.logger.debug('retrying request due to %s...', type(err).__name__)
+                    time.sleep(delay)
+                    return self.__fetch(request, retries + 1, stream, idempotent, started_at, rate_class, policy)
+
+                err_msg += f'; {err}'  # occurs while issuing a request; hence no response
+                raise SparkError.sdk(err_msg, SparkApiError.no_response(request)) from err
+            except HTTPStatusError as err:
+                err_msg = str(err)
+            except HTTPError as err:
+                err_msg += f'; {err}'
+            except Exception:
+                pass  # possibly runtime error but should not interrupt this flow
+
+            if not response:
+                raise SparkError.sdk(err_msg, SparkApiError.no_response(request))
+
+            status_code = response.status_code
+            if breaker is not None:
+                breaker.record(circuit, status_code not in breaker.failure_status_codes, time.monotonic() - sent_at)
+                pending = False
+            if status_code >= 400:
+                if stream:
+                    response.read()  # error details are needed either way
+                    response.close()
+
+                if status_code == 429 and limiter is not None:
+                    limiter.throttle(parse_retry_after(response.headers.get('retry-after')))
+
+                if status_code == 401 and retries < policy.max_retries and self._authorize(request, renew=True):
+                    return self.__fetch(request, retries + 1, stream, idempotent, started_at, rate_class, policy)
+
+                delay = policy.next_delay(request, retries, started_at, response=response, idempotent=idempotent)
+                if delay is not None:
+                    self.logger.debug('retrying request due to status code %s...', status_code)
+                    time.sleep(delay)
+                    return self.__fetch(request, retries + 1, stream, idempotent, started_at, rate_class, policy)
+
+                raise SparkError.api(
+                    status_code,
+                    {'message': f'failed to fetch <{request.url}>', 'cause': SparkApiError.to_cause(request, response)},
+                )
+
+            # otherwise, ok response (its JSON payload is decoded on demand)
+            if limiter is not None:
+                limiter.recover()
+            content_type = response.headers.get('content-type', '')
+            return HttpResponse(
+                status=status_code,
+                data=None,
+                buffer=None,
+                headers=response.headers,
+                raw_request=request,
+                raw_response=response,
+                decoder=self.config.json_codec.loads if 'application/json' in content_type else None,
+            )
+        finally:
+            if pending:
+                breaker.record(circuit, False)  # type: ignore
+
+    def _authorize(self, request: Request, *, renew: bool = False) -> bool:
+        """
+        Sets the credentials of a request, refreshing the OAuth2 access token if needed.
+
+        When `renew` is set (i.e., the credentials got rejected), the access token is refreshed
+        unless another request already did. Returns whether the credentials are renewable.
+        """
+        oauth = self.config.auth.oauth
+        if oauth is not None and (renew or oauth.expires_soon):
+            rejected = request.headers.get('Authorization', '').replace('Bearer ', '', 1) if renew else None
+            oauth.refresh_token(self.config, self._client, stale=rejected)
         request.headers.update(self.config.auth.as_header)
+        return oauth is not None
+
+    def __enter_circuit(self, breaker: CircuitBreaker, circuit: str) -> None:
+        if not breaker.acquire(circuit) or not breaker.health_check:
+            return
+        try:
+            healthy = self.__is_healthy()
+        except BaseException:
+            breaker.record(circuit, False)  # releases the probe slot
+            raise
+        if not healthy:
+            breaker.record(circuit, False)
+            breaker.acquire(circuit)  # raises CircuitOpenError as the circuit has just been reopened
 
-        response, status_code = None, 0
-        err_msg = f'an error occurred while fetching <{request.url}>'
+    def __is_healthy(self) -> bool:
+        from ._health import Health  # NOTE: help avoid circular import
 
         try:
-            response = self._client.send(request)
-            response.raise_for_status()
-        except RequestError as err:
-            err_msg += f'; {err}'  # occurs while issuing a request; hence no response
-            raise SparkError.sdk(err_msg, SparkApiError.no_response(request)) from err
-        except HTTPStatusError as err:
-            err_msg = str(err)
-        except HTTPError as err:
-            err_msg += f'; {err}'
-        except Exception:
-            pass  # possibly runtime error but should not interrupt this flow
-
-        if not response:
-            raise SparkError.sdk(err_msg, SparkApiError.no_response(request))
-
-        status_code = response.status_code
-        if status_code >= 400:
-            if status_code == 401 and self.config.auth.type == 'oauth' and retries < self.config.max_retries:
-                self.config.auth.oauth.retrieve_token(self.config, self._client)  # type: ignore
-                return self.__fetch(request, retries + 1)
-
-            if (status_code == 408 or status_code == 429) and retries < self.config.max_retries:
-                self.logger.debug(f'retrying request due to status code {status_code}...')
-                delay = get_retry_timeout(retries, self.config.retry_interval)
-                time.sleep(delay)
-                return self.__fetch(request, retries + 1)
-
-            raise SparkError.api(
-                status_code,
-                {'message': f'failed to fetch <{request.url}>', 'cause': SparkApiError.to_cause(request, response)},
-            )
+            return Health(self.config, self._client).ok()
+        except SparkError:
+            return False
+
+
+class HttpResponse:
+    """
+    Represents the outcome of a successful HTTP request to Spark.
+
+    The JSON payload (if any) is only decoded the first time `data` is accessed. When
+    the request is made with `stream=True`, the body is not read upfront either: it can
+    be consumed chunk by chunk via `iter_bytes()` (or `aiter_bytes()`) without ever
+    holding the whole payload in memory, or decoded via `data` without retaining the
+    raw bytes.
+    """
+
+    def __init__(
+        self,
+        status: int,
+        data: Union[None, Any, str],
+        buffer: Optional[bytes],
+        headers: Headers,
+        raw_request: Request,
+        raw_response: Response,
+        *,
+        decoder: Optional[Callable[[bytes], Any]] = None,
+    ):
+        self.status = status
+        self.headers = headers
+        self.raw_request = raw_request
+        self.raw_response = raw_response
+        self._buffer = buffer
+        self._data = _UNDECODED if decoder else data
+        self._decoder = decoder
+
+    def __repr__(self) -> str:
+        return f'<HttpResponse [{self.status}]: {self.raw_request.method} {self.raw_request.url}>'
 
-        # otherwise, ok response
-        ok_response = {
-            'status': status_code,
-            'data': None,
-            'buffer': response.content,
-            'headers': response.headers,
-            'raw_request': request,
-            'raw_response': response,
-        }
-
-        content_type = response.headers.get('content-type', '')
-        if 'application/json' in content_type:
+    @property
+    def data(self) -> Union[None, Any, str]:
+        if self._data is _UNDECODED:
+            content = self._buffer if self._buffer is not None else self.__consume()
             try:
-                ok_response['data'] = response.json()
+                self._data = self._decoder(content)  # type: ignore
             except Exception:
-                ok_response['data'] = response.text
-        return HttpResponse(**ok_response)
+                self._data = content.decode(self.raw_response.encoding or 'utf-8', errors='replace')
+        return self._data
 
+    @property
+    def buffer(self) -> bytes:
+        if self._buffer is None:
+            try:
+                self._buffer = self.__consume() if self.is_stream else self.raw_response.content
+            except ResponseNotRead as err:
+                raise SparkError.sdk('the body of a streamed response can only be consumed once', err) from err
+        return self._buffer
 
-@dataclass
-class HttpResponse:
-    status: int
-    data: Union[None, Any, str]
-    buffer: bytes
-    headers: Headers
-    raw_request: Request
-    raw_response: Response
+    @property
+    def is_stream(self) -> bool:
+        """Whether the response body is yet to be read from the network."""
+        return self._buffer is None and not self.raw_response.is_stream_consumed
+
+    def iter_bytes(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """Iterates over the response body; streamed responses are read from the network as they go."""
+        if not self.is_stream:
+            content = self.buffer
+            size = chunk_size or len(content) or 1
+            for i in range(0, len(content), size):
+                yield content[i : i + size]
+            return
+        try:
+            yield from self.raw_response.iter_bytes(chunk_size)
+        finally:
+            self.raw_response.close()
+
+    async def aiter_bytes(self, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Asynchronously iterates over the response body (see `iter_bytes`)."""
+        if not self.is_stream:
+            for chunk in self.iter_bytes(chunk_size):
+                yield chunk
+            return
+        try:
+            async for chunk in self.raw_response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await self.raw_response.aclose()
+
+    async def aread(self) -> bytes:
+        """Reads the whole body of a streamed response made with an async client."""
+        if self._buffer is None:
+            self._buffer = b''.join([chunk async for chunk in self.aiter_bytes()])
+        return self._buffer
+
+    def save(
+        self,
+        dest: Union[str, os.PathLike, IO[bytes]],
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+    ) -> 'Download':
+        """
+        Writes the response body to a file path or a binary file-like object, chunk by chunk.
+
+        The expected `checksum` (if any) is a hex digest, optionally prefixed with its hashing
+        algorithm (e.g., 'md5:abc123...'); sha256 is used by default. When written to a path,
+        the file only appears once fully downloaded and verified.
+        """
+        writer = _FileWriter(dest, checksum, url=str(self.raw_request.url))
+        try:
+            for chunk in self.iter_bytes(chunk_size):
+                writer.write(chunk)
+        except BaseException:
+            writer.discard()
+            raise
+        return writer.commit()
+
+    async def asave(
+        self,
+        dest: Union[str, os.PathLike, IO[bytes]],
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+    ) -> 'Download':
+        """Asynchronously writes the response body to a file path or a binary file-like object (see `save`)."""
+        writer = _FileWriter(dest, checksum, url=str(self.raw_request.url))
+        try:
+            async for chunk in self.aiter_bytes(chunk_size):
+                writer.write(chunk)
+        except BaseException:
+            writer.discard()
+            raise
+        return writer.commit()
+
+    def close(self) -> None:
+        self.raw_response.close()
+
+    async def aclose(self) -> None:
+        await self.raw_response.aclose()
 
     def copy_with(self, **kwargs) -> 'HttpResponse':
-        return HttpResponse(
+        response = HttpResponse(
             status=kwargs.get('status', self.status),
-            data=kwargs.get('data', self.data),
-            buffer=kwargs.get('buffer', self.buffer),
+            data=kwargs.get('data'),
+            buffer=kwargs.get('buffer', self._buffer),
             headers=kwargs.get('headers', self.headers),
             raw_request=kwargs.get('request', self.raw_request),
             raw_response=kwargs.get('response', self.raw_response),
         )
+        if 'data' not in kwargs:
+            response._data, response._decoder = self._data, self._decoder
+        return response
+
+    def __consume(self) -> bytes:
+        # reads a streamed body without letting httpx cache it on the raw response.
+        try:
+            return b''.join(self.iter_bytes())
+        except RuntimeError as err:
+            raise SparkError.sdk('use `await response.aread()` to read an async streamed response', err) from err
+
+
+_UNDECODED: Any = object()
+
+
+@dataclass(frozen=True)
+class Download:
+    """Describes a file downloaded from Spark."""
+
+    url: str
+    path: Optional[str]  # None when written to a file-like object
+    size: int
+    checksum: str  # formatted as 'algorithm:hexdigest'
+
+
+class _FileWriter:
+    def __init__(self, dest: Union[str, os.PathLike, IO[bytes]], checksum: Optional[str], url: str):
+        algorithm, _, expected = (checksum or '').rpartition(':')
+        try:
+            self._hash = hashlib.new(algorithm or 'sha256')
+        except ValueError as err:
+            raise SparkError.sdk(f'unsupported checksum algorithm <{algorithm}>', checksum) from err
+
+        self._url = url
+        self._expected = expected.lower() or None
+        self._path = os.fspath(dest) if isinstance(dest, (str, os.PathLike)) else None
+        self._file = open(f'{self._path}.part', 'wb') if self._path else dest
+        self._size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)  # type: ignore
+        self._hash.update(chunk)
+        self._size += len(chunk)
+
+    def discard(self) -> None:
+        if self._path:
+            self._file.close()  # type: ignore
+            os.remove(f'{self._path}.part')
+
+    def commit(self) -> Download:
+        digest = self._hash.hexdigest()
+        if self._expected and self._expected != digest:
+            self.discard()
+            cause = {'url': self._url, 'expected': self._expected, 'actual': digest}
+            raise SparkError.sdk(f'checksum mismatch for file downloaded from <{self._url}>', cause)
+
+        if self._path:
+            self._file.close()  # type: ignore
+            os.replace(f'{self._path}.part', self._path)
+        return Download(url=self._url, path=self._path, size=self._size, checksum=f'{self._hash.name}:{digest}')
 
 
 @dataclass(frozen=True)
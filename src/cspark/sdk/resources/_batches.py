@@ -1,17 +1,26 @@
+import csv
 import json
 import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union, cast
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Union, cast
 
 from httpx import Client
 
+from .._checkpoint import BatchCheckpoint
+from .._codec import JsonCodec, get_json_codec
 from .._config import Config
 from .._constants import SPARK_SDK
 from .._errors import SparkError
+from .._sinks import ResultSink
 from .._utils import StringUtils, get_uuid, is_not_empty_list
 from ._base import ApiResource, Uri, UriParams
 
-__all__ = ['Batches', 'Pipeline', 'BatchChunk', 'ChunkData', 'create_chunks']
+__all__ = ['Batches', 'Pipeline', 'BatchChunk', 'ChunkData', 'BatchRun', 'create_chunks', 'iter_chunks', 'read_chunks']
 
 
 @dataclass
@@ -29,11 +38,11 @@ class ChunkData:
         return ChunkData(data.get('inputs', []), data.get('parameters', {}), data.get('summary'))
 
     @staticmethod
-    def from_str(data: Union[str, bytes]) -> 'ChunkData':
+    def from_str(data: Union[str, bytes], json_codec: Optional[JsonCodec] = None) -> 'ChunkData':
         """Creates a chunk data object from string-based data."""
         try:
-            return ChunkData.from_dict(json.loads(data))
-        except json.JSONDecodeError as err:
+            return ChunkData.from_dict(get_json_codec(json_codec).loads(data))
+        except ValueError as err:  # JSON decode errors across codecs are value errors
             raise SparkError.sdk('failed to parse string/bytes data as JSON', cause=err) from err
         except Exception as exc:
             raise SparkError.sdk(f'cannot create chunk data from {data}', cause=exc) from exc
@@ -67,19 +76,21 @@ class BatchChunk:
         return chunks
 
     @staticmethod
-    def from_str(data: Union[str, bytes]) -> List['BatchChunk']:
+    def from_str(data: Union[str, bytes], json_codec: Optional[JsonCodec] = None) -> List['BatchChunk']:
         """Creates a list of batch chunks from string-based data."""
         try:
-            json_data = json.loads(data)
+            json_data = get_json_codec(json_codec).loads(data)
             chunks = json_data.pop('chunks', []) if 'chunks' in json_data else json_data
             return BatchChunk.from_dict(chunks)
-        except json.JSONDecodeError as err:
+        except ValueError as err:  # JSON decode errors across codecs are value errors
             raise SparkError.sdk('failed to parse string/bytes data as JSON', cause=err) from err
         except Exception as exc:
             raise SparkError.sdk(f'cannot create batch chunks from {data}', cause=exc) from exc
 
 
 class Batches(ApiResource):
+    rate_class = 'batch'
+
     def __init__(self, config: Config, http_client: Client):
         super().__init__(config, http_client)
         self._base_uri = {'base_url': self.config.base_url.full, 'version': 'api/v4'}
@@ -137,17 +148,141 @@ class Batches(ApiResource):
 
         return self.request(url, method='POST', body={k: v for k, v in body.items() if v is not None})
 
-    def of(self, batch_id: str) -> 'Pipeline':
-        return Pipeline(batch_id, self.config, self._client)
+    def of(self, batch_id: str, *, checkpoint: Optional[BatchCheckpoint] = None) -> 'Pipeline':
+        return Pipeline(batch_id, self.config, self._client, checkpoint=checkpoint)
+
+    def run(
+        self,
+        uri: Union[str, UriParams],
+        dataset: Union[str, os.PathLike, Iterable[Any]],
+        *,
+        chunk_size: int = 200,
+        parameters: Optional[Dict[str, Any]] = None,
+        workers: int = 2,
+        pull_workers: int = 1,
+        max_chunks: int = 100,
+        buffer_threshold: float = 0.5,
+        poll_interval: float = 2.0,
+        sink: Optional[ResultSink] = None,
+        checkpoint: Optional[BatchCheckpoint] = None,
+        **options: Any,
+    ) -> 'BatchRun':
+        """
+        Runs a batch pipeline from start to finish.
+
+        The pipeline is created (using `options`), the dataset is pushed chunk by chunk
+        by `workers` threads while `pull_workers` threads retrieve the results as they
+        become available, and the pipeline is closed once every chunk is processed (or
+        cancelled if anything goes wrong). Pushes are held back whenever the input buffer
+        of the pipeline is more than `buffer_threshold` full.
+
+        The dataset is either rows of inputs (headers first), as a JSON array or any other
+        iterable, to split into chunks of `chunk_size` records; the path to a CSV, JSON Lines
+        or JSON array file to read lazily (see `read_chunks`); or an iterable of `BatchChunk`s.
+
+        When a result `sink` is given, chunk results are written into it (joined with their
+        inputs) as soon as they are pulled instead of being kept in memory; the sink is
+        left open for the caller to close.
+
+        When a `checkpoint` is given, pushed and pulled chunks are recorded along the way
+        and the pipeline is left open if anything goes wrong so that the run can be picked
+        up later on with `resume()`.
+        """
+        if checkpoint is not None and checkpoint.batch_id is not None:
+            raise SparkError.sdk(f'checkpoint is already bound to batch pipeline <{checkpoint.batch_id}>; resume it')
+
+        chunks = _iter_batch_chunks(dataset, chunk_size, parameters, self.config.json_codec)
+        batch = self.create(uri, **options)
+        pipeline = self.of(batch.data['id'], checkpoint=checkpoint)  # type: ignore
+        return self.__drive(
+            pipeline,
+            chunks,
+            workers=workers,
+            pull_workers=pull_workers,
+            max_chunks=max_chunks,
+            buffer_threshold=buffer_threshold,
+            poll_interval=poll_interval,
+            sink=sink,
+        )
+
+    def resume(
+        self,
+        batch_id: Optional[str],
+        checkpoint: BatchCheckpoint,
+        dataset: Union[None, str, os.PathLike, Iterable[Any]] = None,
+        *,
+        chunk_size: int = 200,
+        parameters: Optional[Dict[str, Any]] = None,
+        workers: int = 2,
+        pull_workers: int = 1,
+        max_chunks: int = 100,
+        buffer_threshold: float = 0.5,
+        poll_interval: float = 2.0,
+        sink: Optional[ResultSink] = None,
+    ) -> 'BatchRun':
+        """
+        Resumes an interrupted run of a batch pipeline from its checkpoint.
+
+        The existing pipeline (`batch_id` defaults to the one of the checkpoint) is driven
+        to completion like `run()` does, except that the chunks already pushed according
+        to the checkpoint are skipped and the results already pulled are not pulled again.
+        Pass the same `dataset` (and `chunk_size`) as the interrupted run to push the
+        remaining chunks, or none to only pull the pending results.
+        """
+        batch_id = batch_id or checkpoint.batch_id
+        if not batch_id:
+            raise SparkError.sdk('batch pipeline id is required to resume a run', checkpoint.path)
+
+        chunks = (
+            iter(()) if dataset is None else _iter_batch_chunks(dataset, chunk_size, parameters, self.config.json_codec)
+        )
+        return self.__drive(
+            self.of(batch_id, checkpoint=checkpoint),
+            chunks,
+            workers=workers,
+            pull_workers=pull_workers,
+            max_chunks=max_chunks,
+            buffer_threshold=buffer_threshold,
+            poll_interval=poll_interval,
+            sink=sink,
+        )
+
+    def __drive(self, pipeline: 'Pipeline', chunks: Iterator[BatchChunk], **options: Any) -> 'BatchRun':
+        runner = _PipelineRunner(pipeline, chunks, **options)
+        try:
+            result = runner.run()
+        except BaseException:
+            if not pipeline.is_disposed and pipeline.checkpoint is None:  # otherwise, left open to resume
+                try:
+                    pipeline.cancel()
+                except Exception as cause:  # must not hide the original error
+                    self.logger.error('failed to cancel batch pipeline <%s>: %s', pipeline.batch_id, cause)
+            raise
+
+        pipeline.dispose()
+        return result
 
 
 class Pipeline(ApiResource):
+    rate_class = 'batch'
+
     _state: str = 'open'
-    _chunks: Dict[str, int] = dict()
 
-    def __init__(self, batch_id: str, config: Config, http_client: Client):
+    def __init__(
+        self,
+        batch_id: str,
+        config: Config,
+        http_client: Client,
+        status_ttl: float = 2.0,
+        checkpoint: Optional[BatchCheckpoint] = None,
+    ):
         super().__init__(config, http_client)
         self._id = batch_id
+        self._chunks: Dict[str, int] = {}
+        self._status: Optional[Dict[str, Any]] = None
+        self._status_at = 0.0
+        self._status_lock = threading.Lock()
+        self.status_ttl = status_ttl  # min delay (in seconds) between two status checks
         self._base_uri = {'base_url': self.config.base_url.full, 'version': 'api/v4'}
 
         if StringUtils.is_empty(batch_id):
@@ -155,6 +290,11 @@ class Pipeline(ApiResource):
             self.logger.error(error.message)
             raise error
 
+        self.checkpoint = checkpoint  # records pushed and pulled chunks if any
+        if checkpoint is not None:
+            checkpoint.attach(batch_id)
+            self._chunks.update(checkpoint.pushed)
+
     @property
     def batch_id(self):
         return self._id
@@ -183,10 +323,39 @@ class Pipeline(ApiResource):
         url = Uri.of(None, endpoint=f'batch/{self._id}', **self._base_uri)
         return self.request(url, method='GET')
 
+    @property
+    def last_status(self) -> Optional[Dict[str, Any]]:
+        """
+        The last known status of the batch pipeline.
+
+        It is kept up to date by every status check as well as every push and pull, which
+        respond with the status of the pipeline, and is never fetched by this property.
+        """
+        return self._status
+
+    @property
+    def buffer_usage(self) -> float:
+        """The ratio of the input buffer in use according to the last known status."""
+        return _buffer_usage(self._status)
+
     def get_status(self):
         """Retrieves the batch pipeline status."""
         url = Uri.of(None, endpoint=f'batch/{self._id}/status', **self._base_uri)
-        return self.request(url, method='GET')
+        response = self.request(url, method='GET')
+        self.__keep_status(response.data)
+        return response
+
+    def refresh_status(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Returns the status of the batch pipeline, fetching it only if the last known one
+        is older than `max_age` seconds (defaults to `status_ttl`). Concurrent callers
+        share the same status check.
+        """
+        max_age = self.status_ttl if max_age is None else max_age
+        with self._status_lock:
+            if self._status is None or time.monotonic() - self._status_at >= max_age:
+                self.get_status()
+            return cast(Dict[str, Any], self._status)
 
     def push(
         self,
@@ -196,15 +365,31 @@ class Pipeline(ApiResource):
         inputs: Optional[List[Any]] = None,
         raw: Union[None, str, bytes] = None,
         if_chunk_id_duplicated: str = 'replace',  # 'ignore' | 'replace' | 'throw'
+        buffer_threshold: Optional[float] = None,
+        stop: Optional[threading.Event] = None,
     ):
+        """
+        Submits input data to the batch pipeline.
+
+        When a `buffer_threshold` (e.g., 0.5) is given, the push is held back until the
+        ratio of the input buffer in use falls under it. The status of the pipeline is
+        then checked at most once every `status_ttl` seconds, and the wait is abandoned with
+        an error as soon as the `stop` event is set (e.g., when a run fails).
+        """
         self.__assert_state(['closed', 'cancelled'])
 
         url = Uri.of(None, endpoint=f'batch/{self._id}/chunks', **self._base_uri)
         body = self.__build_chunk_data(chunks, data, inputs, raw, if_chunk_id_duplicated)
 
+        if buffer_threshold is not None:
+            self.__wait_for_buffer(buffer_threshold, stop)
+
         response = self.request(url, method='POST', body=body)
         total = response.data['record_submitted'] if isinstance(response.data, dict) else 0
-        self.logger.info(f'pushed {total} records to batch pipeline <{self._id}>')
+        self.logger.info('pushed %s records to batch pipeline <%s>', total, self._id)
+        self.__keep_status(response.data)
+        if self.checkpoint is not None:
+            self.checkpoint.record_pushes({chunk['id']: self._chunks.get(chunk['id'], 0) for chunk in body['chunks']})
 
         return response
 
@@ -215,7 +400,24 @@ class Pipeline(ApiResource):
 
         response = self.request(Uri.of(None, endpoint=endpoint, **self._base_uri))
         total = response.data['status']['records_available'] if isinstance(response.data, dict) else 0
-        self.logger.info(f'{total} available records from batch pipeline <{self._id}>')
+        self.logger.info('%s available records from batch pipeline <%s>', total, self._id)
+        self.__keep_status(response.data.get('status') if isinstance(response.data, dict) else None)
+        if self.checkpoint is not None and isinstance(response.data, dict):
+            self.checkpoint.record_pulls(response.data.get('data') or [])
+
+        return response
+
+    def pull_into(self, sink: ResultSink, max_chunks: int = 100, inputs: Optional[Mapping[str, List[Any]]] = None):
+        """
+        Pulls the available chunk results and writes them into a result sink.
+
+        When given, `inputs` maps chunk ids to the inputs pushed with them so that each
+        output record gets written next to its inputs.
+        """
+        response = self.pull(max_chunks)
+        chunks = response.data.get('data') if isinstance(response.data, dict) else None
+        for chunk in chunks or []:
+            sink.write(chunk, inputs.get(chunk.get('id')) if inputs else None)
 
         return response
 
@@ -226,7 +428,7 @@ class Pipeline(ApiResource):
         url = Uri.of(None, endpoint=f'batch/{self._id}', **self._base_uri)
 
         response = self.request(url, method='PATCH', body={'batch_status': state})
-        self.logger.info(f'batch pipeline <{self._id}> has been {state}')
+        self.logger.info('batch pipeline <%s> has been %s', self._id, state)
         self._state = state
 
         return response
@@ -234,6 +436,26 @@ class Pipeline(ApiResource):
     def cancel(self):
         return self.dispose(state='cancelled')
 
+    def __keep_status(self, status: Any) -> None:
+        if isinstance(status, dict) and 'batch_status' in status:
+            self._status, self._status_at = status, time.monotonic()
+
+    def __wait_for_buffer(self, threshold: float, stop: Optional[threading.Event] = None) -> None:
+        while True:
+            if stop is not None and stop.is_set():
+                raise SparkError.sdk(f'stopped waiting for the input buffer of batch pipeline <{self._id}>')
+            status = self.refresh_status()
+            if status.get('batch_status') in _TERMINAL_STATUSES:
+                raise SparkError.sdk(f'batch pipeline <{self._id}> is {status["batch_status"]}', status)
+            if _buffer_usage(status) <= threshold:
+                return
+            self.logger.debug('input buffer of batch pipeline <%s> is full; waiting...', self._id)
+            delay = max(self.status_ttl - (time.monotonic() - self._status_at), 0.01)
+            if stop is None:
+                time.sleep(delay)
+            else:
+                stop.wait(delay)
+
     def __assert_state(self, states: List[str], throwable: bool = True) -> bool:
         if self._state in states:
             error = SparkError.sdk(f'batch pipeline <{self._id}> is already {self._state}')
@@ -253,7 +475,7 @@ class Pipeline(ApiResource):
     ):
         try:
             if raw is not None and StringUtils.is_not_empty(raw):
-                chunks = BatchChunk.from_str(raw)  # takes precedence over other entries
+                chunks = BatchChunk.from_str(raw, self.config.json_codec)  # takes precedence over other entries
 
             if is_not_empty_list(chunks):
                 return {'chunks': self.__assess_chunks(cast(List[BatchChunk], chunks), if_duplicated)}
@@ -267,7 +489,7 @@ class Pipeline(ApiResource):
             raise SparkError.sdk(
                 message=f'wrong data params were provided for this pipeline <{self._id}>.\n'
                 'Expecting either "raw=str/bytes", "chunks=List[BatchChunk]", "data=ChunkData" or "inputs=List[Any]"',
-                cause=json.dumps(cause),
+                cause=self.config.json_codec.dumps(cause).decode('utf-8'),
             )
         except SparkError as error:
             self.logger.error(error.message)
@@ -281,9 +503,11 @@ class Pipeline(ApiResource):
             id = get_uuid() if StringUtils.is_empty(chunk.id) else chunk.id
             if chunk.id in self._chunks:
                 if is_duplicated == 'ignore':
-                    self.logger.warn(
-                        f'chunk id <{id}> appears to be duplicated for this pipeline <{self._id}> '
-                        f'and may cause unexpected behavior. You should consider using a different id.'
+                    self.logger.warning(
+                        'chunk id <%s> appears to be duplicated for this pipeline <%s> '
+                        'and may cause unexpected behavior. You should consider using a different id.',
+                        id,
+                        self._id,
                     )
                     continue
                 if is_duplicated == 'throw':
@@ -295,14 +519,185 @@ class Pipeline(ApiResource):
                     self._chunks.pop(chunk.id)  # remove the old chunk id
                     chunk.id = get_uuid()  # add new id for the chunk
                     self.logger.info(
-                        f'chunk id <{id}> is duplicated for this pipeline <{self._id}> '
-                        f'and has been replaced with <{chunk.id}>'
+                        'chunk id <%s> is duplicated for this pipeline <%s> and has been replaced with <%s>',
+                        id,
+                        self._id,
+                        chunk.id,
                     )
             self._chunks[chunk.id] = chunk.size or len(chunk.data.inputs) - 1
             assessed.append(chunk.to_dict())
         return assessed
 
 
+_TERMINAL_STATUSES = ('failed', 'cancelled', 'closed_by_timeout')
+
+
+@dataclass
+class BatchRun:
+    """Summarizes a batch pipeline run from start to finish."""
+
+    batch_id: str
+    chunks: int
+    records: int
+    results: List[Dict[str, Any]]  # chunk results in the order of the input chunks
+    status: Dict[str, Any]  # last known status of the pipeline
+    elapsed: float  # in seconds
+
+    @property
+    def outputs(self) -> List[Any]:
+        return [output for result in self.results for output in result.get('outputs', [])]
+
+
+class _PipelineRunner:
+    """Overlaps pushes and pulls of a batch pipeline using threads."""
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        chunks: Iterator[BatchChunk],
+        *,
+        workers: int,
+        pull_workers: int,
+        max_chunks: int,
+        buffer_threshold: float,
+        poll_interval: float,
+        sink: Optional[ResultSink] = None,
+    ):
+        self.pipeline = pipeline
+        self.workers = max(1, workers)
+        self.pull_workers = max(1, pull_workers)
+        self.max_chunks = max_chunks
+        self.buffer_threshold = buffer_threshold
+        self.poll_interval = poll_interval
+        self.sink = sink
+        self._chunks = chunks
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._pushers = self.workers
+        self._pushed: Dict[str, int] = {}  # chunk id -> position in the dataset
+        self._pulled: Dict[str, Dict[str, Any]] = {}  # chunk id -> chunk result ({} if written to a sink)
+        self._inputs: Dict[str, List[Any]] = {}  # chunk id -> inputs awaiting their results (sink only)
+        self._index = 0
+        self._skipped: Set[str] = set()  # chunks pushed before resuming a run
+        pipeline.status_ttl = poll_interval
+
+        if pipeline.checkpoint is not None:
+            self._skipped = set(pipeline.checkpoint.pushed)
+            self._pushed = {chunk_id: i for i, chunk_id in enumerate(pipeline.checkpoint.pushed)}
+            for chunk_id, result in pipeline.checkpoint.pulled.items():
+                self._pulled[chunk_id] = (result or {}) if sink is None else {}
+
+    def run(self) -> BatchRun:
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=self.workers + self.pull_workers) as executor:
+            futures = [executor.submit(self.__push_all) for _ in range(self.workers)]
+            futures += [executor.submit(self.__pull_all) for _ in range(self.pull_workers)]
+
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            self._stopped.set()  # no-op if all went well; otherwise, stops the other workers
+            for future in done:
+                future.result()  # re-raises the first error if any
+
+        results = sorted(self._pulled.items(), key=lambda item: self._pushed.get(item[0], len(self._pushed)))
+        return BatchRun(
+            batch_id=self.pipeline.batch_id,
+            chunks=self.pipeline.stats['chunks'],
+            records=self.pipeline.stats['records'],
+            results=[result for _, result in results if result],
+            status=self.pipeline.last_status or {},
+            elapsed=time.time() - start,
+        )
+
+    @property
+    def is_done(self) -> bool:
+        with self._lock:
+            return self._pushers == 0 and len(self._pulled) >= len(self._pushed)
+
+    def __push_all(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                with self._lock:
+                    chunk, index = next(self._chunks, None), self._index
+                    self._index += 1
+                if chunk is None:
+                    return
+
+                chunk_id = chunk.id
+                if chunk_id in self._skipped:
+                    with self._lock:
+                        self._pushed[chunk_id] = index
+                        if self.sink is not None and chunk_id not in self._pulled:
+                            self._inputs[chunk_id] = chunk.data.inputs
+                    continue
+
+                if self.sink is not None:
+                    self._inputs[chunk_id] = chunk.data.inputs
+                self.pipeline.push(chunks=[chunk], buffer_threshold=self.buffer_threshold, stop=self._stopped)
+                with self._lock:
+                    self._pushed[chunk.id] = index  # the pipeline may have renamed a duplicated id
+                    if self.sink is not None and chunk.id != chunk_id:
+                        self._inputs[chunk.id] = self._inputs.pop(chunk_id)
+        finally:
+            with self._lock:
+                self._pushers -= 1
+
+    def __pull_all(self) -> None:
+        while not self._stopped.is_set() and not self.is_done:
+            if self.sink is None:
+                response = self.pipeline.pull(self.max_chunks)
+            else:
+                response = self.pipeline.pull_into(self.sink, self.max_chunks, inputs=self._inputs)
+            data = response.data if isinstance(response.data, dict) else {}
+            self.__assert_status(data.get('status'))
+
+            chunks = data.get('data') or []
+            with self._lock:
+                for chunk in chunks:
+                    chunk_id = chunk.get('id') or get_uuid()
+                    self._inputs.pop(chunk_id, None)
+                    self._pulled[chunk_id] = chunk if self.sink is None else {}
+            if not chunks:
+                self._stopped.wait(self.poll_interval)
+
+    def __assert_status(self, status: Any) -> None:
+        if isinstance(status, dict) and status.get('batch_status') in _TERMINAL_STATUSES:
+            raise SparkError.sdk(f'batch pipeline <{self.pipeline.batch_id}> is {status["batch_status"]}', status)
+
+
+def _buffer_usage(status: Any) -> float:
+    """Returns the ratio of the input buffer in use based on the status of a batch pipeline."""
+    if not isinstance(status, dict):
+        return 0.0
+    used = status.get('input_buffer_used_bytes') or 0
+    total = used + (status.get('input_buffer_remaining_bytes') or 0)
+    return used / total if total > 0 else 0.0
+
+
+def _iter_batch_chunks(
+    dataset: Union[str, os.PathLike, Iterable[Any]],
+    chunk_size: int,
+    parameters: Optional[Dict[str, Any]],
+    json_codec: Optional[JsonCodec] = None,
+) -> Iterator[BatchChunk]:
+    if isinstance(dataset, (str, os.PathLike)):
+        chunks = read_chunks(dataset, chunk_size=chunk_size, parameters=parameters, json_codec=json_codec)
+    else:
+        items = iter(dataset)
+        first = next(items, None)
+        if isinstance(first, BatchChunk):
+            return chain([first], cast(Iterator[BatchChunk], items))
+        chunks = iter_chunks(items, headers=first, chunk_size=chunk_size, parameters=parameters)
+
+    first_chunk = next(chunks, None)  # fails early on missing headers or files
+    return _with_positional_ids(chain([first_chunk], chunks) if first_chunk else chunks)
+
+
+def _with_positional_ids(chunks: Iterator[BatchChunk]) -> Iterator[BatchChunk]:
+    for i, chunk in enumerate(chunks):
+        chunk.id = str(i)  # positional ids match the same chunks when resuming a run
+        yield chunk
+
+
 def create_chunks(
     dataset: List[Any],  # input dataset in json array format
     *,
@@ -311,19 +706,128 @@ def create_chunks(
     parameters: Optional[Dict[str, Any]] = None,
     summary: Optional[Dict[str, Any]] = None,
 ) -> List[BatchChunk]:
-    """Creates a list of batch chunks from a JSON array dataset."""
-    length = len(dataset)
-    chunk_size = max(1, chunk_size)
-    batch_size = math.ceil(length / chunk_size)
+    """Creates a list of batch chunks from a JSON array dataset (left untouched)."""
+    return list(iter_chunks(dataset, headers=headers, chunk_size=chunk_size, parameters=parameters, summary=summary))
+
 
-    headers = headers or (length > 0 and cast(List[str], dataset.pop(0))) or []
+def iter_chunks(
+    dataset: Iterable[Any],  # rows of inputs (headers first unless given)
+    *,
+    headers: Optional[List[str]] = None,
+    chunk_size: int = 200,
+    parameters: Optional[Dict[str, Any]] = None,
+    summary: Optional[Dict[str, Any]] = None,
+) -> Iterator[BatchChunk]:
+    """
+    Lazily splits rows of inputs into batch chunks.
+
+    Rows are pulled from the dataset (any iterable, e.g., a generator) one chunk at a
+    time, so that only a chunk worth of records is held in memory. All the chunks share
+    the same headers.
+    """
+    rows = iter(dataset)
+    headers = headers or next(rows, None)
     if not headers:
-        raise SparkError.sdk('missing headers for the input dataset', cause=dataset)
-
-    chunks = []
-    for i in range(batch_size):
-        start = i * chunk_size
-        end = min(start + chunk_size, length)
-        inputs = [headers] + dataset[start:end]
-        chunks.append(BatchChunk(get_uuid(), ChunkData(inputs, parameters or {}, summary), size=len(inputs) - 1))
-    return chunks
+        raise SparkError.sdk('missing headers for the input dataset', cause=headers)
+
+    chunk_size = max(1, chunk_size)
+    while True:
+        inputs = [headers]
+        inputs.extend(islice(rows, chunk_size))
+        if len(inputs) == 1:
+            return
+        yield BatchChunk(get_uuid(), ChunkData(inputs, parameters or {}, summary), size=len(inputs) - 1)
+
+
+def read_chunks(
+    path: Union[str, os.PathLike],
+    *,
+    format: Optional[str] = None,  # 'csv' | 'jsonl' | 'json' (inferred from the file extension by default)
+    headers: Optional[List[str]] = None,  # for files without headers
+    chunk_size: int = 200,
+    parameters: Optional[Dict[str, Any]] = None,
+    summary: Optional[Dict[str, Any]] = None,
+    encoding: str = 'utf-8',
+    json_codec: Optional[JsonCodec] = None,  # for JSON Lines files (the default codec otherwise)
+    **fmtparams: Any,
+) -> Iterator[BatchChunk]:
+    """
+    Lazily reads batch chunks from a CSV, JSON Lines or JSON array file.
+
+    The file is read as the chunks are consumed, which keeps the memory footprint bounded
+    regardless of its size. Records of JSON files are either arrays (headers first) or
+    objects whose keys make up the headers. Values of CSV files are read as strings;
+    `fmtparams` are passed on to the CSV reader.
+    """
+    fmt = (format or os.path.splitext(path)[1].lstrip('.')).lower()
+    if fmt == 'csv':
+        rows = _read_csv_rows(path, encoding, **fmtparams)
+    elif fmt in ('jsonl', 'ndjson'):
+        rows = _as_rows(_read_jsonl_records(path, encoding, json_codec), headers)
+    elif fmt == 'json':
+        rows = _as_rows(_read_json_records(path, encoding), headers)
+    else:
+        raise SparkError.sdk(f'unsupported file format <{fmt}>; use one of: csv, jsonl, json', path)
+
+    return iter_chunks(rows, headers=headers, chunk_size=chunk_size, parameters=parameters, summary=summary)
+
+
+def _read_csv_rows(path: Union[str, os.PathLike], encoding: str, **fmtparams: Any) -> Iterator[List[Any]]:
+    with open(path, encoding=encoding, newline='') as file:
+        yield from csv.reader(file, **fmtparams)
+
+
+def _read_jsonl_records(
+    path: Union[str, os.PathLike], encoding: str, json_codec: Optional[JsonCodec] = None
+) -> Iterator[Any]:
+    codec = get_json_codec(json_codec)
+    with open(path, encoding=encoding) as file:
+        for line in file:
+            if line.strip():
+                yield codec.loads(line)
+
+
+def _read_json_records(path: Union[str, os.PathLike], encoding: str, size: int = 1024 * 1024) -> Iterator[Any]:
+    """Decodes the items of a JSON array file one at a time without loading the whole file."""
+    decoder = json.JSONDecoder()
+    with open(path, encoding=encoding) as file:
+        buffer, pos, started, eof = '', 0, False, False
+        while True:
+            while pos < len(buffer) and (buffer[pos].isspace() or (started and buffer[pos] == ',')):
+                pos += 1
+
+            if pos < len(buffer):
+                if not started:
+                    if buffer[pos] != '[':
+                        raise SparkError.sdk(f'expecting a JSON array of records in <{path}>')
+                    started, pos = True, pos + 1
+                    continue
+                if buffer[pos] == ']':
+                    return
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                    if end < len(buffer) or eof:  # otherwise, the item may be truncated (e.g., numbers)
+                        yield item
+                        pos = end
+                        continue
+                except ValueError as err:
+                    if eof:
+                        raise SparkError.sdk(f'malformed JSON array in <{path}>', cause=err) from err
+
+            if eof:
+                raise SparkError.sdk(f'unexpected end of JSON array in <{path}>')
+            data = file.read(size)
+            buffer, pos, eof = buffer[pos:] + data, 0, not data
+
+
+def _as_rows(records: Iterable[Any], headers: Optional[List[str]] = None) -> Iterator[Any]:
+    """Yields rows of inputs out of arrays (as is) or objects (headers first unless given)."""
+    keys = headers
+    for record in records:
+        if not isinstance(record, dict):
+            yield record
+            continue
+        if keys is None:
+            keys = list(record)
+            yield keys
+        yield [record.get(key) for key in keys]
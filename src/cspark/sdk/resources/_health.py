@@ -4,6 +4,8 @@ __all__ = ['Health', 'Platform']
 
 
 class Health(ApiResource):
+    rate_class = 'health'
+
     def check(self):
         """Checks the health status or connectivity of a Spark environment."""
         return self.request(f'{self.config.base_url.value}/health', method='GET')
@@ -1,11 +1,12 @@
-import json
+import os
 import time
 from datetime import datetime
-from typing import List, Optional, Union, cast
+from typing import IO, List, Optional, Union, cast
 
+from .._constants import DOWNLOAD_CHUNK_SIZE
 from .._errors import RetryTimeoutError, SparkError
 from .._utils import DateUtils, StringUtils, get_retry_timeout, is_int
-from ._base import ApiResource, Uri, UriParams
+from ._base import ApiResource, Download, Uri, UriParams
 
 __all__ = ['History']
 
@@ -20,7 +21,7 @@ class History(ApiResource):
 
         response = self.request(url, method='GET')
         if isinstance(response.data, dict):
-            formatted = json.loads(response.data.get('response_data', '{}'))
+            formatted = self.config.json_codec.loads(response.data.get('response_data', '{}'))
             response = response.copy_with(data=formatted)
         return response
 
@@ -33,6 +34,36 @@ class History(ApiResource):
         service: Optional[str] = None,
         index: Optional[int] = None,
         legacy: bool = False,
+    ):
+        download_url, data = self.__rehydrate(uri, call_id, folder, service, index, legacy)
+        return self.request(download_url).copy_with(data=data)
+
+    def rehydrate_to(
+        self,
+        uri: Union[None, str, UriParams],
+        *,
+        call_id: str,
+        dest: Union[str, os.PathLike, IO[bytes]],
+        folder: Optional[str] = None,
+        service: Optional[str] = None,
+        index: Optional[int] = None,
+        legacy: bool = False,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+    ) -> Download:
+        """Streams the rehydrated Excel file to a file path or a binary file-like object."""
+        download_url, _ = self.__rehydrate(uri, call_id, folder, service, index, legacy)
+        file = self.request(download_url, stream=True)
+        return file.save(dest, chunk_size=chunk_size, checksum=checksum)
+
+    def __rehydrate(
+        self,
+        uri: Union[None, str, UriParams],
+        call_id: str,
+        folder: Optional[str],
+        service: Optional[str],
+        index: Optional[int],
+        legacy: bool,
     ):
         if StringUtils.is_empty(call_id):
             raise SparkError.sdk('call_id is required when rehydrating', {'call_id': call_id})
@@ -49,7 +80,7 @@ class History(ApiResource):
         else:
             raise SparkError('failed to produce a download URL', response)
 
-        return self.request(download_url).copy_with(data=response.data)
+        return download_url, response.data
 
     def download(
         self,
@@ -148,7 +179,7 @@ class LogDownload(ApiResource):
 
         response = self.request(url, method='POST', body=body)
         if isinstance(response.data, dict):
-            self.logger.info(f'{type} download job created <{response.data.get("response_data",{}).get("job_id")}>')
+            self.logger.info('%s download job created <%s>', type, response.data.get('response_data', {}).get('job_id'))
         return response
 
     def get_status(
@@ -176,11 +207,11 @@ class LogDownload(ApiResource):
             progress = response_data.get('progress', 0)
 
             if progress == 100:
-                self.logger.info(f'log download job completed <{job_id}>')
+                self.logger.info('log download job completed <%s>', job_id)
                 return response
 
             if progress < 100 and retries < max_retries:
-                self.logger.info(f'waiting for log download status job to complete - {progress}%')
+                self.logger.info('waiting for log download status job to complete - %s%%', progress)
 
                 retries += 1
                 time.sleep(get_retry_timeout(retries, retry_interval))
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
-import json
+import os
 import time
-from typing import BinaryIO, List, Mapping, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, BinaryIO, Callable, Dict, List, Mapping, Optional, Union
+from urllib.parse import unquote, urlparse
 
-from httpx import Client
+from httpx import Client, TransportError
 
 from .._config import Config
-from .._constants import SPARK_SDK
-from .._errors import RetryTimeoutError, SparkError
-from .._utils import get_retry_timeout
-from ._base import ApiResource, Uri, UriParams
+from .._constants import DOWNLOAD_CHUNK_SIZE, SPARK_SDK
+from .._errors import RetryTimeoutError, SparkApiError, SparkError
+from .._retry import RetryPolicy
+from .._utils import get_retry_timeout, get_uuid
+from ._base import ApiResource, Download, HttpResponse, Uri, UriParams
 
-__all__ = ['ImpEx', 'Export', 'Import', 'Migration', 'Wasm', 'Files']
+__all__ = ['ImpEx', 'Export', 'Import', 'Migration', 'Wasm', 'Files', 'DownloadReport']
+
+_SINGLE_ATTEMPT = RetryPolicy(max_retries=0)  # downloads are retried file by file instead
 
 
 class ImpEx:
@@ -106,7 +111,7 @@ class ImpEx:
         elif len(services) == 0:
             importer.logger.warning('import job completed without any services')
         else:
-            importer.logger.info(f'{len(services)} service(s) imported')
+            importer.logger.info('%s service(s) imported', len(services))
 
         return status
 
@@ -160,7 +165,7 @@ class Export(ApiResource):
         url = Uri.of(None, endpoint='export', **self.base_uri)
         response = self.request(url, method='POST', body={'inputs': inputs, **metadata})
         if isinstance(response.data, dict):
-            self.logger.info(f'export job created <{response.data["id"]}>')
+            self.logger.info('export job created <%s>', response.data['id'])
         return response
 
     def get_status(
@@ -184,11 +189,11 @@ class Export(ApiResource):
         while retries < max_retries:
             response = self.request(status_url)  # type: ignore
             if isinstance(response.data, dict) and response.data.get('status') in ['completed', 'closed']:
-                self.logger.info(f'export job <{job_id}> completed')
+                self.logger.info('export job <%s> completed', job_id)
                 return response
 
             retries += 1
-            self.logger.info(f'waiting for export job to complete (attempt {retries} of {max_retries})')
+            self.logger.info('waiting for export job to complete (attempt %s of %s)', retries, max_retries)
             delay = get_retry_timeout(retries, retry_interval)
             time.sleep(delay)
 
@@ -200,23 +205,123 @@ class Export(ApiResource):
         url = Uri.of(None, endpoint=f'export/{job_id}', **self.base_uri)
         response = self.request(url, method='PATCH', body={'export_status': 'cancelled'})
         if isinstance(response.data, dict):
-            self.logger.info(f'export job <${response.data["id"]}> has been cancelled')
+            self.logger.info('export job <%s> has been cancelled', response.data['id'])
         return response
 
-    def download(self, urls: Union[str, List[str]]):
-        downloads = []
+    def download(
+        self,
+        urls: Union[str, List[str]],
+        *,
+        workers: int = 4,
+        max_retries: Optional[int] = None,
+        retry_interval: Optional[float] = None,
+    ) -> 'DownloadReport':
+        """
+        Downloads the exported files concurrently using up to `workers` threads.
+
+        Each file failing transiently (network errors, rate limits or server errors) is retried
+        up to `max_retries` times with an exponential backoff, in place of the retry policy of
+        the client. The
+        successful downloads are returned in the order of their URLs, alongside the
+        failures (see `DownloadReport`).
+        """
+
+        def fetch(url: str) -> HttpResponse:
+            return self.request(url, retry=_SINGLE_ATTEMPT)
+
+        return self.__download_all(urls, fetch, workers, max_retries, retry_interval)
+
+    def download_to(
+        self,
+        urls: Union[str, List[str]],
+        directory: Union[str, os.PathLike],
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksums: Optional[Mapping[str, str]] = None,
+        workers: int = 4,
+        max_retries: Optional[int] = None,
+        retry_interval: Optional[float] = None,
+    ) -> 'DownloadReport':
+        """
+        Streams the exported files to the given directory without holding them in memory.
+
+        Files are named after the last segment of their download URLs (suffixed with -1, -2,
+        etc. when names clash) and never written outside of the directory; `checksums`
+        optionally maps those URLs to the expected digests of their files. See `download`
+        for the remaining options.
+        """
+        checksums = checksums or {}
+        os.makedirs(directory, exist_ok=True)
+        urls = list(dict.fromkeys(urls if isinstance(urls, list) else [urls]))  # each file is saved once
+        paths = _file_paths_of(urls, directory)
+
+        def save(url: str) -> Download:
+            dest = _assert_within(paths[url], directory)
+            response = self.request(url, stream=True, retry=_SINGLE_ATTEMPT)
+            return response.save(dest, chunk_size=chunk_size, checksum=checksums.get(url))
+
+        return self.__download_all(urls, save, workers, max_retries, retry_interval)
+
+    def __download_all(
+        self,
+        urls: Union[str, List[str]],
+        fetch: Callable[[str], Any],
+        workers: int,
+        max_retries: Optional[int],
+        retry_interval: Optional[float],
+    ) -> 'DownloadReport':
+        max_retries = self.config.max_retries if max_retries is None else max_retries
+        retry_interval = retry_interval or self.config.retry_interval
+
+        def download(url: str):
+            retries = 0
+            while True:
+                try:
+                    return fetch(url)
+                except Exception as cause:
+                    if retries >= max_retries or not _is_transient(cause):
+                        raise
+                    self.logger.debug('retrying download of <%s> due to: %s', url, cause)
+                    time.sleep(get_retry_timeout(retries, retry_interval))
+                    retries += 1
 
         urls = urls if isinstance(urls, list) else [urls]
-        for url in urls:
-            if not url:
-                self.logger.warning('skipping empty download url')
-                continue
-            try:
-                downloads.append(self.request(url))
-            except Exception as cause:
-                self.logger.warning(f'failed to download file <{url}>', cause)
+        report = DownloadReport()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = []
+            for url in urls:
+                if not url:
+                    self.logger.warning('skipping empty download url')
+                    continue
+                futures.append((url, executor.submit(download, url)))
+
+            for url, future in futures:
+                try:
+                    report.append(future.result())
+                except Exception as cause:
+                    self.logger.warning('failed to download file <%s>: %s', url, cause)
+                    report.failures[url] = cause
+
+        self.logger.info('%s', report)
+        return report
+
+
+class DownloadReport(list):
+    """
+    Lists the files successfully downloaded in the order of their URLs, and keeps track
+    of the ones that failed to download (URLs mapped to their last error).
+    """
+
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self.failures: Dict[str, Exception] = {}
+
+    def __str__(self) -> str:
+        return f'{len(self)} of {len(self) + len(self.failures)} file(s) downloaded ({len(self.failures)} failed)'
 
-        return downloads
+    @property
+    def ok(self) -> bool:
+        return len(self.failures) == 0
 
 
 class Import(ApiResource):
@@ -247,9 +352,10 @@ class Import(ApiResource):
         }
 
         url = Uri.of(None, endpoint='import', **self.base_uri)
-        response = self.request(url, method='POST', form={'importRequestEntity': json.dumps(metadata)}, files=files)
+        form = {'importRequestEntity': self.config.json_codec.dumps(metadata).decode('utf-8')}
+        response = self.request(url, method='POST', form=form, files=files)
         if isinstance(response.data, dict):
-            self.logger.info(f'import job created <{response.data["id"]}>')
+            self.logger.info('import job created <%s>', response.data['id'])
         return response
 
     def get_status(
@@ -273,11 +379,11 @@ class Import(ApiResource):
         while retries < max_retries:
             response = self.request(status_url)  # type: ignore
             if isinstance(response.data, dict) and response.data.get('status') in ['completed', 'closed']:
-                self.logger.info(f'import job <{job_id}> completed')
+                self.logger.info('import job <%s> completed', job_id)
                 return response
 
             retries += 1
-            self.logger.info(f'waiting for import job to complete (attempt {retries} of {max_retries})')
+            self.logger.info('waiting for import job to complete (attempt %s of %s)', retries, max_retries)
             delay = get_retry_timeout(retries, retry_interval)
             time.sleep(delay)
 
@@ -319,18 +425,91 @@ class Wasm(ApiResource):
             if uri is None
             else Uri.to_params(uri)
         )
+        return self.request(self._build_url(params))
+
+    def download_to(
+        self,
+        uri: Union[None, str, UriParams] = None,
+        *,
+        dest: Union[str, os.PathLike, IO[bytes]],
+        folder: Optional[str] = None,
+        service: Optional[str] = None,
+        service_id: Optional[str] = None,
+        version_id: Optional[str] = None,
+        public: Optional[bool] = False,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+    ) -> Download:
+        """Streams the WebAssembly module of a service to a file path or a binary file-like object."""
+        params = (
+            UriParams(folder, service, service_id, version_id=version_id, public=public)
+            if uri is None
+            else Uri.to_params(uri)
+        )
+        response = self.request(self._build_url(params), stream=True)
+        return response.save(dest, chunk_size=chunk_size, checksum=checksum)
+
+    def _build_url(self, params: UriParams) -> Uri:
         service_uri = Uri.validate(params).encode()
         endpoint = f'getnodegenzipbyId/{service_uri}'
         resource = 'nodegen' + ('/public' if params.public else '')
-        url = Uri.partial(resource, base_url=self.config.base_url.full, endpoint=endpoint)
-
-        return self.request(url)
+        return Uri.partial(resource, base_url=self.config.base_url.full, endpoint=endpoint)
 
 
 class Files(ApiResource):
     def download(self, url: str):
         return self.request(url)
 
+    def download_to(
+        self,
+        url: str,
+        dest: Union[str, os.PathLike, IO[bytes]],
+        *,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+    ) -> Download:
+        """Streams a Spark file to a file path or a binary file-like object."""
+        return self.request(url, stream=True).save(dest, chunk_size=chunk_size, checksum=checksum)
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Tells whether a failed download may succeed if retried (network errors, rate limits and server errors)."""
+    if isinstance(error, SparkApiError):
+        return error.status is not None and (error.status == 429 or error.status >= 500)
+    return isinstance(error, TransportError) or isinstance(error.__cause__, TransportError)
+
+
+def _file_name_of(url: str) -> str:
+    """Names a downloaded file after the last segment of its URL (never a path)."""
+    path = unquote(urlparse(url).path).replace('\\', '/').rstrip('/')
+    name = os.path.basename(path)
+    return name if name not in ('', '.', '..') else f'export-{get_uuid()}.zip'
+
+
+def _file_paths_of(urls: List[str], directory: Union[str, os.PathLike]) -> Dict[str, str]:
+    """Maps download URLs to distinct file paths (suffixed with -1, -2, etc. if needed) within a directory."""
+    paths: Dict[str, str] = {}
+    taken = set()
+    for url in urls:
+        if not url or url in paths:
+            continue
+        stem, ext = os.path.splitext(_file_name_of(url))
+        name, count = stem + ext, 0
+        while name.lower() in taken:
+            count += 1
+            name = f'{stem}-{count}{ext}'
+        taken.add(name.lower())
+        paths[url] = os.path.join(directory, name)
+    return paths
+
+
+def _assert_within(path: str, directory: Union[str, os.PathLike]) -> str:
+    """Makes sure that a file path resolves to a location within the given directory."""
+    root = os.path.realpath(directory)
+    if os.path.dirname(os.path.realpath(path)) != root:
+        raise SparkError.sdk(f'file path <{path}> resolves outside of <{root}>', path)
+    return path
+
 
 def _build_service_mappings(
     uri: Union[str, List[str], Mapping[str, str], List[Mapping[str, str]]], upgrade_type: str = 'minor'
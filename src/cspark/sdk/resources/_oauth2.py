@@ -1,12 +1,17 @@
 from dataclasses import dataclass
 from typing import Any, Union
 
+from httpx import Request
+
 from ._base import ApiResource, Uri
 
 __all__ = ['OAuth2', 'AccessToken']
 
 
 class OAuth2(ApiResource):
+    def _authorize(self, request: Request, *, renew: bool = False) -> bool:  # noqa: ARG002
+        return False  # client credentials are sent as part of the form data
+
     def gen_access_token(self):
         url = Uri.of(base_url=self.config.base_url.oauth2, version='protocol', endpoint='openid-connect/token')
         body = {**self.config.auth.oauth.to_dict(), 'grant_type': self.config.auth.oauth.flow}  # type: ignore
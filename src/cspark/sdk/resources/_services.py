@@ -1,17 +1,25 @@
 import gzip
 import json
+import threading
 import time
 import zlib
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Tuple, Union
+from itertools import chain, islice
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
 
+from httpx import Request, Response
+
+from .._cache import ResultCache
+from .._codec import JsonCodec, get_json_codec
 from .._constants import SPARK_SDK
-from .._errors import RetryTimeoutError, SparkError
-from .._utils import DateUtils, StringUtils, get_retry_timeout
+from .._errors import RetryTimeoutError, SparkApiError, SparkError
+from .._utils import DateUtils, StringUtils, get_retry_timeout, import_optional_module
 from ._base import ApiResource, HttpResponse, Uri, UriParams
 from ._transforms import TransformParams
 
-__all__ = ['Services', 'ServiceExecuted']
+__all__ = ['Services', 'ServiceExecuted', 'ChunkSizer']
 
 
 class Services(ApiResource):
@@ -149,7 +157,8 @@ class Services(ApiResource):
         response = self.request(url, method='POST', body={'request_data': params})
         version_id = isinstance(response.data, dict) and response.data.get('response_data', {}).get('version_id')
         if version_id:
-            self.logger.info(f'service published with version id <{version_id}>')
+            self.logger.info('service published with version id <%s>', version_id)
+        self.__invalidate(uri)
         return response
 
     def execute(
@@ -159,7 +168,7 @@ class Services(ApiResource):
         response_format: Optional[str] = None,
         encoding: Optional[str] = None,  # 'gzip' | 'deflate'
         # data for calculations
-        inputs: Union[None, str, Dict[str, Any], List[Any]] = None,  # TODO: support `pandas.DataFrame`
+        inputs: Union[None, str, Dict[str, Any], List[Any], Any] = None,  # also `pandas.DataFrame`, `pyarrow.Table`
         # Metadata for calculations
         active_since: Optional[str] = None,
         source_system: Optional[str] = None,
@@ -179,7 +188,7 @@ class Services(ApiResource):
     ):
         uri = Uri.validate(uri)
 
-        executable = _ExecuteInputs(inputs)
+        executable = _ExecuteInputs(inputs, self.config.json_codec)
         metadata = _ExecuteMeta(
             uri,
             is_batch=executable.is_batch,
@@ -206,13 +215,111 @@ class Services(ApiResource):
             url = Uri.of(uri, base_url=self.config.base_url.full, endpoint=endpoint)
             body = {'request_data': {'inputs': executable.inputs}, 'request_meta': metadata.values}
 
+        cache = self.config.result_cache
+        cache_key = _result_cache_key(uri, url, executable.inputs, metadata) if cache is not None else None
+        cached = cache.get(cache_key) if cache is not None and cache_key else None
+        if cached is not None:
+            self.logger.debug('using cached result for <%s>', url)
+            request = self._client.build_request('POST', str(url))  # never sent, so its body is left out
+            response = _cached_response(request, cached, self.config.json_codec.loads)
+            return ServiceExecuted(response, executable.is_batch, response_format or 'alike')
+
         if encoding:
             content, headers = self.__encode(data=body, encoding=encoding)
-            response = self.request(url, method='POST', content=content, headers=headers)
+            response = self.request(
+                url, method='POST', content=content, headers=headers, idempotent=True, rate_class='execute'
+            )
         else:
-            response = self.request(url, method='POST', body=body)
+            response = self.request(url, method='POST', body=body, idempotent=True, rate_class='execute')
+
+        if cache is not None and cache_key:
+            cache.set(cache_key, response.buffer)
         return ServiceExecuted(response, executable.is_batch, response_format or 'alike')
 
+    def execute_many(
+        self,
+        uri: Union[str, UriParams],
+        records: Iterable[Any],
+        *,
+        chunk_size: Union[int, 'ChunkSizer'] = 200,
+        concurrency: int = 4,
+        **options: Any,
+    ) -> List['ServiceExecuted']:
+        """
+        Executes a service against a large dataset using concurrent sync batch requests.
+
+        The records are split into chunks of `chunk_size` and each chunk is sent to the
+        v4 execute endpoint with at most `concurrency` requests in flight at a time.
+        The results are returned in the same order as the input chunks. Other `options`
+        (e.g., `encoding`, `call_purpose`, `selected_outputs`) are passed on to `execute`.
+
+        Use a `ChunkSizer` as `chunk_size` to let the SDK tune the chunk size on the fly. In
+        that case, a chunk rejected for being too large (HTTP 413) is split at a smaller size
+        and resubmitted; its results are returned in place of the original chunk.
+        """
+        return list(self.stream_many(uri, records, chunk_size=chunk_size, concurrency=concurrency, **options))
+
+    def stream_many(
+        self,
+        uri: Union[str, UriParams],
+        records: Iterable[Any],
+        *,
+        chunk_size: Union[int, 'ChunkSizer'] = 200,
+        concurrency: int = 4,
+        ordered: bool = True,
+        **options: Any,
+    ) -> Iterator['ServiceExecuted']:
+        """
+        Same as `execute_many` but yields the result of each chunk as soon as it is available.
+
+        The records are consumed lazily (any iterable will do) and no more than `concurrency`
+        chunks are held in memory at once. When `ordered` is false, results are yielded in
+        completion order instead of input order.
+        """
+        uri = Uri.validate(uri)
+        concurrency = max(1, concurrency)
+        self.logger.info('executing %s records per chunk with up to %s concurrent requests', chunk_size, concurrency)
+
+        def run(inputs: List[Any]) -> List[ServiceExecuted]:
+            start = time.monotonic()
+            try:
+                result = self.execute(uri, inputs=inputs, **options)
+            except SparkApiError as error:
+                size = _split_size_of(error, inputs, chunk_size)
+                if size <= 0:
+                    raise
+                self.logger.warning(
+                    'chunk of %s records is too large; resubmitting by %s', _count_records(inputs), size
+                )
+                return [result for part in _iter_chunks(inputs, size) for result in run(part)]
+
+            if isinstance(chunk_size, ChunkSizer):
+                chunk_size.observe(result, records=_count_records(inputs), elapsed=time.monotonic() - start)
+            return [result]
+
+        def submit(inputs: List[Any]) -> 'Future[List[ServiceExecuted]]':
+            return executor.submit(run, inputs)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            if ordered:
+                queue: Deque['Future[List[ServiceExecuted]]'] = deque()
+                for inputs in _iter_chunks(records, chunk_size):
+                    queue.append(submit(inputs))
+                    if len(queue) >= concurrency:
+                        yield from queue.popleft().result()
+                while queue:
+                    yield from queue.popleft().result()
+            else:
+                pending: Set['Future[List[ServiceExecuted]]'] = set()
+                for inputs in _iter_chunks(records, chunk_size):
+                    pending.add(submit(inputs))
+                    if len(pending) >= concurrency:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        yield from (result for future in done for result in future.result())
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from (result for future in done for result in future.result())
+
     def transform(
         self,
         uri: Union[str, UriParams],
@@ -271,9 +378,13 @@ class Services(ApiResource):
 
         if encoding:
             content, headers = self.__encode(data=inputs or {}, encoding=encoding, extras=metadata.as_header)
-            response = self.request(url, method='POST', content=content, headers=headers)
+            response = self.request(
+                url, method='POST', content=content, headers=headers, idempotent=True, rate_class='execute'
+            )
         else:
-            response = self.request(url, method='POST', body=inputs or {}, headers=metadata.as_header)
+            response = self.request(
+                url, method='POST', body=inputs or {}, headers=metadata.as_header, idempotent=True, rate_class='execute'
+            )
         return response
 
     def validate(
@@ -303,7 +414,7 @@ class Services(ApiResource):
         uri = Uri.validate(uri)
         validation_type = StringUtils.is_not_empty(validation_type) and str(validation_type).lower() or None
 
-        executable = _ExecuteInputs(inputs)
+        executable = _ExecuteInputs(inputs, self.config.json_codec)
         metadata = _ExecuteMeta(
             uri,
             is_batch=False,
@@ -330,7 +441,7 @@ class Services(ApiResource):
             },
         }
 
-        return self.request(url, method='POST', body=body)
+        return self.request(url, method='POST', body=body, idempotent=True, rate_class='execute')
 
     def get_schema(
         self,
@@ -344,10 +455,10 @@ class Services(ApiResource):
         base, folder, service = self.config.base_url, uri.folder, uri.service
         if StringUtils.is_not_empty(uri.version_id):
             url = Uri.partial(f'GetEngineDetailByVersionId/versionid/{uri.version_id}', base_url=base.full)
-            return self.request(url, method='POST')
+            return self.__cached(uri, url, lambda: self.request(url, method='POST'))
         else:
             url = Uri.of(base_url=base.value, version='api/v1', endpoint=f'product/{folder}/engines/get/{service}')
-            return self.request(url, method='GET')
+            return self.__cached(uri, url, lambda: self.request(url, method='GET'))
 
     def get_metadata(
         self,
@@ -363,8 +474,7 @@ class Services(ApiResource):
         uri = Uri.validate(uri or UriParams(folder, service, service_id, None, version_id, proxy, public))
         url = Uri.of(uri, base_url=self.config.base_url.full, endpoint='metadata')
 
-        response = self.request(url)
-        return ServiceExecuted(response, False, 'original')
+        return self.__cached(uri, url, lambda: ServiceExecuted(self.request(url), False, 'original'))
 
     def get_versions(
         self, uri: Union[None, str, UriParams] = None, *, folder: Optional[str] = None, service: Optional[str] = None
@@ -373,8 +483,11 @@ class Services(ApiResource):
         endpoint = f'product/{uri.folder}/engines/getversions/{uri.service}'
         url = Uri.of(base_url=self.config.base_url.value, version='api/v1', endpoint=endpoint)
 
-        response = self.request(url)
-        return response.copy_with(data=response.data.get('data', []) if isinstance(response.data, dict) else [])
+        def fetch() -> HttpResponse:
+            response = self.request(url)
+            return response.copy_with(data=response.data.get('data', []) if isinstance(response.data, dict) else [])
+
+        return self.__cached(uri, url, fetch)
 
     def get_swagger(
         self,
@@ -390,7 +503,7 @@ class Services(ApiResource):
         endpoint = f'downloadswagger/{subservice}/{downloadable}/{version_id or ""}'
         url = Uri.of(uri, base_url=self.config.base_url.full, endpoint=endpoint)
 
-        return self.request(url, method='GET')
+        return self.__cached(uri, url, lambda: self.request(url, method='GET'))
 
     def search(
         self,
@@ -460,7 +573,9 @@ class Services(ApiResource):
             'tags': StringUtils.join(tags),
         }
 
-        return self.request(url, method='POST', body={'request_data': data})
+        response = self.request(url, method='POST', body={'request_data': data})
+        self.__invalidate(uri)
+        return response
 
     def delete(
         self, uri: Union[None, str, UriParams] = None, *, folder: Optional[str] = None, service: Optional[str] = None
@@ -469,7 +584,9 @@ class Services(ApiResource):
         endpoint = f'product/{uri.folder}/engines/delete/{uri.service}'
         url = Uri.of(base_url=self.config.base_url.value, version='api/v1', endpoint=endpoint)
 
-        return self.request(url, method='DELETE')
+        response = self.request(url, method='DELETE')
+        self.__invalidate(uri)
+        return response
 
     def check_existence(
         self,
@@ -481,7 +598,24 @@ class Services(ApiResource):
         uri = Uri.validate(uri or UriParams(folder, service))
         url = Uri.of(uri, base_url=self.config.base_url.full, endpoint='exists')
 
-        return self.request(url)
+        return self.__cached(uri, url, lambda: self.request(url))
+
+    def __cached(self, uri: UriParams, url: Uri, fetch: Callable[[], Any]) -> Any:
+        """Returns the response of a read-mostly endpoint from the metadata cache (if any)."""
+        cache = self.config.metadata_cache
+        if cache is None:
+            return fetch()
+
+        scope, key = _metadata_scope(uri), str(url)
+        response = cache.get(scope, key)
+        if response is None:
+            response = fetch()
+            cache.set(scope, key, response)
+        return response
+
+    def __invalidate(self, uri: UriParams) -> None:
+        if self.config.metadata_cache is not None:
+            self.config.metadata_cache.invalidate(_metadata_scope(uri))
 
     def __encode(
         self,
@@ -493,9 +627,9 @@ class Services(ApiResource):
     ) -> Tuple[bytes, Dict[str, str]]:
         headers = {'Content-Type': content_type, 'Content-Encoding': encoding, 'Accept-Encoding': encoding, **extras}
         if encoding == 'gzip':
-            return gzip.compress(json.dumps(data).encode('utf-8')), headers
+            return gzip.compress(self.config.json_codec.dumps(data)), headers
         if encoding == 'deflate':
-            return zlib.compress(json.dumps(data).encode('utf-8')), headers
+            return zlib.compress(self.config.json_codec.dumps(data)), headers
         else:
             raise SparkError.sdk(f'encoding "{encoding}" is not supported', {'encoding': encoding})
 
@@ -525,13 +659,221 @@ class ServiceExecuted(HttpResponse):
             response.status, data, response.buffer, response.headers, response.raw_request, response.raw_response
         )
 
+    def outputs_as_frame(self, library: str = 'pandas') -> Any:
+        """
+        Builds a data frame out of the outputs, one row per record and one column per output.
+
+        Columns are built directly from the outputs (no intermediate frames or records).
+        Use `library='pyarrow'` to get a `pyarrow.Table` instead of a `pandas.DataFrame`.
+        """
+        outputs = self.data.get('outputs') if isinstance(self.data, dict) else None
+        columns = _columns_of(outputs or [])
+        if library == 'pandas':
+            return import_optional_module('pandas').DataFrame(columns)
+        if library == 'pyarrow':
+            return import_optional_module('pyarrow').table(columns)
+        raise SparkError.sdk(f'unsupported data frame library <{library}>; use one of: pandas, pyarrow', library)
+
+
+def _iter_chunks(records: Iterable[Any], chunk_size: Union[int, 'ChunkSizer']) -> Iterator[List[Any]]:
+    """
+    Lazily splits records into sync batch inputs, repeating the header row if in columnar format.
+    When a `ChunkSizer` is given, its current size is read every time a new chunk is created.
+    """
+    if isinstance(records, (str, bytes, Mapping)):
+        raise SparkError.sdk('records must be an iterable of inputs', records)
+    records = _as_columnar(records) or records
+
+    iterator = iter(records)
+    first = next(iterator, None)
+    if first is None:
+        raise SparkError.sdk('records must be a non-empty iterable of inputs', records)
+
+    headers = first if isinstance(first, list) else None
+    if headers is None:
+        iterator = chain([first], iterator)
+
+    while True:
+        size = chunk_size.size if isinstance(chunk_size, ChunkSizer) else max(1, chunk_size)
+        rows = list(islice(iterator, size))
+        if not rows:
+            return
+        yield rows if headers is None else [headers] + rows
+
+
+def _as_columnar(data: Any) -> Optional[List[Any]]:
+    """
+    Converts a `pandas.DataFrame` or a `pyarrow.Table` into rows of inputs (headers first),
+    column by column; returns None for any other type of data.
+    """
+    module = type(data).__module__.split('.')[0]
+    if module == 'pandas' and hasattr(data, 'columns'):
+        headers = [str(name) for name in data.columns]
+        columns = [_pandas_values(data.iloc[:, i]) for i in range(len(headers))]
+    elif module == 'pyarrow' and hasattr(data, 'column_names'):
+        headers = list(data.column_names)
+        columns = [column.to_pylist() for column in data.columns]
+    else:
+        return None
+    return [headers, *map(list, zip(*columns))]
+
+
+def _pandas_values(series: Any) -> List[Any]:
+    values = series.tolist()
+    if series.dtype.kind in 'mM':  # datetimes and durations
+        values = [None if value is None or value != value else value.isoformat() for value in values]
+    elif series.hasnans:
+        values = [None if isnan else value for value, isnan in zip(values, series.isna().tolist())]
+    return values
+
+
+def _columns_of(outputs: List[Any]) -> Dict[str, List[Any]]:
+    """Turns outputs (records or rows with headers first) into columns of values."""
+    if outputs and isinstance(outputs[0], list):
+        headers, rows = outputs[0], outputs[1:]
+        return {str(name): [row[i] if i < len(row) else None for row in rows] for i, name in enumerate(headers)}
+
+    records = [output if isinstance(output, dict) else {} for output in outputs]
+    keys = dict.fromkeys(key for record in records for key in record)  # preserves the order of appearance
+    return {key: [record.get(key) for record in records] for key in keys}
+
+
+def _result_cache_key(uri: UriParams, url: Uri, inputs: Any, metadata: '_ExecuteMeta') -> Optional[str]:
+    """
+    Builds the key of an execution in the result cache, or returns None if its result may
+    differ from one call to the next (e.g., unpinned service versions or downloadable files).
+
+    The `call_purpose`, `source_system` and `correlation_id` are left out of the key since
+    they only tag a call and have no effect on its outputs. As a result, a cached response
+    is returned as it was first received, along with the `response_meta` (if any) echoing
+    the tags of the call that was actually made.
+    """
+    values = metadata.values
+    if not (uri.version_id or uri.version) or values.get('excel_file') or values.get('debug_solve'):
+        return None
+    values = {k: v for k, v in values.items() if k not in ('call_purpose', 'source_system', 'correlation_id')}
+    return ResultCache.key_of(str(url), inputs, values)
+
+
+def _metadata_scope(uri: UriParams) -> str:
+    """Tells which service the cached metadata belongs to ('folder/service' if known)."""
+    if uri.folder and uri.service:
+        return f'{uri.folder}/{uri.service}'.lower()
+    return uri.service_id or uri.version_id or ''
+
+
+def _cached_response(request: Request, content: bytes, decoder: Callable[[bytes], Any]) -> HttpResponse:
+    """Wraps cached response bytes as they are (decoded only on demand)."""
+    response = Response(200, headers={'content-type': 'application/json'}, content=content, request=request)
+    return HttpResponse(200, None, content, response.headers, request, response, decoder=decoder)
+
+
+def _count_records(inputs: List[Any]) -> int:
+    return len(inputs) - 1 if inputs and isinstance(inputs[0], list) else len(inputs)
+
+
+def _split_size_of(error: SparkApiError, inputs: List[Any], chunk_size: Union[int, 'ChunkSizer']) -> int:
+    """
+    Tells how many records per chunk to resubmit a chunk rejected for being too large (HTTP 413)
+    with, shrinking the chunk sizer on the way; returns 0 if the chunk should not be split.
+    """
+    records = _count_records(inputs)
+    if error.status != 413 or not isinstance(chunk_size, ChunkSizer) or records <= 1:
+        return 0
+    return min(chunk_size.shrink(), records // 2)  # always splits, even if the sizer was already shrunk
+
+
+class ChunkSizer:
+    """
+    Tunes the number of records per sync batch request based on observed executions.
+
+    Starting from `initial`, every completed request moves the chunk size towards the
+    number of records that Spark can process within `target_latency` (in seconds), using
+    the measured round-trip time and the `process_time` reported by the API. The size is
+    also capped so that request bodies stay below `max_body_size` (in bytes). It never
+    changes by more than a factor of 2 at once and stays within `min_size` and `max_size`.
+    """
+
+    def __init__(
+        self,
+        initial: int = 20,
+        *,
+        target_latency: float = 5.0,
+        max_body_size: int = 5_000_000,
+        min_size: int = 1,
+        max_size: int = 1000,
+    ):
+        self._min_size = max(1, min_size)
+        self._max_size = max(self._min_size, max_size)
+        self._size = min(max(initial, self._min_size), self._max_size)
+        self._target_latency = target_latency
+        self._max_body_size = max_body_size
+        self._lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return str(self._size)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def observe(self, result: 'ServiceExecuted', *, records: int, elapsed: float) -> int:
+        """Updates the chunk size from an executed chunk and its round-trip time (in seconds)."""
+        data = result.data if isinstance(result.data, dict) else {}
+        times = data.get('process_time') or []  # in milliseconds
+        process_time = sum(t for t in times if isinstance(t, (int, float))) / 1000 if isinstance(times, list) else 0
+        return self.update(
+            records=records,
+            elapsed=elapsed,
+            process_time=process_time,
+            body_size=len(result.raw_request.content),
+        )
+
+    def update(
+        self,
+        *,
+        records: int,
+        elapsed: float,
+        process_time: Optional[float] = None,
+        body_size: Optional[int] = None,
+    ) -> int:
+        """Updates the chunk size from raw measurements (time in seconds and body size in bytes)."""
+        if records <= 0 or elapsed <= 0:
+            return self._size
+
+        compute = min(process_time or 0, elapsed)
+        overhead = elapsed - compute  # network and queuing time, regardless of the chunk size
+        if compute <= 0:
+            compute, overhead = elapsed, 0.0
+
+        per_record = compute / records
+        optimal = max(self._target_latency - overhead, per_record) / per_record
+        if body_size:
+            optimal = min(optimal, self._max_body_size * records / body_size)
+
+        with self._lock:
+            optimal = min(max(optimal, self._size / 2), self._size * 2)
+            self._size = int(min(max(optimal, self._min_size), self._max_size))
+            return self._size
+
+    def shrink(self) -> int:
+        """Halves the chunk size (e.g., after a request was rejected for being too large)."""
+        with self._lock:
+            self._size = max(self._size // 2, self._min_size)
+            return self._size
+
 
 class _ExecuteInputs:
-    def __init__(self, data: Union[None, str, Dict[str, Any], List[Any]] = None):
+    def __init__(
+        self,
+        data: Union[None, str, Dict[str, Any], List[Any], Any] = None,
+        json_codec: Optional[JsonCodec] = None,
+    ):
+        data = _as_columnar(data) or data
         if data is None or (isinstance(data, list) and len(data) == 0):
             data = {}
         if StringUtils.is_not_empty(data):
-            data = json.loads(str(data))
+            data = get_json_codec(json_codec).loads(str(data))
 
         self.inputs = data
         if isinstance(data, dict):
@@ -541,7 +883,10 @@ class _ExecuteInputs:
             self.length = len(data)
             self.is_batch = True
         else:
-            message = 'invalid data format\nexpected input data formats are string, dict or a list'
+            message = (
+                'invalid data format\nexpected input data formats are string, dict, list, '
+                'pandas.DataFrame or pyarrow.Table'
+            )
             raise SparkError.sdk(message, data)
 
 
@@ -642,7 +987,8 @@ class _ExecuteMeta:
     @property
     def as_header(self) -> Dict[str, str]:
         # NOTE: this has to be a single line string: "'{\"call_purpose\":\"Single Execution\"}'"
-        value = json.dumps(self.values, separators=(',', ':'))
+        # HTTP header values must be ASCII-only, hence not encoded by the pluggable JSON codec.
+        value = json.dumps(self.values, separators=(',', ':'), ensure_ascii=True)
         return {'x-meta' if self._is_batch else 'x-request-meta': "'{}'".format(value)}
 
 
@@ -670,13 +1016,13 @@ class Compilation(ApiResource):
                 **(extras or {}),
             },
         }
-        form = {'engineUploadRequestEntity': json.dumps(metadata)}
+        form = {'engineUploadRequestEntity': self.config.json_codec.dumps(metadata).decode('utf-8')}
         files = {'serviceFile': (file_name or f'{uri.service}.xlsx', file)}
 
         response = self.request(url, method='POST', form=form, files=files)
         if isinstance(response.data, dict) and response.data.get('response_data'):
             doc_id = response.data.get('response_data', {}).get('original_file_documentid')
-            self.logger.info(f'service file uploaded <{doc_id}>')
+            self.logger.info('service file uploaded <%s>', doc_id)
         return response
 
     def get_status(
@@ -705,7 +1051,7 @@ class Compilation(ApiResource):
                 return response
 
             if progress < 100 and retries < max_retries:
-                self.logger.info(f'waiting for compilation job to complete - {progress}%')
+                self.logger.info('waiting for compilation job to complete - %s%%', progress)
 
                 retries += 1
                 time.sleep(get_retry_timeout(retries, retry_interval))
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from json import dumps, loads
 from typing import Any, List, Mapping, Optional, Union
 
+from .._codec import JsonCodec, get_json_codec
 from .._errors import SparkError
 from .._validators import Validators
 from ._base import ApiResource, Uri
@@ -55,7 +55,7 @@ class Transforms(ApiResource):
 
     def validate(self, transform: Union[str, Transform]):
         url = Uri.of(None, endpoint=f'transform/validation', **self.base_uri)
-        body = {'transform_content': build_transform(transform)}
+        body = {'transform_content': build_transform(transform, self.config.json_codec)}
 
         return self.request(url, method='POST', body=body)
 
@@ -67,7 +67,7 @@ class Transforms(ApiResource):
 
     def save(self, *, folder: str, name: str, transform: Union[str, Transform]):
         url = Uri.of(None, endpoint=f'transform/{folder}/{name}', **self.base_uri)
-        body = {'transform_content': build_transform(transform)}
+        body = {'transform_content': build_transform(transform, self.config.json_codec)}
 
         return self.request(url, method='POST', body=body)
 
@@ -78,14 +78,15 @@ class Transforms(ApiResource):
         return self.request(url, method='DELETE')
 
 
-def build_transform(value: Union[str, Transform]) -> str:
-    value = Transform(**loads(value)) if isinstance(value, str) else value
+def build_transform(value: Union[str, Transform], json_codec: Optional[JsonCodec] = None) -> str:
+    codec = get_json_codec(json_codec)
+    value = Transform(**codec.loads(value)) if isinstance(value, str) else value
     extras = value.extras or {}
 
     if value.schema and 'nodejs22' in value.schema.lower():
-        return dumps({'transform_type': value.schema, 'transform_code': value.inputs, **extras})
+        return codec.dumps({'transform_type': value.schema, 'transform_code': value.inputs, **extras}).decode('utf-8')
 
-    transform = dumps(
+    transform = codec.dumps(
         {
             'transform_type': value.schema or 'JSONtransforms_v1.0.1',
             'target_api_version': value.api_version or 'v3',
@@ -93,7 +94,7 @@ def build_transform(value: Union[str, Transform]) -> str:
             'output_body_transform': value.outputs,
             **extras,
         }
-    )
+    ).decode('utf-8')
     Validators.transform().validate(transform)
 
     return transform
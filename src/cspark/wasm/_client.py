@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from types import TracebackType
-from typing import Any, Mapping, Optional, Union
+from typing import Any, Callable, Dict, Mapping, Optional, TypeVar, Union
 
 import cspark.wasm.resources as API
-from cspark.sdk import BaseUrl, LoggerOptions
+from cspark.sdk import BaseUrl, CircuitBreaker, HttpOptions, JsonCodec, LoggerOptions, RateLimiter, RetryPolicy
 from httpx import AsyncClient as AsyncHttpClient
 from httpx import Client as HttpClient
 
@@ -12,6 +12,8 @@ from ._config import Config, RunnerUrl
 
 __all__ = ['Client', 'AsyncClient']
 
+T = TypeVar('T')
+
 
 class Client:
     """
@@ -34,6 +36,11 @@ class Client:
         retry_interval: Optional[float] = None,
         http_client: Optional[HttpClient] = None,
         logger: Union[bool, Mapping[str, Any], LoggerOptions] = True,
+        json_codec: Union[None, str, JsonCodec] = None,
+        http: Union[None, Mapping[str, Any], HttpOptions] = None,
+        retry: Union[None, Mapping[str, Any], RetryPolicy] = None,
+        rate_limit: Union[None, float, RateLimiter, Mapping[str, Union[float, RateLimiter]]] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
     ) -> None:
         self._config = Config(
             base_url=base_url if isinstance(base_url, BaseUrl) else RunnerUrl.of(url=base_url, tenant=tenant),
@@ -43,8 +50,14 @@ class Client:
             max_retries=max_retries,
             retry_interval=retry_interval,
             logger=logger,
+            json_codec=json_codec,
+            http=http,
+            retry=retry,
+            rate_limit=rate_limit,
+            circuit_breaker=circuit_breaker,
         )
-        self.http_client = http_client or HttpClient(timeout=self._config.timeout_in_sec)
+        self.http_client = http_client or self._config.http.client(self._config.timeout)
+        self._resources: Dict[Any, Any] = {}  # created once and reused
 
     def __enter__(self) -> Client:
         return self
@@ -65,21 +78,28 @@ class Client:
     def config(self) -> Config:
         return self._config
 
+    def __resource(self, factory: Callable[[Config, HttpClient], T]) -> T:
+        """Returns the resource built by `factory`, created once per HTTP client."""
+        resource = self._resources.get(factory)
+        if resource is None or resource._client is not self.http_client:
+            resource = self._resources[factory] = factory(self.config, self.http_client)
+        return resource
+
     @property
     def version(self) -> API.Version:
-        return API.Version(self.config, self.http_client)
+        return self.__resource(API.Version)
 
     @property
     def health(self) -> API.Health:
-        return API.Health(self.config, self.http_client)
+        return self.__resource(API.Health)
 
     @property
     def status(self) -> API.Status:
-        return API.Status(self.config, self.http_client)
+        return self.__resource(API.Status)
 
     @property
     def services(self) -> API.Services:
-        return API.Services(self.config, self.http_client)
+        return self.__resource(API.Services)
 
     @staticmethod
     def use(config: Config, http_client: Optional[HttpClient] = None) -> 'Client':
@@ -92,6 +112,11 @@ class Client:
             max_retries=config.max_retries,
             retry_interval=config.retry_interval,
             logger=config.logger,
+            json_codec=config.json_codec,
+            http=config.http,
+            retry=config.retry,
+            rate_limit=config.rate_limit,
+            circuit_breaker=config.circuit_breaker,
             http_client=http_client,
         )
 
@@ -100,7 +125,7 @@ class Client:
         base_url: Optional[str] = None, token: str = 'open', http_client: Optional[HttpClient] = None, **options: Any
     ):
         config = Config(base_url=RunnerUrl.no_tenant(base_url or ''), token=token, **options)
-        with http_client or HttpClient(timeout=config.timeout_in_sec) as client:
+        with http_client or config.http.client(config.timeout) as client:
             return API.Health(config, client).check()
 
     @staticmethod
@@ -108,7 +133,7 @@ class Client:
         base_url: Optional[str] = None, token: str = 'open', http_client: Optional[HttpClient] = None, **options: Any
     ):
         config = Config(base_url=RunnerUrl.no_tenant(base_url or ''), token=token, **options)
-        with http_client or HttpClient(timeout=config.timeout_in_sec) as client:
+        with http_client or config.http.client(config.timeout) as client:
             return API.Version(config, client).get()
 
     @staticmethod
@@ -116,7 +141,7 @@ class Client:
         base_url: Optional[str] = None, token: str = 'open', http_client: Optional[HttpClient] = None, **options: Any
     ):
         config = Config(base_url=RunnerUrl.no_tenant(base_url or ''), token=token, **options)
-        with http_client or HttpClient(timeout=config.timeout_in_sec) as client:
+        with http_client or config.http.client(config.timeout) as client:
             return API.Status(config, client).get()
 
 
@@ -141,6 +166,11 @@ class AsyncClient:
         retry_interval: Optional[float] = None,
         http_client: Optional[AsyncHttpClient] = None,
         logger: Union[bool, Mapping[str, Any], LoggerOptions] = True,
+        json_codec: Union[None, str, JsonCodec] = None,
+        http: Union[None, Mapping[str, Any], HttpOptions] = None,
+        retry: Union[None, Mapping[str, Any], RetryPolicy] = None,
+        rate_limit: Union[None, float, RateLimiter, Mapping[str, Union[float, RateLimiter]]] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
     ) -> None:
         self._config = Config(
             base_url=base_url if isinstance(base_url, BaseUrl) else RunnerUrl.of(url=base_url, tenant=tenant),
@@ -150,8 +180,14 @@ class AsyncClient:
             max_retries=max_retries,
             retry_interval=retry_interval,
             logger=logger,
+            json_codec=json_codec,
+            http=http,
+            retry=retry,
+            rate_limit=rate_limit,
+            circuit_breaker=circuit_breaker,
         )
-        self.http_client = http_client or AsyncHttpClient(timeout=self._config.timeout_in_sec)
+        self.http_client = http_client or self._config.http.async_client(self._config.timeout)
+        self._resources: Dict[Any, Any] = {}  # created once and reused
 
     async def __aenter__(self) -> AsyncClient:
         return self
@@ -172,21 +208,28 @@ class AsyncClient:
     def config(self) -> Config:
         return self._config
 
+    def __resource(self, factory: Callable[[Config, AsyncHttpClient], T]) -> T:
+        """Returns the resource built by `factory`, created once per HTTP client."""
+        resource = self._resources.get(factory)
+        if resource is None or resource._client is not self.http_client:
+            resource = self._resources[factory] = factory(self.config, self.http_client)
+        return resource
+
     @property
     def version(self) -> API.AsyncVersion:
-        return API.AsyncVersion(self._config, self.http_client)
+        return self.__resource(API.AsyncVersion)
 
     @property
     def health(self) -> API.AsyncHealth:
-        return API.AsyncHealth(self._config, self.http_client)
+        return self.__resource(API.AsyncHealth)
 
     @property
     def status(self) -> API.AsyncStatus:
-        return API.AsyncStatus(self._config, self.http_client)
+        return self.__resource(API.AsyncStatus)
 
     @property
     def services(self) -> API.AsyncServices:
-        return API.AsyncServices(self._config, self.http_client)
+        return self.__resource(API.AsyncServices)
 
     @staticmethod
     async def use(config: Config, http_client: Optional[AsyncHttpClient] = None) -> 'AsyncClient':
@@ -199,6 +242,11 @@ class AsyncClient:
             max_retries=config.max_retries,
             retry_interval=config.retry_interval,
             logger=config.logger,
+            json_codec=config.json_codec,
+            http=config.http,
+            retry=config.retry,
+            rate_limit=config.rate_limit,
+            circuit_breaker=config.circuit_breaker,
             http_client=http_client,
         )
 
@@ -210,7 +258,7 @@ class AsyncClient:
         **options: Any,
     ):
         config = Config(base_url=RunnerUrl.no_tenant(base_url or ''), token=token, **options)
-        async with http_client or AsyncHttpClient(timeout=config.timeout_in_sec) as client:
+        async with http_client or config.http.async_client(config.timeout) as client:
             return await API.AsyncHealth(config, client).check()
 
     @staticmethod
@@ -221,7 +269,7 @@ class AsyncClient:
         **options: Any,
     ):
         config = Config(base_url=RunnerUrl.no_tenant(base_url or ''), token=token, **options)
-        async with http_client or AsyncHttpClient(timeout=config.timeout_in_sec) as client:
+        async with http_client or config.http.async_client(config.timeout) as client:
             return await API.AsyncVersion(config, client).get()
 
     @staticmethod
@@ -232,5 +280,5 @@ class AsyncClient:
         **options: Any,
     ):
         config = Config(base_url=RunnerUrl.no_tenant(base_url or ''), token=token, **options)
-        async with http_client or AsyncHttpClient(timeout=config.timeout_in_sec) as client:
+        async with http_client or config.http.async_client(config.timeout) as client:
             return await API.AsyncStatus(config, client).get()
@@ -37,6 +37,13 @@ class Config(BaseConfig):
             timeout=timeout or self._timeout,
             max_retries=max_retries or self._max_retries,
             retry_interval=retry_interval or self._retry_interval,
+            json_codec=self._json_codec,
+            result_cache=self._result_cache,
+            metadata_cache=self._metadata_cache,
+            http=self._http,
+            retry=self._retry_with(max_retries, retry_interval),
+            rate_limit=self._rate_limit,
+            circuit_breaker=self._circuit_breaker,
         )
 
 
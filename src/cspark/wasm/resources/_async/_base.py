@@ -6,6 +6,4 @@ __all__ = ['AsyncHybridResource']
 
 
 class AsyncHybridResource(AsyncApiResource):
-    @property
-    def default_headers(self):
-        return {**super().default_headers, 'User-Agent': about}
+    user_agent = about
@@ -6,6 +6,4 @@ __all__ = ['HybridResource']
 
 
 class HybridResource(ApiResource):
-    @property
-    def default_headers(self):
-        return {**super().default_headers, 'User-Agent': about}
+    user_agent = about
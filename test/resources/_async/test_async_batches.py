@@ -0,0 +1,52 @@
+import io
+import json
+
+import cspark.sdk as Spark
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.mark.anyio
+async def test_run_batch_pipeline_overlapping_pushes_and_pulls(server):
+    chunks = Spark.create_chunks([['value'], [1], [2], [3]], chunk_size=1)
+    async with Spark.AsyncClient(base_url=server.url, api_key='open', logger=False) as spark:
+        result = await spark.batches.run('f/run', chunks, workers=3, poll_interval=0.01)
+
+    assert result.chunks == 3 and result.records == 3
+    assert result.outputs == [{'value': 1}, {'value': 2}, {'value': 3}]
+    assert result.status['record_submitted'] == 3
+
+
+@pytest.mark.anyio
+async def test_run_batch_pipeline_writing_results_into_sink(server):
+    buffer = io.BytesIO()
+    async with Spark.AsyncClient(base_url=server.url, api_key='open', logger=False) as spark:
+        sink = Spark.JsonlSink(buffer)
+        result = await spark.batches.run('f/run', [['value'], [1], [2]], chunk_size=1, poll_interval=0.01, sink=sink)
+
+    assert result.results == [] and sink.records == 2
+    records = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    assert sorted(r['inputs']['value'] for r in records) == [1, 2]
+    assert all(r['inputs'] == r['outputs'] for r in records)
+
+
+@pytest.mark.anyio
+async def test_resume_batch_pipeline_from_checkpoint(server, tmp_path):
+    dataset = [['value'], [1], [2], [3]]
+    async with Spark.AsyncClient(base_url=server.url, api_key='open', logger=False) as spark:
+        await spark.batches.create('f/run')
+        with Spark.BatchCheckpoint(tmp_path / 'run.jsonl') as checkpoint:
+            pipeline = spark.batches.of('run_uuid', checkpoint=checkpoint)
+            await pipeline.push(chunks=[Spark.BatchChunk('0', Spark.ChunkData([['value'], [1]]))])
+            assert checkpoint.pending == ['0']
+
+        with Spark.BatchCheckpoint(tmp_path / 'run.jsonl') as checkpoint:
+            result = await spark.batches.resume('run_uuid', checkpoint, dataset, chunk_size=1, poll_interval=0.01)
+
+    assert result.chunks == 3 and result.records == 3
+    assert result.outputs == [{'value': 1}, {'value': 2}, {'value': 3}]
+    assert result.status['record_submitted'] == 3
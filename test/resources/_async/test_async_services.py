@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+import cspark.sdk as Spark
+import httpx
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'  # async resources rely on asyncio primitives (e.g., semaphores)
+
+
+@pytest.mark.anyio
+async def test_execute_service_in_bulk_with_bounded_concurrency(server):
+    records = [{'my_input': i} for i in range(6)]
+    async with Spark.AsyncClient(base_url=server.url, api_key='open', logger=False) as spark:
+        results = await spark.services.execute_many('my-folder/my-service[0.4.2]', records, chunk_size=2)
+
+    assert len(results) == 3
+    assert all(isinstance(r, Spark.ServiceExecuted) for r in results)
+    assert all(r.data['outputs'] == [{'my_output': 42}, {'my_output': 43}] for r in results)  # type: ignore
+
+
+@pytest.mark.anyio
+async def test_execute_service_in_bulk_keeps_input_order_and_concurrency_limit():
+    in_flight, peaks = [0], []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)['inputs']
+        in_flight[0] += 1
+        peaks.append(in_flight[0])
+        await asyncio.sleep(0.05 if inputs[0]['a'] % 4 == 0 else 0.005)  # earlier chunks finish last
+        in_flight[0] -= 1
+        return httpx.Response(200, json={'outputs': [{'my_output': record['a']} for record in inputs]})
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    options = {'base_url': 'https://excel.test.coherent.global/my-tenant', 'api_key': 'open', 'logger': False}
+    async with Spark.AsyncClient(**options, http_client=http_client) as spark:
+        records = [{'a': i} for i in range(20)]
+        results = await spark.services.execute_many('my-folder/my-service[0.4.2]', records, chunk_size=2, concurrency=3)
+
+    assert [o['my_output'] for r in results for o in r.data['outputs']] == list(range(20))  # type: ignore
+    assert len(peaks) == 10 and 1 < max(peaks) <= 3  # overlapping requests, within the limit
+
+
+@pytest.mark.anyio
+async def test_stream_service_executions_from_lazy_records(server):
+    records = ({'my_input': i} for i in range(6))
+    async with Spark.AsyncClient(base_url=server.url, api_key='open', logger=False) as spark:
+        stream = spark.services.stream_many('my-folder/my-service[0.4.2]', records, chunk_size=2, concurrency=2)
+        outputs = [output async for result in stream for output in result.data['outputs']]  # type: ignore
+
+    assert len(outputs) == 6
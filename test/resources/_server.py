@@ -17,6 +17,10 @@ HTTP_SUCCESS_RESP = {'type': 'http.response.start', 'status': 200, 'headers': [[
 async def router(scope: Scope, receive: Receive, send: Send) -> None:
     assert scope['type'] == 'http'
 
+    # files are downloaded from pre-signed URLs, which may be fetched without the SDK headers.
+    if scope['path'] == '/my-tenant/files/export.zip':
+        return await file_download(scope, send)
+
     # all requests must have at least these headers: x-tenant-name, x-request-id, x-spark-ua
     headers = {k.decode(): v.decode() for k, v in scope['headers']}
     assert 'x-tenant-name' in headers
@@ -37,6 +41,8 @@ async def router(scope: Scope, receive: Receive, send: Send) -> None:
         await batch_pull(scope, send)
     elif scope['path'] == '/my-tenant/api/v4/batch/batch_uuid':
         await batch_dispose(scope, receive, send)
+    elif scope['path'].startswith('/my-tenant/api/v4/batch/run_uuid'):
+        await batch_run(scope, receive, send)
     elif scope['path'] == '/auth/realms/my-tenant/protocol/openid-connect/token':
         await retrieve_access_token(scope, send)
     elif scope['path'] == '/my-tenant/api/v3/folders/hybrid/services/runner/execute':
@@ -128,6 +134,12 @@ async def batch_create(scope: Scope, receive: Receive, send: Send) -> None:
     assert scope['method'] == 'POST'
 
     req_body = json.loads(await read_body(receive))
+    if req_body['service'] == 'f/run':  # stateful pipeline processing pushed chunks (see batch_run)
+        BATCH_RUN.update(queue=[], submitted=0, full_checks=2)
+        await send(HTTP_SUCCESS_RESP)
+        await send({'type': 'http.response.body', 'body': b'{"object": "batch", "id": "run_uuid", "data": {}}'})
+        return
+
     assert req_body['service'] == 'f/s'
     assert req_body['call_purpose'] == 'Async Batch Execution'
     assert req_body['source_system'] == 'Spark Python SDK'
@@ -172,6 +184,46 @@ async def batch_dispose(scope: Scope, receive: Receive, send: Send) -> None:
     await send({'type': 'http.response.body', 'body': res_body.encode()})
 
 
+BATCH_RUN: typing.Dict[str, typing.Any] = {'queue': [], 'submitted': 0, 'full_checks': 0}
+
+
+async def batch_run(scope: Scope, receive: Receive, send: Send) -> None:
+    # Outputs of each record echo its first input value.
+    endpoint = scope['path'].split('/run_uuid')[-1]
+
+    if endpoint == '/chunks':
+        for chunk in json.loads(await read_body(receive))['chunks']:
+            outputs = [{'value': row[0]} for row in chunk['data']['inputs'][1:]]
+            BATCH_RUN['queue'].append({'id': chunk['id'], 'outputs': outputs})
+            BATCH_RUN['submitted'] += len(outputs)
+        res_body = batch_run_status()
+    elif endpoint == '/chunkresults':
+        query_params = dict(q.split(b'=') for q in scope['query_string'].split(b'&') if q)
+        size = int(query_params[b'max'])
+        data, BATCH_RUN['queue'] = BATCH_RUN['queue'][:size], BATCH_RUN['queue'][size:]
+        res_body = {'data': data, 'status': batch_run_status()}
+    elif endpoint == '/status':
+        res_body = batch_run_status()
+        if BATCH_RUN['full_checks'] > 0:  # input buffer is full for the first status checks
+            BATCH_RUN['full_checks'] -= 1
+            res_body.update(input_buffer_used_bytes=1000, input_buffer_remaining_bytes=0)
+    else:
+        res_body = {'object': 'batch', 'id': 'run_uuid', 'meta': {}}
+
+    await send(HTTP_SUCCESS_RESP)
+    await send({'type': 'http.response.body', 'body': json.dumps(res_body).encode()})
+
+
+def batch_run_status() -> typing.Dict[str, typing.Any]:
+    return {
+        'batch_status': 'in_progress',
+        'record_submitted': BATCH_RUN['submitted'],
+        'records_available': sum(len(chunk['outputs']) for chunk in BATCH_RUN['queue']),
+        'input_buffer_used_bytes': 0,
+        'input_buffer_remaining_bytes': 1000,
+    }
+
+
 async def hybrid_execute_v3(scope: Scope, receive: Receive, send: Send) -> None:
     assert scope['method'] == 'POST'
 
@@ -184,6 +236,18 @@ async def hybrid_execute_v3(scope: Scope, receive: Receive, send: Send) -> None:
     await send({'type': 'http.response.body', 'body': res_body.encode()})
 
 
+async def file_download(scope: Scope, send: Send) -> None:
+    assert scope['method'] == 'GET'
+
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [[b'content-type', b'application/zip']]})
+    for part in FILE_PARTS:  # sent in several parts to mimic a large file
+        await send({'type': 'http.response.body', 'body': part, 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+FILE_PARTS = [b'PK\x03\x04', b'fake zip content', b'\x00' * 64]
+
+
 class LocalServer(Server):
     # A simple local server for testing purposes.
     # Inspired by httpx's TestServer (https://github.com/encode/httpx/blob/master/tests/conftest.py)
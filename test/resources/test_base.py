@@ -1,5 +1,6 @@
 import pytest
-from cspark.sdk import SparkSdkError, Uri, UriParams
+from cspark.sdk import ApiResource, Config, SparkSdkError, Uri, UriParams
+from httpx import Client
 
 BASE_URL = 'https://excel.test.coherent.global/tenant-name'
 
@@ -116,3 +117,27 @@ def test_uri_params_omit_class_props():
     assert UriParams(folder='f', service='s').omit('service') == UriParams(folder='f')
     assert UriParams(folder='f', service='s').omit('folder', 'service') == UriParams()
     assert UriParams(folder='f', service='s').omit('folder', 'service', 'version') == UriParams()
+
+
+def test_decode_response_data_lazily_or_stream_it(server):
+    config = Config(base_url=server.url, api_key='open', logger=False)
+    url = Uri.of(base_url=config.base_url.full, version='api/v4', endpoint='batch/batch_uuid/chunkresults')
+
+    with Client() as client:
+        resource = ApiResource(config, client)
+        response = resource.request(url, params={'max': '2'})
+        assert not response.is_stream
+        assert response.buffer == response.raw_response.content
+        assert response.copy_with(status=201).data['status'] == {'records_available': 0}
+
+        response = resource.request(url, params={'max': '2'}, stream=True)
+        assert response.is_stream
+        assert b''.join(response.iter_bytes(chunk_size=8)).startswith(b'{"data":')
+        assert not response.is_stream
+        with pytest.raises(SparkSdkError):
+            _ = response.buffer  # streamed bodies are never retained
+
+        response = resource.request(url, params={'max': '2'}, stream=True)
+        assert len(response.data['data']) == 2
+        with pytest.raises(SparkSdkError):
+            _ = response.buffer
@@ -1,5 +1,24 @@
+import csv
+import json
+import threading
+
+import httpx
 import pytest
-from cspark.sdk import BatchChunk, Client, SparkSdkError, create_chunks
+from cspark.sdk import (
+    BatchCheckpoint,
+    BatchChunk,
+    ChunkData,
+    Client,
+    CsvSink,
+    JsonlSink,
+    ResultSink,
+    SparkApiError,
+    SparkSdkError,
+    create_chunks,
+    iter_chunks,
+    read_chunks,
+)
+from cspark.sdk.resources._batches import _read_json_records
 
 RAW_STRING = """
 {
@@ -85,6 +104,45 @@ def test_create_chunks_distribute_input_dataset_evenly():
     assert chunks[1].data.inputs == [['sale_id', 'price', 'quantity'], [4, 34, 73], [5, 62, 62]]
     assert all(chunk.data.parameters == {} for chunk in chunks)
     assert all(chunk.data.summary is None for chunk in chunks)
+    assert chunks[0].data.inputs[0] is chunks[1].data.inputs[0] is headers  # no header copies
+    assert len(dataset) == 6  # dataset is left untouched
+
+
+def test_iter_chunks_pull_rows_lazily_from_any_iterable():
+    rows = ([i, i * 10] for i in range(5))
+    chunks = iter_chunks(rows, headers=['a', 'b'], chunk_size=2)
+
+    assert next(chunks).data.inputs == [['a', 'b'], [0, 0], [1, 10]]
+    assert next(rows) == [2, 20]  # nothing else was read ahead
+    assert [chunk.size for chunk in chunks] == [2]
+    with pytest.raises(SparkSdkError):
+        next(iter_chunks([]))
+
+
+def test_read_chunks_from_csv_jsonl_and_json_array_files(tmp_path):
+    (tmp_path / 'data.csv').write_text('a,b\n1,2\n3,4\n5,6\n')
+    (tmp_path / 'data.jsonl').write_text('{"a": 1, "b": 2}\n\n{"b": 4, "a": 3}\n{"a": 5}\n')
+    (tmp_path / 'data.json').write_text(' [ ["a", "b"], [1, 2],\n[3, 4] , [5, 6]] ')
+
+    chunks = list(read_chunks(tmp_path / 'data.csv', chunk_size=2))
+    assert [chunk.data.inputs for chunk in chunks] == [[['a', 'b'], ['1', '2'], ['3', '4']], [['a', 'b'], ['5', '6']]]
+
+    chunks = list(read_chunks(tmp_path / 'data.jsonl', chunk_size=3))
+    assert chunks[0].data.inputs == [['a', 'b'], [1, 2], [3, 4], [5, None]]
+
+    chunks = list(read_chunks(tmp_path / 'data.json', chunk_size=3))
+    assert [chunk.size for chunk in chunks] == [3]
+    assert chunks[0].data.inputs[1:] == [[1, 2], [3, 4], [5, 6]]
+
+    records = [{'id': i, 'name': 'x' * i} for i in range(20)]
+    (tmp_path / 'large.json').write_text(json.dumps(records))
+    assert list(_read_json_records(tmp_path / 'large.json', 'utf-8', size=7)) == records  # tiny reads
+
+    (tmp_path / 'broken.json').write_text('[[1, 2], [3,')
+    with pytest.raises(SparkSdkError):
+        list(read_chunks(tmp_path / 'broken.json'))
+    with pytest.raises(SparkSdkError):
+        read_chunks(tmp_path / 'data.txt')
 
 
 def test_batches_can_create_batch_pipeline_from_start_to_finish(server):
@@ -129,3 +187,156 @@ def test_batches_can_create_batch_pipeline_from_start_to_finish(server):
         pipeline.cancel()
 
     spark.close()
+
+
+def test_batches_can_run_pipeline_overlapping_pushes_and_pulls(server):
+    dataset = [['value'], [1], [2], [3], [4], [5]]
+    with Client(base_url=server.url, api_key='open', logger=False) as spark:
+        result = spark.batches.run('f/run', dataset, chunk_size=2, workers=2, max_chunks=1, poll_interval=0.01)
+
+    assert result.batch_id == 'run_uuid'
+    assert result.chunks == 3 and result.records == 5
+    assert result.outputs == [{'value': 1}, {'value': 2}, {'value': 3}, {'value': 4}, {'value': 5}]
+    assert len(dataset) == 6  # dataset is left untouched
+
+
+def test_batches_can_run_pipeline_reading_dataset_file_lazily(server, tmp_path):
+    (tmp_path / 'data.jsonl').write_text('\n'.join(f'{{"value": {i}}}' for i in range(1, 6)))
+    with Client(base_url=server.url, api_key='open', logger=False) as spark:
+        result = spark.batches.run('f/run', tmp_path / 'data.jsonl', chunk_size=2, poll_interval=0.01)
+
+    assert result.chunks == 3 and result.records == 5
+    assert result.outputs == [{'value': i} for i in range(1, 6)]
+
+
+def test_pipeline_caches_its_status_and_holds_pushes_back_when_buffer_is_full(server):
+    with Client(base_url=server.url, api_key='open', logger=False) as spark:
+        spark.batches.create('f/run')
+        pipeline = spark.batches.of('run_uuid')
+        assert pipeline.last_status is None
+
+        pipeline.status_ttl = 60
+        status = pipeline.refresh_status()
+        assert pipeline.refresh_status() is status  # no status check within the ttl
+        assert pipeline.buffer_usage == 1.0
+
+        pipeline.status_ttl = 0.01
+        pipeline.push(inputs=[['value'], [1]], buffer_threshold=0.5)  # waits for the buffer to free up
+        assert pipeline.last_status is not status  # refreshed by the push response
+        assert pipeline.last_status['record_submitted'] == 1  # type: ignore
+        assert pipeline.buffer_usage == 0.0
+
+
+def test_batches_stop_pushes_held_back_by_full_buffer_when_pull_fails():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.url.path.endswith('/api/v4/batch'):
+            return httpx.Response(200, json={'object': 'batch', 'id': 'full_uuid'})
+        if request.url.path.endswith('/status'):  # input buffer stays full
+            status = {'batch_status': 'in_progress', 'input_buffer_used_bytes': 100, 'input_buffer_remaining_bytes': 0}
+            return httpx.Response(200, json=status)
+        if request.url.path.endswith('/chunkresults'):
+            return httpx.Response(400, json={'message': 'pull failed'})
+        return httpx.Response(409, json={'message': 'cancel failed'})  # PATCH (cancel)
+
+    errors = []
+
+    def run():
+        http_client = httpx.Client(transport=httpx.MockTransport(handler))
+        options = {'base_url': 'https://excel.test.coherent.global/my-tenant', 'api_key': 'open', 'logger': False}
+        with Client(**options, http_client=http_client) as spark:
+            try:
+                spark.batches.run('f/s', [['value'], [1], [2], [3]], chunk_size=1, workers=2, poll_interval=0.01)
+            except Exception as error:
+                errors.append(error)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive(), 'pushers kept waiting for buffer space after the pull failed'
+    assert len(errors) == 1
+    assert isinstance(errors[0], SparkApiError) and errors[0].status == 400  # not hidden by the failed cancel
+    assert ('PATCH', '/my-tenant/api/v4/batch/full_uuid') in calls
+    assert not any(path.endswith('/chunks') for _, path in calls)  # nothing was pushed
+
+
+def test_batches_can_run_pipeline_writing_results_into_sinks(server, tmp_path):
+    dataset = [['value'], [1], [2], [3]]
+    with Client(base_url=server.url, api_key='open', logger=False) as spark:
+        with CsvSink(tmp_path / 'results.csv') as sink:
+            result = spark.batches.run('f/run', dataset, chunk_size=2, max_chunks=1, poll_interval=0.01, sink=sink)
+
+        assert result.results == [] and sink.records == 3
+        lines = (tmp_path / 'results.csv').read_text().splitlines()
+        assert lines[0] == 'chunk_id,value,output.value,warnings,errors,process_time'
+        assert sorted(tuple(line.split(',')[1:3]) for line in lines[1:]) == [('1', '1'), ('2', '2'), ('3', '3')]
+
+        with JsonlSink(tmp_path / 'results.jsonl') as sink:
+            spark.batches.run('f/run', dataset, chunk_size=3, poll_interval=0.01, sink=sink)
+
+    records = [json.loads(line) for line in (tmp_path / 'results.jsonl').read_text().splitlines()]
+    assert [r['index'] for r in records] == [0, 1, 2]
+    assert [(r['inputs'], r['outputs']) for r in records] == [({'value': i}, {'value': i}) for i in (1, 2, 3)]
+
+
+def test_csv_sink_keeps_warnings_and_errors_and_rejects_unknown_columns(tmp_path):
+    result = {
+        'id': 'c1',
+        'outputs': [{'value': 1}, {'value': 2}],
+        'warnings': [None, [{'message': 'low value'}]],
+        'errors': [{'message': 'bad input'}, None],
+        'process_time': [3, 4],
+    }
+    with CsvSink(tmp_path / 'results.csv') as sink:
+        assert sink.write(result) == 2
+        with pytest.raises(SparkSdkError):
+            sink.write({'id': 'c2', 'outputs': [{'value': 3, 'other': 4}]})  # 'other' is not in the header
+
+    with open(tmp_path / 'results.csv', newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert [row['value'] for row in rows] == ['1', '2']
+    assert json.loads(rows[0]['errors']) == {'message': 'bad input'} and rows[0]['warnings'] == ''
+    assert json.loads(rows[1]['warnings']) == [{'message': 'low value'}] and rows[1]['process_time'] == '4'
+
+    fieldnames = ['chunk_id', 'value', 'other', 'warnings', 'errors', 'process_time']
+    with CsvSink(tmp_path / 'fixed.csv', fieldnames=fieldnames) as sink:
+        sink.write(result)
+        sink.write({'id': 'c2', 'outputs': [{'value': 3, 'other': 4}]})
+    assert (tmp_path / 'fixed.csv').read_text().splitlines()[-1] == 'c2,3,4,,,'
+
+
+def test_result_sinks_must_implement_write():
+    class IncompleteSink(ResultSink):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteSink()
+
+
+def test_batches_can_resume_interrupted_run_from_checkpoint(server, tmp_path):
+    dataset = [['value'], [1], [2], [3]]
+    with Client(base_url=server.url, api_key='open', logger=False) as spark:
+        spark.batches.create('f/run')
+        with BatchCheckpoint(tmp_path / 'run.jsonl') as checkpoint:
+            pipeline = spark.batches.of('run_uuid', checkpoint=checkpoint)
+            pipeline.push(chunks=[BatchChunk('0', ChunkData([['value'], [1], [2]]))])
+            pipeline.pull()  # then the worker dies before pushing the second chunk
+
+        with open(tmp_path / 'run.jsonl', 'ab') as file:
+            file.write(b'{"event": "pu')  # partially written event
+
+        with BatchCheckpoint(tmp_path / 'run.jsonl') as checkpoint:
+            assert checkpoint.batch_id == 'run_uuid'
+            assert checkpoint.pushed == {'0': 2} and checkpoint.pending == []
+            with pytest.raises(SparkSdkError):
+                spark.batches.run('f/run', dataset, checkpoint=checkpoint)
+
+            result = spark.batches.resume(None, checkpoint, dataset, chunk_size=2, poll_interval=0.01)
+
+        assert result.chunks == 2 and result.records == 3
+        assert result.outputs == [{'value': 1}, {'value': 2}, {'value': 3}]
+        assert result.status['record_submitted'] == 3  # the first chunk was not pushed again
+        assert checkpoint.pushed == {'0': 2, '1': 1}
@@ -0,0 +1,118 @@
+import hashlib
+import io
+
+import httpx
+import pytest
+from cspark.sdk import AsyncClient, Client, SparkApiError, SparkSdkError
+
+CONTENT = b'PK\x03\x04' + b'fake zip content' + b'\x00' * 64  # as served by the local server
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+def test_stream_file_to_disk_and_verify_its_checksum(server, tmp_path):
+    url = f'{server.url.full}/files/export.zip'
+    with Client(base_url=server.url, api_key='open', logger=False) as spark:
+        download = spark.files.download_to(url, tmp_path / 'file.zip', chunk_size=8, checksum=SHA256)
+        assert download.path == str(tmp_path / 'file.zip')
+        assert download.size == len(CONTENT)
+        assert download.checksum == f'sha256:{SHA256}'
+        assert (tmp_path / 'file.zip').read_bytes() == CONTENT
+
+        with pytest.raises(SparkSdkError):
+            spark.files.download_to(url, tmp_path / 'corrupted.zip', checksum='md5:not-the-right-digest')
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['file.zip']  # no partial files left
+
+        buffer = io.BytesIO()
+        assert spark.files.download_to(url, buffer).path is None
+        assert buffer.getvalue() == CONTENT
+
+
+def test_stream_exported_files_to_directory(server, tmp_path):
+    url = f'{server.url.full}/files/export.zip'
+    with Client(base_url=server.url, api_key='open', logger=False) as spark:
+        downloads = spark.impex.exports.download_to([url, ''], tmp_path / 'exports', checksums={url: SHA256})
+
+    assert len(downloads) == 1 and downloads.ok
+    assert (tmp_path / 'exports' / 'export.zip').read_bytes() == CONTENT
+    assert Client.download_to(url, tmp_path / 'direct.zip').checksum == f'sha256:{SHA256}'
+
+
+def test_keep_exported_files_within_directory_under_distinct_names(tmp_path):
+    http_client = httpx.Client(transport=httpx.MockTransport(lambda _: httpx.Response(200, content=CONTENT)))
+    base_url = 'https://excel.test.coherent.global/my-tenant'
+    urls = [
+        f'{base_url}/files/..%2F..%2Fevil.sh',
+        f'{base_url}/files/%2Fetc%2Fcron.d%2Fx',
+        f'{base_url}/files/a/export.zip?sig=1',
+        f'{base_url}/files/b/export.zip?sig=2',
+        f'{base_url}/files/..',
+    ]
+    with Client(base_url=base_url, api_key='open', logger=False, http_client=http_client) as spark:
+        downloads = spark.impex.exports.download_to(urls, tmp_path / 'exports', workers=2)
+
+    assert len(downloads) == 5 and downloads.ok
+    names = {p.name for p in (tmp_path / 'exports').iterdir()}
+    assert {'evil.sh', 'x', 'export.zip', 'export-1.zip'} < names and len(names) == 5  # plus 'export-<uuid>.zip'
+    assert all(path.read_bytes() == CONTENT for path in (tmp_path / 'exports').iterdir())
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['exports']  # nothing written outside
+
+
+@pytest.mark.anyio
+async def test_stream_file_to_disk_asynchronously(server, tmp_path):
+    url = f'{server.url.full}/files/export.zip'
+    async with AsyncClient(base_url=server.url, api_key='open', logger=False) as spark:
+        download = await spark.files.download_to(url, tmp_path / 'file.zip', chunk_size=8)
+
+    assert download.size == len(CONTENT)
+    assert (tmp_path / 'file.zip').read_bytes() == CONTENT
+    assert (await AsyncClient.download_to(url, tmp_path / 'direct.zip', checksum=SHA256)).size == len(CONTENT)
+
+
+def test_download_exported_files_concurrently_and_report_failures(server):
+    url, missing_url = f'{server.url.full}/files/export.zip', f'{server.url.full}/files/missing.zip'
+    with Client(base_url=server.url, api_key='open', logger=False) as spark:
+        report = spark.impex.exports.download([url, missing_url, url], workers=2, max_retries=1, retry_interval=0.01)
+
+    assert [r.buffer for r in report] == [CONTENT, CONTENT]
+    assert list(report.failures) == [missing_url]
+    assert not report.ok
+    assert str(report) == '2 of 3 file(s) downloaded (1 failed)'
+
+
+def test_retry_downloads_only_on_transient_failures():
+    calls = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        name = request.url.path.rsplit('/', 1)[-1]
+        calls[name] = calls.get(name, 0) + 1
+        if name == 'missing.zip':
+            return httpx.Response(404, json={'message': 'not found'})
+        if name == 'flaky.zip' and calls[name] < 3:
+            return httpx.Response(503, json={'message': 'unavailable'})
+        if name == 'down.zip':
+            return httpx.Response(503, json={'message': 'unavailable'})
+        return httpx.Response(200, content=CONTENT)
+
+    base_url = 'https://excel.test.coherent.global/my-tenant'
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    urls = [f'{base_url}/files/{name}' for name in ('missing.zip', 'flaky.zip', 'down.zip')]
+    with Client(base_url=base_url, api_key='open', logger=False, max_retries=3, http_client=http_client) as spark:
+        report = spark.impex.exports.download(urls, max_retries=2, retry_interval=0.01)
+
+    assert len(report) == 1 and set(report.failures) == {urls[0], urls[2]}
+    assert calls == {'missing.zip': 1, 'flaky.zip': 3, 'down.zip': 3}  # no retries stacked with the client ones
+
+
+@pytest.mark.anyio
+async def test_download_exported_files_concurrently_asynchronously(server, tmp_path):
+    url, missing_url = f'{server.url.full}/files/export.zip', f'{server.url.full}/files/missing.zip'
+    async with AsyncClient(base_url=server.url, api_key='open', logger=False) as spark:
+        report = await spark.impex.exports.download_to([missing_url, url], tmp_path, max_retries=0)
+
+    assert [d.size for d in report] == [len(CONTENT)]
+    assert isinstance(report.failures[missing_url], SparkApiError)
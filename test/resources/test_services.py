@@ -1,4 +1,10 @@
+import json
+import threading
+import time
+
 import cspark.sdk as Spark
+import httpx
+import pytest
 
 
 def test_execute_service_with_default_inputs(server):
@@ -40,3 +46,162 @@ def test_execute_service_with_metadata(server):
     assert isinstance(response.data, dict)
     assert response.data['outputs'] == [{'single_output': 42}]
     assert response.data['version_id'] == 'version_uuid'
+
+
+def test_execute_service_with_data_frame_inputs_and_outputs(server):
+    pd = pytest.importorskip('pandas')
+    pa = pytest.importorskip('pyarrow')
+    frame = pd.DataFrame({'my_input': [13.5], 'since': pd.to_datetime([None]), 'note': [None]})
+    with Spark.Client(base_url=server.url, api_key='open', logger=False) as spark:
+        response = spark.services.execute('my-folder/my-service[0.4.2]', inputs=frame)
+        inputs = json.loads(response.raw_request.content)['inputs']
+        assert inputs == [['my_input', 'since', 'note'], [13.5, None, None]]
+
+        response = spark.services.execute('my-folder/my-service[0.4.2]', inputs=pa.table({'my_input': [1]}))
+        assert json.loads(response.raw_request.content)['inputs'] == [['my_input'], [1]]
+
+        records = pd.DataFrame({'my_input': [1, 2, 3]})
+        assert len(spark.services.execute_many('my-folder/my-service[0.4.2]', records, chunk_size=1)) == 3
+
+    assert response.outputs_as_frame()['my_output'].tolist() == [42, 43]
+    assert response.outputs_as_frame('pyarrow').column('my_output').to_pylist() == [42, 43]
+    with pytest.raises(Spark.SparkSdkError):
+        response.outputs_as_frame('polars')
+
+
+def test_execute_service_reusing_cached_results_of_pinned_versions(server):
+    cache = Spark.MemoryCache()
+    inputs = [{'my_input': 13}, {'my_input': 14}]
+    with Spark.Client(base_url=server.url, api_key='open', logger=False, result_cache=cache) as spark:
+        first = spark.services.execute('my-folder/my-service[0.4.2]', inputs=inputs, correlation_id='first')
+        second = spark.services.execute('my-folder/my-service[0.4.2]', inputs=inputs, correlation_id='second')
+        spark.services.execute('my-folder/my-service[0.4.2]', response_format='original')  # other inputs
+
+    assert second.data == first.data
+    assert second.data['outputs'] == [{'my_output': 42}, {'my_output': 43}]  # type: ignore
+    assert second.buffer is first.buffer  # cached bytes are returned as they are
+    assert (cache.stats.hits, cache.stats.misses, len(cache)) == (1, 2, 2)
+
+
+def test_execute_service_in_bulk_with_bounded_concurrency(server):
+    records = [{'my_input': i} for i in range(6)]
+    with Spark.Client(base_url=server.url, api_key='open', logger=False) as spark:
+        results = spark.services.execute_many('my-folder/my-service[0.4.2]', records, chunk_size=2, concurrency=2)
+
+    assert len(results) == 3
+    assert all(isinstance(r, Spark.ServiceExecuted) for r in results)
+    assert all(r.data['outputs'] == [{'my_output': 42}, {'my_output': 43}] for r in results)  # type: ignore
+
+
+def test_execute_service_in_bulk_keeps_input_order_and_concurrency_limit():
+    lock, in_flight, peaks = threading.Lock(), [0], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)['inputs']
+        with lock:
+            in_flight[0] += 1
+            peaks.append(in_flight[0])
+        time.sleep(0.05 if inputs[0]['a'] % 4 == 0 else 0.005)  # earlier chunks finish last
+        with lock:
+            in_flight[0] -= 1
+        return httpx.Response(200, json={'outputs': [{'my_output': record['a']} for record in inputs]})
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    options = {'base_url': 'https://excel.test.coherent.global/my-tenant', 'api_key': 'open', 'logger': False}
+    with Spark.Client(**options, http_client=http_client) as spark:
+        records = [{'a': i} for i in range(20)]
+        results = spark.services.execute_many('my-folder/my-service[0.4.2]', records, chunk_size=2, concurrency=3)
+
+    assert [o['my_output'] for r in results for o in r.data['outputs']] == list(range(20))  # type: ignore
+    assert len(peaks) == 10 and 1 < max(peaks) <= 3  # overlapping requests, within the limit
+
+
+def test_execute_service_in_bulk_keeps_headers_of_columnar_inputs(server):
+    records = [['my_input'], [1], [2], [3], [4]]
+    with Spark.Client(base_url=server.url, api_key='open', logger=False) as spark:
+        results = spark.services.execute_many('my-folder/my-service[0.4.2]', records, chunk_size=1)
+
+    # server expects exactly 2 rows per request (i.e., header + 1 record)
+    assert len(results) == 4
+
+    with pytest.raises(Spark.SparkSdkError):
+        spark.services.execute_many('my-folder/my-service[0.4.2]', [])
+
+
+def test_stream_service_executions_from_lazy_records(server):
+    records = ({'my_input': i} for i in range(6))  # generators are consumed lazily
+    with Spark.Client(base_url=server.url, api_key='open', logger=False) as spark:
+        stream = spark.services.stream_many('my-folder/my-service[0.4.2]', records, chunk_size=2, ordered=False)
+        outputs = [output for result in stream for output in result.data['outputs']]  # type: ignore
+
+    assert len(outputs) == 6
+
+
+def test_chunk_sizer_adapts_to_observed_latency_and_body_size():
+    sizer = Spark.ChunkSizer(10, target_latency=2.0, max_body_size=10_000, max_size=100)
+    assert sizer.size == 10
+
+    # fast executions grow the chunk size (at most twice as large at once)
+    assert sizer.update(records=10, elapsed=0.5, process_time=0.4) == 20
+    # large payloads keep request bodies under the limit (500 bytes per record)
+    assert sizer.update(records=20, elapsed=0.5, body_size=10_000) == 20
+    assert sizer.update(records=20, elapsed=0.5, body_size=20_000) == 10
+    # slow executions shrink the chunk size (at most half as large at once)
+    assert sizer.update(records=10, elapsed=10.0) == 5
+    assert sizer.shrink() == 2
+    assert Spark.ChunkSizer(5000).size == 1000
+
+
+def test_execute_service_in_bulk_with_adaptive_chunk_size(server):
+    sizer = Spark.ChunkSizer(2, min_size=2, max_size=2)  # server expects exactly 2 records per request
+    with Spark.Client(base_url=server.url, api_key='open', logger=False) as spark:
+        results = spark.services.execute_many(
+            'my-folder/my-service[0.4.2]', [{'a': i} for i in range(4)], chunk_size=sizer
+        )
+
+    assert len(results) == 2
+    assert sizer.size == 2
+
+
+def test_split_and_resubmit_chunks_rejected_for_being_too_large():
+    sizes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)['inputs']
+        sizes.append(len(inputs))
+        if len(inputs) > 2:
+            return httpx.Response(413, json={'message': 'request entity too large'})
+        outputs = [{'my_output': record['a']} for record in inputs]
+        return httpx.Response(200, json={'outputs': outputs, 'process_time': [1] * len(inputs)})
+
+    sizer = Spark.ChunkSizer(8, min_size=1, max_size=8)
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    options = {'base_url': 'https://excel.test.coherent.global/my-tenant', 'api_key': 'open', 'logger': False}
+    with Spark.Client(**options, http_client=http_client) as spark:
+        records = [{'a': i} for i in range(10)]
+        results = spark.services.execute_many('my-folder/my-service[0.4.2]', records, chunk_size=sizer, concurrency=1)
+
+    assert [o['my_output'] for r in results for o in r.data['outputs']] == list(range(10))  # type: ignore
+    assert sizes[:4] == [8, 4, 2, 2]  # 8 -> 4 -> 2 records per chunk
+    assert sum(size for size in sizes if size <= 2) == 10  # each record went through exactly once
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    with Spark.Client(**options, http_client=http_client) as spark, pytest.raises(Spark.SparkApiError) as exc:
+        spark.services.execute_many('my-folder/my-service[0.4.2]', [{'a': i} for i in range(4)], chunk_size=4)
+    assert exc.value.status == 413  # fixed chunk sizes are not split
+
+
+def test_send_non_ascii_metadata_as_ascii_only_header():
+    headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers.append(request.headers['x-meta'])
+        return httpx.Response(200, json={'outputs': [{'value': 1}]})
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    options = {'base_url': 'https://excel.test.coherent.global/my-tenant', 'api_key': 'open', 'logger': False}
+    with Spark.Client(**options, http_client=http_client) as spark:
+        spark.services.transform('my-folder/my-service', inputs={}, api_version='v4', call_purpose='Évaluation')
+
+    assert headers[0].isascii()
+    assert json.loads(headers[0].strip("'"))['call_purpose'] == 'Évaluation'
@@ -1,5 +1,9 @@
+import threading
+import time
+
+import httpx
 import pytest
-from cspark.sdk import Authorization, SparkSdkError
+from cspark.sdk import Authorization, Client, SparkSdkError
 from cspark.sdk._auth import OAuth
 
 TOKEN = 'some-access-token'
@@ -63,3 +67,34 @@ def test_create_authorization_with_file_oauth():
 def test_throw_sdk_error_if_no_authentication_method_is_provided():
     with pytest.raises(SparkSdkError):
         Authorization()
+
+
+def test_refresh_oauth_token_once_for_concurrent_requests():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith('openid-connect/token'):
+            time.sleep(0.05)
+            return httpx.Response(200, json={'access_token': f'token-{len(calls)}', 'expires_in': 300})
+        return httpx.Response(200, json={'status': 'Success', 'data': []})
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    base_url = 'https://excel.test.coherent.global/my-tenant'
+    with Client(base_url=base_url, oauth=OAUTH, logger=False, http_client=http_client) as spark:
+        oauth = spark.config.auth.oauth
+        assert oauth.expires_soon is True
+
+        threads = [threading.Thread(target=spark.services.get_versions, args=('f/s',)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sum(path.endswith('openid-connect/token') for path in calls) == 1
+        assert oauth.access_token == 'token-1' and oauth.expires_soon is False
+
+        oauth._issued_at -= 250  # within the refresh margin
+        assert oauth.expires_soon is True
+        spark.services.get_versions('f/s')
+        assert oauth.access_token.startswith('token-') and oauth.access_token != 'token-1'
+        assert sum(path.endswith('openid-connect/token') for path in calls) == 2
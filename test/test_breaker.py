@@ -0,0 +1,85 @@
+import time
+
+import httpx
+import pytest
+from cspark.sdk import CircuitBreaker, CircuitOpenError, Client, SparkApiError, SparkSdkError
+
+BASE_URL = 'https://excel.test.coherent.global/my-tenant'
+
+
+def test_open_and_half_open_circuits_after_failures():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05, slow_call_threshold=1)
+    breaker.record('host/execute', False)
+    assert breaker.acquire('host/execute') is False
+    breaker.record('host/execute', True, elapsed=2)  # slow calls count as failures
+
+    assert breaker.state('host/execute') == 'open'
+    assert breaker.state('host/batch') == 'closed'
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.acquire('host/execute')
+    assert exc.value.key == 'host/execute' and 0 < exc.value.retry_in <= 0.05
+
+    time.sleep(0.06)
+    assert breaker.acquire('host/execute') is True  # probe
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire('host/execute')  # only one probe at a time
+    breaker.record('host/execute', False)
+    assert breaker.state('host/execute') == 'open'
+
+    time.sleep(0.06)
+    assert breaker.acquire('host/execute') is True
+    breaker.record('host/execute', True, elapsed=0.1)
+    assert breaker.state('host/execute') == 'closed'
+
+
+def test_fail_fast_while_spark_is_unavailable():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == '/health':
+            return httpx.Response(200, json={'status': 'UP'})
+        return httpx.Response(503 if len(calls) <= 2 else 200, json={'status': 'Success', 'data': []})
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05, health_check=True)
+    options = {'logger': False, 'retry': {'max_retries': 0}, 'circuit_breaker': breaker, 'http_client': http_client}
+    with Client(base_url=BASE_URL, api_key='open', **options) as spark:
+        for _ in range(2):
+            with pytest.raises(SparkApiError):
+                spark.services.get_versions('my-folder/my-service')
+        with pytest.raises(CircuitOpenError):
+            spark.services.get_versions('my-folder/my-service')
+        assert len(calls) == 2
+        assert breaker.state('excel.test.coherent.global/metadata') == 'open'
+
+        time.sleep(0.06)
+        assert spark.services.get_versions('my-folder/my-service').status == 200
+        assert calls[-2:] == ['/health', '/api/v1/product/my-folder/engines/getversions/my-service']
+        assert breaker.state('excel.test.coherent.global/metadata') == 'closed'
+
+
+def test_release_probe_slot_when_a_probe_request_raises():
+    outcomes = [503, RuntimeError('boom'), 200]
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={'status': 'Success', 'data': []})
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    options = {'logger': False, 'retry': {'max_retries': 0}, 'circuit_breaker': breaker, 'http_client': http_client}
+    with Client(base_url=BASE_URL, api_key='open', **options) as spark:
+        with pytest.raises(SparkApiError):
+            spark.services.get_versions('my-folder/my-service')
+
+        time.sleep(0.06)
+        with pytest.raises(SparkSdkError):
+            spark.services.get_versions('my-folder/my-service')  # probe fails without a response
+        assert breaker.state('excel.test.coherent.global/metadata') == 'open'
+
+        time.sleep(0.06)
+        assert spark.services.get_versions('my-folder/my-service').status == 200
+        assert breaker.state('excel.test.coherent.global/metadata') == 'closed'
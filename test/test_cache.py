@@ -0,0 +1,101 @@
+import os
+import time
+
+import httpx
+import pytest
+from cspark.sdk import Client, MemoryCache, MetadataCache, ResultCache, SqliteCache, TokenCache
+
+
+def test_build_cache_keys_regardless_of_key_order():
+    assert ResultCache.key_of('url', {'a': 1, 'b': [1, 2]}) == ResultCache.key_of('url', {'b': [1, 2], 'a': 1})
+    assert ResultCache.key_of('url', {'a': 1}) != ResultCache.key_of('url', {'a': 2})
+
+
+def test_require_storage_hooks_of_result_caches():
+    class IncompleteCache(ResultCache):
+        def _get(self, _key):
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteCache()
+
+
+@pytest.mark.parametrize('factory', [MemoryCache, lambda **kw: SqliteCache(':memory:', **kw)])
+def test_evict_least_recently_used_and_expired_entries(factory):
+    cache = factory(max_size=2, ttl=0.05)
+    cache.set('a', b'1')
+    cache.set('b', b'2')
+    assert cache.get('a') == b'1'  # 'b' is now the least recently used
+    cache.set('c', b'3')
+
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('c') == b'3'
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (2, 1, 1)
+    assert cache.stats.hit_rate == pytest.approx(2 / 3)
+
+    time.sleep(0.06)
+    assert cache.get('a') is None and cache.get('c') is None
+    cache.set('d', b'4')
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_persist_results_across_sqlite_caches(tmp_path):
+    with SqliteCache(tmp_path / 'cache.db') as cache:
+        cache.set('key', b'{"outputs": []}')
+
+    with SqliteCache(tmp_path / 'cache.db') as cache:
+        assert cache.get('key') == b'{"outputs": []}'
+
+
+def test_expire_and_invalidate_metadata_by_service():
+    cache = MetadataCache(ttl=0.05, max_size=3)
+    cache.set('my-folder/my-service', 'metadata', {'version': '0.4.2'})
+    cache.set('other-folder/other-service', 'metadata', {'version': '1.0.0'})
+    cache.set('version_uuid', 'schema', {'id': 'version_uuid'})
+
+    assert cache.get('my-folder/my-service', 'metadata') == {'version': '0.4.2'}
+    assert cache.get('my-folder/my-service', 'versions') is None
+    assert cache.invalidate('My-Folder/My-Service') == 2  # ids only cannot be tied to a service
+    assert cache.get('my-folder/my-service', 'metadata') is None
+    assert cache.get('other-folder/other-service', 'metadata') == {'version': '1.0.0'}
+    assert (cache.stats.hits, cache.stats.misses) == (2, 2)
+
+    time.sleep(0.06)
+    assert cache.get('other-folder/other-service', 'metadata') is None
+    assert len(cache) == 0
+
+
+def test_share_oauth_tokens_across_processes_via_a_token_cache(tmp_path):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith('openid-connect/token'):
+            return httpx.Response(200, json={'access_token': f'token-{len(calls)}', 'expires_in': 300})
+        return httpx.Response(200, json={'status': 'Success', 'data': []})
+
+    def new_client():  # as if started by another worker process
+        oauth = {'client_id': 'some-id', 'client_secret': 'some-secret'}
+        http_client = httpx.Client(transport=httpx.MockTransport(handler))
+        base_url = 'https://excel.test.coherent.global/my-tenant'
+        cache = TokenCache(tmp_path / 'tokens.json')
+        return Client(base_url=base_url, oauth=oauth, token_cache=cache, logger=False, http_client=http_client)
+
+    for _ in range(3):
+        with new_client() as spark:
+            spark.services.get_versions('my-folder/my-service')
+            assert spark.config.auth.oauth.access_token == 'token-1'
+    assert calls.count('/auth/realms/my-tenant/protocol/openid-connect/token') == 1
+    assert os.stat(tmp_path / 'tokens.json').st_mode & 0o077 == 0
+
+    cache = TokenCache(tmp_path / 'tokens.json')
+    token, remaining = cache.get(TokenCache.key_of('some-id', 'my-tenant'))
+    assert token['access_token'] == 'token-1' and 299 < remaining <= 300
+
+    cache.set(TokenCache.key_of('some-id', 'my-tenant'), token, expires_in=30)  # nearing expiry
+    with new_client() as spark:
+        spark.services.get_versions('my-folder/my-service')
+        assert spark.config.auth.oauth.access_token != 'token-1'
+    assert cache.get(TokenCache.key_of('some-id', 'my-tenant'))[0]['access_token'] != 'token-1'
@@ -1,7 +1,9 @@
+import json
 import sys
 
+import httpx
 import pytest
-from cspark.sdk import BaseUrl, Config, HealthUrl, JwtConfig, SparkSdkError
+from cspark.sdk import BaseUrl, Client, Config, HealthUrl, HttpOptions, JsonCodec, JwksCache, JwtConfig, SparkSdkError
 from cspark.sdk._constants import *
 
 BASE_URL = 'https://excel.test.coherent.global'
@@ -117,6 +119,39 @@ def test_jwt_config_cannot_decode_invalid_token():
     assert decoded['decoded'].startswith('invalid token')
 
 
+def test_jwt_config_validates_tokens_against_cached_signing_keys():
+    jwt = pytest.importorskip('jwt')
+    rsa = pytest.importorskip('cryptography.hazmat.primitives.asymmetric.rsa')
+
+    issuer = 'https://keycloak.my-env.coherent.global/auth/realms/my-tenant'
+    keys = {kid: rsa.generate_private_key(public_exponent=65537, key_size=2048) for kid in ('kid-1', 'kid-2')}
+    published, calls = ['kid-1'], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        to_jwk = jwt.algorithms.RSAAlgorithm.to_jwk
+        jwks = [{**json.loads(to_jwk(keys[kid].public_key())), 'kid': kid} for kid in published]
+        return httpx.Response(200, json={'keys': jwks})
+
+    def sign(kid: str) -> str:
+        claims = {'iss': issuer, 'aud': 'product-factory', 'realm': 'my-tenant'}
+        return jwt.encode(claims, keys[kid], algorithm='RS256', headers={'kid': kid})
+
+    cache = JwksCache(refresh_interval=0)
+    options = {'jwks_cache': cache, 'http_client': httpx.Client(transport=httpx.MockTransport(handler))}
+    for _ in range(3):
+        assert JwtConfig.validate(sign('kid-1'), issuer, **options)[0] is True
+    assert calls == [JwksCache.url_of(issuer)]
+
+    published.append('kid-2')  # key rotation
+    assert JwtConfig.validate(sign('kid-2'), issuer, **options)[0] is True
+    assert len(calls) == 2
+
+    valid, error = JwtConfig.validate(sign('kid-1')[:-4] + 'AAAA', issuer, **options)
+    assert valid is False and 'signature' in error.lower()
+    assert len(calls) == 2
+
+
 def test_build_base_url_from_parts():
     VALID_URL = 'https://excel.my.env.coherent.global/tenant'
     assert BaseUrl.of(url='https://excel.my.env.coherent.global///', tenant='tenant').full == VALID_URL
@@ -214,3 +249,103 @@ def test_health_url_can_build_from_different_parts():
     assert HealthUrl.when(BaseUrl.of(url=VALID_URL, tenant=TENANT)).value == VALID_URL
     assert HealthUrl.when(BaseUrl.of(url=f'{VALID_URL}/{TENANT}')).value == VALID_URL
     assert HealthUrl.when(BaseUrl.of(url=SPARK_URL)).value == 'https://excel.test.coherent.global'
+
+
+def test_pick_fastest_available_json_codec_by_default():
+    config = Config(base_url=BASE_URL, api_key=API_KEY, tenant=TENANT_NAME)
+    assert str(config.json_codec) in ('orjson', 'ujson', 'json')
+    assert config.json_codec.loads(config.json_codec.dumps({'a': [1, 'é']})) == {'a': [1, 'é']}
+
+    config = Config(base_url=BASE_URL, api_key=API_KEY, tenant=TENANT_NAME, json_codec='json')
+    assert str(config.json_codec) == 'json'
+    assert config.json_codec.dumps({'a': 1}) == b'{"a":1}'
+    assert config.copy_with().json_codec is config.json_codec
+
+    with pytest.raises(SparkSdkError):
+        Config(base_url=BASE_URL, api_key=API_KEY, tenant=TENANT_NAME, json_codec='simplejson')
+
+
+def test_prefer_orjson_codec_when_installed():
+    pytest.importorskip('orjson')
+    config = Config(base_url=BASE_URL, api_key=API_KEY, tenant=TENANT_NAME)
+    assert str(config.json_codec) == 'orjson'
+
+
+def test_use_configured_json_codec_for_request_payloads():
+    class Codec(JsonCodec):
+        name = 'custom'
+        calls = 0
+
+        def dumps(self, data):
+            Codec.calls += 1
+            return super().dumps(data)
+
+        def loads(self, data):
+            Codec.calls += 1
+            return super().loads(data)
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={'response_data': {'outputs': {'value': 42}}, 'response_meta': {}})
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    client = Client(
+        base_url=BASE_URL,
+        tenant=TENANT_NAME,
+        api_key=API_KEY,
+        logger=False,
+        json_codec=Codec(),
+        http_client=http_client,
+    )
+    client.services.execute('my-folder/my-service', inputs='{"value": 1}', response_format='raw')
+    assert Codec.calls >= 3  # inputs string, request payload and response
+
+
+def test_tune_connection_pool_and_timeouts_of_http_clients():
+    config = Config(base_url=BASE_URL, api_key=API_KEY, tenant=TENANT_NAME, timeout=30000)
+    assert config.http == HttpOptions()
+    assert config.http.timeout(config.timeout).as_dict() == {'connect': 30, 'read': 30, 'write': 30, 'pool': 30}
+
+    http = {'max_connections': 256, 'max_keepalive_connections': 64, 'connect_timeout': 5000}
+    config = Config(base_url=BASE_URL, api_key=API_KEY, tenant=TENANT_NAME, timeout=30000, http=http)
+    assert config.http.limits.max_connections == 256
+    assert config.http.limits.max_keepalive_connections == 64
+    assert config.http.timeout(config.timeout).connect == 5
+    assert config.copy_with().http is config.http
+
+    with Client.use(config) as client:
+        assert client.config.http is config.http
+        assert client.http_client.timeout.connect == 5
+        assert client.http_client.timeout.read == 30
+
+
+def test_reuse_resources_and_loggers_of_clients():
+    with Client(base_url=BASE_URL, api_key=API_KEY, tenant=TENANT_NAME, logger=False) as client:
+        services = client.services
+        assert client.services is services
+        assert client.impex is client.impex
+        assert client.folders.logger is services.logger
+
+        client.http_client = httpx.Client()  # resources are bound to the HTTP client
+        assert client.services is not services
+        assert client.services is client.services
+        client.http_client.close()
+
+    other = Client(base_url=BASE_URL, api_key=API_KEY, tenant=TENANT_NAME, logger={'disabled': False, 'level': 20})
+    assert other.services.logger is services.logger and services.logger.level == 20  # same context
+
+
+def test_compute_static_headers_once_until_extra_headers_change():
+    config = Config(base_url=BASE_URL, api_key=API_KEY, tenant=TENANT_NAME)
+    headers = config.static_headers('my-agent')
+    assert headers['User-Agent'] == 'my-agent' and headers['x-tenant-name'] == TENANT_NAME
+    assert config.static_headers('my-agent') is headers
+
+    config.extra_headers.update({'x-custom': 'value'})
+    assert config.static_headers('my-agent')['x-custom'] == 'value'
+    config.extra_headers = {}
+    assert 'x-custom' not in config.static_headers('my-agent')
+
+    with Client.use(config) as client:
+        first, second = client.services.default_headers, client.services.default_headers
+        assert first['x-request-id'] != second['x-request-id']
+        assert first['x-tenant-name'] == second['x-tenant-name'] == TENANT_NAME
@@ -0,0 +1,59 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from cspark.sdk import Client, Config, RateLimiter, SparkSdkError
+
+BASE_URL = 'https://excel.test.coherent.global/my-tenant'
+
+
+def test_reserve_tokens_at_a_steady_pace_after_a_burst():
+    limiter = RateLimiter(10, burst=2)
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+    assert limiter.reserve() == pytest.approx(0.2, abs=0.01)
+
+    with pytest.raises(SparkSdkError):
+        RateLimiter(0)
+
+
+def test_pace_requests_shared_across_threads():
+    limiter = RateLimiter(100, burst=1)
+    started_at = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: limiter.acquire(), range(21)))
+    assert time.monotonic() - started_at >= 0.19
+
+
+def test_slow_down_on_rate_limits_when_adaptive():
+    limiter = RateLimiter(8, adaptive=True, min_rate=2)
+    limiter.throttle()
+    assert limiter.rate == 4
+    limiter.throttle(retry_after=1)
+    limiter.throttle()
+    assert limiter.rate == 2  # no lower than min_rate
+    assert limiter.reserve() > 1  # bucket emptied for Retry-After
+
+    limiter.recover()
+    assert limiter.rate == 2.4
+
+    limiter = RateLimiter(8)
+    limiter.throttle()
+    assert limiter.rate == 8  # not adaptive
+
+
+def test_apply_rate_limits_by_endpoint_class():
+    config = Config(base_url=BASE_URL, api_key='open', rate_limit={'execute': 50, '*': RateLimiter(5)})
+    assert config.rate_limiter('execute').rate == 50
+    assert config.rate_limiter('batch') is config.rate_limiter('metadata')
+    assert config.copy_with().rate_limiter('execute') is config.rate_limiter('execute')
+    assert Config(base_url=BASE_URL, api_key='open').rate_limiter('execute') is None
+
+    statuses = [429, 200]
+    http_client = httpx.Client(transport=httpx.MockTransport(lambda _: httpx.Response(statuses.pop(0), json={})))
+    limiter = RateLimiter(100, adaptive=True)
+    with Client(base_url=BASE_URL, api_key='open', logger=False, rate_limit=limiter, http_client=http_client) as spark:
+        assert spark.services.get_versions('my-folder/my-service').status == 200
+    assert limiter.rate == 55  # halved on 429, then recovered a step
@@ -0,0 +1,50 @@
+import json
+import logging
+
+from cspark.sdk import LoggerOptions, get_logger
+from cspark.sdk._logger import ColorfulFormatter, JsonFormatter
+
+
+def make_record(msg: str, *args, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord('CSPARK', level, __file__, 1, msg, args, None)
+
+
+def test_build_colorful_formatters_once_per_level():
+    formatter = ColorfulFormatter(datefmt='%H:%M', colorful=False, timestamp=False)
+    assert formatter.format(make_record('%s records', 10)) == '[CSPARK]      INFO - 10 records'
+    assert formatter.format(make_record('done', level=logging.WARNING)) == '[CSPARK]   WARNING - done'
+    assert formatter.format(make_record('again')).endswith('INFO - again')
+    assert len(formatter._formatters) == 2
+
+
+def test_format_structured_json_logs():
+    entry = json.loads(JsonFormatter().format(make_record('GET %s', 'https://example.com')))
+    assert entry['level'] == 'INFO' and entry['logger'] == 'CSPARK'
+    assert entry['message'] == 'GET https://example.com'
+    assert entry['timestamp'].endswith('+00:00')
+    assert 'timestamp' not in json.loads(JsonFormatter(timestamp=False).format(make_record('no time')))
+
+
+def test_set_up_loggers_once_per_options():
+    options = LoggerOptions(context='CSPARK test', json=True, level=logging.INFO)
+    logger = get_logger(**options.__dict__)
+    assert get_logger(**options.__dict__) is logger
+    assert len(logger.handlers) == 1 and isinstance(logger.handlers[0].formatter, JsonFormatter)
+    assert logger.isEnabledFor(logging.DEBUG) is False
+
+
+def test_switch_formatter_of_existing_logger_when_json_mode_changes():
+    options = {'context': 'CSPARK switch', 'level': logging.INFO}
+    logger = get_logger(**options, json=True)
+    assert isinstance(logger.handlers[0].formatter, JsonFormatter)
+
+    assert get_logger(**options, json=False) is logger
+    assert len(logger.handlers) == 1 and isinstance(logger.handlers[0].formatter, ColorfulFormatter)
+
+    get_logger(**options, json=True)
+    assert len(logger.handlers) == 1 and isinstance(logger.handlers[0].formatter, JsonFormatter)
+
+    custom = logging.getLogger('CSPARK custom')
+    custom.addHandler(logging.NullHandler())
+    assert get_logger('CSPARK custom', json=True).handlers == custom.handlers  # left as configured
+    assert len(custom.handlers) == 1
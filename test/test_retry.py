@@ -0,0 +1,92 @@
+import time
+
+import httpx
+import pytest
+from cspark.sdk import Client, Config, RetryPolicy, SparkApiError, SparkSdkError
+
+BASE_URL = 'https://excel.test.coherent.global/my-tenant'
+
+
+def flaky_client(*failures, **retry):
+    """Creates a client whose requests first go through the given failures (statuses or errors)."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        failure = failures[len(calls) - 1] if len(calls) <= len(failures) else None
+        if isinstance(failure, Exception):
+            raise failure
+        if isinstance(failure, int):
+            return httpx.Response(failure, json={'error': 'failure'}, headers={'retry-after': '0'})
+        return httpx.Response(200, json={'status': 'Success', 'data': []})
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    client = Client(base_url=BASE_URL, api_key='open', logger=False, http_client=http_client, retry=retry)
+    return client, calls
+
+
+def test_backoff_with_full_jitter_and_retry_after():
+    policy = RetryPolicy(interval=1, max_interval=5)
+    assert all(0 <= policy.backoff(0) <= 1 for _ in range(50))
+    assert all(0 <= policy.backoff(10) <= 5 for _ in range(50))
+
+    request = httpx.Request('GET', BASE_URL)
+    response = httpx.Response(503, headers={'retry-after': '3'})
+    assert policy.next_delay(request, 0, time.monotonic(), response=response) == 3
+    assert policy.next_delay(request, 2, time.monotonic(), response=response) is None  # max retries reached
+    assert RetryPolicy(deadline=2).next_delay(request, 0, time.monotonic(), response=response) is None
+
+    response = httpx.Response(429, headers={'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'})  # in the past
+    assert policy.next_delay(request, 0, time.monotonic(), response=response) == 0
+
+    response = httpx.Response(429, headers={'retry-after': '86400'})  # too far ahead
+    assert policy.backoff(0, response) == policy.max_retry_after
+    assert policy.next_delay(request, 0, time.monotonic(), response=response) is None
+    assert RetryPolicy(max_retry_after=86400).next_delay(request, 0, time.monotonic(), response=response) == 86400
+
+
+def test_retry_failures_only_when_safe_for_the_http_method():
+    policy, started_at = RetryPolicy(), time.monotonic()
+    get, post = httpx.Request('GET', BASE_URL), httpx.Request('POST', BASE_URL)
+
+    assert policy.next_delay(get, 0, started_at, response=httpx.Response(502)) is not None
+    assert policy.next_delay(post, 0, started_at, response=httpx.Response(502)) is None
+    assert policy.next_delay(post, 0, started_at, response=httpx.Response(502), idempotent=True) is not None
+    assert policy.next_delay(post, 0, started_at, response=httpx.Response(429)) is not None
+    assert policy.next_delay(get, 0, started_at, response=httpx.Response(500)) is None
+
+    assert policy.next_delay(post, 0, started_at, error=httpx.ConnectError('refused')) is not None
+    assert policy.next_delay(post, 0, started_at, error=httpx.ReadError('reset')) is None
+    assert policy.next_delay(get, 0, started_at, error=httpx.ReadError('reset')) is not None
+
+
+def test_retry_requests_failing_with_server_or_connection_errors():
+    client, calls = flaky_client(503, httpx.ConnectError('refused'), interval=0.01)
+    with client:
+        assert client.services.get_versions('my-folder/my-service').status == 200
+    assert calls == ['GET'] * 3
+
+    client, calls = flaky_client(502, 502, 502, interval=0.01)
+    with client, pytest.raises(SparkApiError):
+        client.services.get_versions('my-folder/my-service')
+    assert len(calls) == 3  # 1 attempt + 2 retries
+
+    client, calls = flaky_client(httpx.ReadError('reset'), interval=0.01)
+    with client, pytest.raises(SparkSdkError):
+        client.services.search()  # POST requests are not retried unless idempotent
+    assert calls == ['POST']
+
+
+def test_derive_retry_policy_from_explicit_overrides_when_copying_configs():
+    policy = RetryPolicy(max_retries=1, interval=2, deadline=30)
+    config = Config(base_url=BASE_URL, api_key='open', logger=False, retry=policy)
+    assert config.copy_with().retry is policy
+
+    copy = config.copy_with(max_retries=5)
+    assert (copy.retry.max_retries, copy.retry.interval, copy.retry.deadline) == (5, 2, 30)
+    copy = config.copy_with(retry_interval=0.5)
+    assert (copy.retry.max_retries, copy.retry.interval) == (1, 0.5)
+
+    config = Config(base_url=BASE_URL, api_key='open', logger=False, retry={'max_retries': 1, 'max_interval': 10})
+    copy = config.copy_with(max_retries=4)
+    assert (copy.retry.max_retries, copy.retry.max_interval) == (4, 10)
@@ -64,3 +64,10 @@ def test_can_create_a_copy_with_new_values():
     assert copy.auth.api_key == '***-key'
     assert copy.base_url.tenant == 'new-tenant'
     assert copy.base_url.full == f'{BASE_URL}/new-tenant'
+
+
+def test_should_reuse_resources_of_the_same_client():
+    client = Client(base_url=BASE_URL, tenant=TENANT, api_key=API_KEY)
+    assert client.services is client.services
+    assert client.health is client.health
+    assert client.services.logger is Client(base_url=BASE_URL, tenant=TENANT, api_key=API_KEY).services.logger